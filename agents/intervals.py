@@ -0,0 +1,117 @@
+"""Free-time structures used by the planners."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+class FreeList:
+    """Disjoint free intervals kept sorted by start.
+
+    Starts and ends live in two parallel sorted lists, so the intervals
+    touching a range are found by bisection in O(log n). Subtracting a busy
+    range or an allocated session only rewrites those intervals (splitting
+    one in two when the range falls inside it) instead of rescanning the
+    whole list.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            if start >= end:
+                continue
+            if self._ends and start <= self._ends[-1]:
+                # overlapping or touching windows become one interval
+                if end > self._ends[-1]:
+                    self._ends[-1] = end
+                continue
+            self._starts.append(start)
+            self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self._starts, self._ends)
+
+    def intervals(self) -> List[Interval]:
+        return list(self)
+
+    def first(self) -> Optional[Interval]:
+        """Return the earliest free interval, or ``None`` if nothing is free."""
+        if not self._starts:
+            return None
+        return self._starts[0], self._ends[0]
+
+    def contains(self, start: datetime, end: datetime) -> bool:
+        """Return True if all of ``[start, end)`` is free."""
+        i = bisect_right(self._starts, start) - 1
+        return i >= 0 and end <= self._ends[i] and start < end
+
+    def subtract(self, start: datetime, end: datetime) -> None:
+        """Mark ``[start, end)`` as no longer free."""
+        if start >= end:
+            return
+        i = bisect_right(self._starts, start) - 1
+        if i < 0 or self._ends[i] <= start:
+            i += 1
+        j = bisect_left(self._starts, end)  # intervals i..j-1 overlap the range
+        if i >= j:
+            return
+        starts: List[datetime] = []
+        ends: List[datetime] = []
+        if self._starts[i] < start:
+            starts.append(self._starts[i])
+            ends.append(start)
+        if self._ends[j - 1] > end:
+            starts.append(end)
+            ends.append(self._ends[j - 1])
+        self._starts[i:j] = starts
+        self._ends[i:j] = ends
+
+
+class FirstFit:
+    """Earliest-fit allocator over a fixed set of free intervals.
+
+    Each allocation takes the start of the earliest interval with enough
+    room, which only shrinks that interval, so the intervals never split.
+    A max segment tree over the remaining lengths finds that interval in
+    O(log n) without scanning the ones before it.
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        free = list(FreeList(intervals))
+        self._starts = [start for start, _ in free]
+        self._ends = [end for _, end in free]
+        size = 1
+        while size < len(free):
+            size *= 2
+        self._size = size
+        self._tree = [0.0] * (2 * size)
+        for i, (start, end) in enumerate(free):
+            self._tree[size + i] = (end - start).total_seconds()
+        for node in range(size - 1, 0, -1):
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def allocate(self, duration: timedelta) -> Optional[Interval]:
+        """Book ``duration`` at the earliest place it fits; ``None`` if nowhere."""
+        need = duration.total_seconds()
+        if not self._starts or self._tree[1] < need:
+            return None
+        node = 1
+        while node < self._size:
+            node = 2 * node if self._tree[2 * node] >= need else 2 * node + 1
+        i = node - self._size
+        start = self._starts[i]
+        end = start + duration
+        self._starts[i] = end
+        self._tree[node] = (self._ends[i] - end).total_seconds()
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+        return start, end
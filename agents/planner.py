@@ -1,8 +1,9 @@
 from __future__ import annotations
 from datetime import datetime, timedelta, date, time
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import os
 
+from agents.intervals import FirstFit, FreeList
 from integrations.google_calendar import GoogleCalendarClient
 from agents.nudges import generate_nudges
 
@@ -18,6 +19,8 @@ def schedule_tasks(
     work_start: time = time(8, 0),
     work_end: time = time(20, 0),
     calendar_client: GoogleCalendarClient | None = None,
+    start_day: Optional[date] = None,
+    horizon_days: int = 7,
 ) -> List[Dict]:
     """
     Simple scheduling algorithm: places tasks in available time slots between events.
@@ -26,6 +29,11 @@ def schedule_tasks(
     - Events must have 'start_time' and 'end_time' as datetime objects.
     - Each task dict must contain 'estimated_duration' in minutes.
     - Returns list of tasks with 'start_time' and 'end_time' assigned.
+
+    Work windows are searched day by day from ``start_day`` (default today)
+    for ``horizon_days`` days, or up to the last busy interval if later; each
+    task takes the earliest gap it fits in. Tasks that fit nowhere in that
+    range are packed into the work days after it, in order.
     """
     # Sort tasks by due_date (None last) and then title
     def task_key(t: Dict):
@@ -41,81 +49,62 @@ def schedule_tasks(
     for t in tasks_sorted:
         if t.get('start_time') and t.get('end_time'):
             busy.append((t['start_time'], t['end_time']))
-    busy.sort()
+
+    first_day = start_day or date.today()
+    last_day = first_day + timedelta(days=max(horizon_days, 1) - 1)
+    if busy:
+        last_day = max(last_day, max(end for _, end in busy).date())
+    windows = [
+        (datetime.combine(day, work_start), datetime.combine(day, work_end))
+        for day in (first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1))
+    ]
+    free = FreeList(windows)
+    for bstart, bend in busy:
+        free.subtract(bstart, bend)
+    slots = FirstFit(free)
+    overflow = datetime.combine(last_day + timedelta(days=1), work_start)
 
     scheduled: List[Dict] = []
     per_task_index: Dict[int, int] = {}
+    app_events: List[Dict] = []
     if ENABLE_LIVE_RESCHEDULE and calendar_client:
         calendar_client.ensure_study_calendar()
     for task in tasks_sorted:
         if task.get('start_time') and task.get('end_time'):
             scheduled.append(task)
             continue
-        duration_minutes = task.get('estimated_duration', 60)
-        scheduled_time = _find_slot(duration_minutes, busy, work_start, work_end)
-        if scheduled_time is None:
-            # No available slot today: place task after the last busy block,
-            # but roll over to next work day if it exceeds today's work window.
-            last_end = busy[-1][1] if busy else datetime.combine(date.today(), work_start)
-            tentative_start = (last_end + timedelta(minutes=5)).replace(second=0, microsecond=0)
-            day_end_dt = datetime.combine(tentative_start.date(), work_end)
-            tentative_end = tentative_start + timedelta(minutes=duration_minutes)
-            if tentative_start >= day_end_dt or tentative_end > day_end_dt:
-                next_day = tentative_start.date() + timedelta(days=1)
-                start = datetime.combine(next_day, work_start)
-                end = start + timedelta(minutes=duration_minutes)
-            else:
-                start, end = tentative_start, tentative_end
-        else:
-            start, end = scheduled_time
+        duration = timedelta(minutes=task.get('estimated_duration', 60))
+        slot = slots.allocate(duration)
+        if slot is None:
+            # No room in the horizon: pack after it, rolling over to the
+            # next work day when the task would run past work_end.
+            if overflow + duration > datetime.combine(overflow.date(), work_end) and overflow.time() != work_start:
+                overflow = datetime.combine(overflow.date() + timedelta(days=1), work_start)
+            slot = (overflow, overflow + duration)
+            overflow = slot[1]
+            if overflow >= datetime.combine(overflow.date(), work_end):
+                overflow = datetime.combine(overflow.date() + timedelta(days=1), work_start)
+        start, end = slot
         task_copy = task.copy()
         task_copy['start_time'] = start
         task_copy['end_time'] = end
         scheduled.append(task_copy)
-        busy.append((start, end))
-        busy.sort()
         if ENABLE_LIVE_RESCHEDULE and calendar_client:
             idx = per_task_index.get(task['id'], 0)
             per_task_index[task['id']] = idx + 1
-            calendar_client.upsert_app_event(
-                source_id=f"task:{task['id']}:{idx}",
-                title=task['title'],
-                start_time=start,
-                end_time=end,
-            )
+            app_events.append({
+                'source_id': f"task:{task['id']}:{idx}",
+                'title': task['title'],
+                'start_time': start,
+                'end_time': end,
+            })
+
+    if app_events:
+        # one diffed batch: unchanged sessions are not rewritten
+        calendar_client.sync_app_events(app_events)
 
     if ENABLE_MICRO_COACHING:
         nudges = generate_nudges(scheduled, tasks)
         return scheduled, nudges
 
     return scheduled
-
-
-def _find_slot(duration: int, busy: List[Tuple[datetime, datetime]], work_start: time, work_end: time) -> Tuple[datetime, datetime] | None:
-    """
-    Find the next available time slot of `duration` minutes given a list of busy intervals.
-    """
-    # convert busy intervals to same-day intervals and search within work hours of today
-    today = date.today()
-    day_start = datetime.combine(today, work_start)
-    day_end = datetime.combine(today, work_end)
-    # Start scanning from day_start
-    pointer = day_start
-    for bstart, bend in busy:
-        if bend <= pointer:
-            continue
-        # If the next busy interval is after pointer, check gap
-        if bstart > pointer:
-            gap = (bstart - pointer).total_seconds() / 60
-            if gap >= duration:
-                return pointer, pointer + timedelta(minutes=duration)
-            pointer = bend
-            continue
-        else:
-            # overlapping or contiguous busy
-            if bend > pointer:
-                pointer = bend
-    # Check remaining time after last busy interval
-    if (day_end - pointer).total_seconds() / 60 >= duration:
-        return pointer, pointer + timedelta(minutes=duration)
-    return None
@@ -1,12 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta, time, date
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from collections import defaultdict
 
+from agents.intervals import FreeList
 from project.prefs import UserPrefs
 from project import metrics
-from project.settings import load_settings
+from project.db import get_engine
+from project.settings import Settings, load_settings
 
 
 def _to_datetime(value: Optional[datetime | date | str], end_of_day: time) -> Optional[datetime]:
@@ -22,29 +24,35 @@ def _to_datetime(value: Optional[datetime | date | str], end_of_day: time) -> Op
         return None
 
 
-def _subtract_intervals(base: List[Tuple[datetime, datetime]], busy: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
-    """Subtract busy intervals from base intervals."""
-    result: List[Tuple[datetime, datetime]] = []
-    busy_sorted = sorted(busy)
-    for start, end in base:
-        cur = start
-        for bstart, bend in busy_sorted:
-            if bend <= cur or bstart >= end:
-                continue
-            if bstart > cur:
-                result.append((cur, min(bstart, end)))
-            cur = max(cur, bend)
-            if cur >= end:
-                break
-        if cur < end:
-            result.append((cur, end))
-    return result
-
-
-def schedule(tasks: List[Dict], events: List[Dict], blocks: List[Dict], prefs: UserPrefs, *, start: Optional[datetime] = None, horizon_days: int = 7) -> List[Dict]:
+def schedule(
+    tasks: List[Dict],
+    events: List[Dict],
+    blocks: List[Dict],
+    prefs: UserPrefs,
+    *,
+    start: Optional[datetime] = None,
+    horizon_days: int = 7,
+    settings: Optional[Settings] = None,
+    estimates: Optional[metrics.Estimates] = None,
+    backend: str = "intervals",
+    grid_minutes: int = 5,
+    previous: Optional[List[Dict]] = None,
+) -> List[Dict]:
     """
     Schedule tasks into study sessions respecting events, blocks, deadlines and preferences.
     Returns list of sessions with keys: task_id, title, start_time, end_time, rationale.
+
+    ``settings`` defaults to :func:`load_settings`. With the learning loop
+    enabled, session lengths come from ``estimates`` (loaded once from the
+    session log when not given), looked up once per task.
+
+    ``backend`` selects how free time is built: ``"intervals"`` subtracts
+    each busy interval from the windows, ``"grid"`` paints both onto a NumPy
+    occupancy grid of ``grid_minutes`` buckets (see
+    :mod:`agents.planner_grid`; requires numpy).
+
+    ``previous`` sessions (see :func:`replan`) are kept first where still
+    valid; only the remaining work is placed.
     """
     base_dt = (start or datetime.now()).replace(second=0, microsecond=0)
     today = base_dt.date()
@@ -82,8 +90,21 @@ def schedule(tasks: List[Dict], events: List[Dict], blocks: List[Dict], prefs: U
         else:
             daily_windows.append((base_start, base_end))
 
-    free_slots = _subtract_intervals(daily_windows, busy)
-    free_slots.sort()
+    if prefs.max_sessions_per_day <= 0:
+        free = FreeList()
+    elif backend == "grid":
+        try:
+            from agents.planner_grid import free_runs
+        except ImportError as exc:
+            raise RuntimeError("the grid planner backend requires numpy") from exc
+        origin = datetime.combine(today, time.min)
+        free = FreeList(free_runs(daily_windows, busy, origin, horizon_days, grid_minutes))
+    elif backend == "intervals":
+        free = FreeList(daily_windows)
+        for busy_start, busy_end in busy:
+            free.subtract(busy_start, busy_end)
+    else:
+        raise ValueError(f"unknown planner backend: {backend}")
 
     # Sort tasks
     def task_key(t: Dict):
@@ -95,38 +116,64 @@ def schedule(tasks: List[Dict], events: List[Dict], blocks: List[Dict], prefs: U
 
     sessions: List[Dict] = []
     sessions_per_day: defaultdict[date, int] = defaultdict(int)
-    settings = load_settings()
+    booked: defaultdict[Any, float] = defaultdict(float)  # minutes kept per task
+
+    def book(session_start: datetime, session_end: datetime) -> None:
+        day = session_start.date()
+        sessions_per_day[day] += 1
+        free.subtract(session_start, session_end)
+        if sessions_per_day[day] >= prefs.max_sessions_per_day:
+            day_start = datetime.combine(day, time.min)
+            free.subtract(day_start, day_start + timedelta(days=1))
+
+    # Keep earlier sessions that still fit: the task is pending and still
+    # needs the time, the slot is free (not hit by an event or block, not
+    # overlapping a session kept before it), before the deadline, and the
+    # day has room left.
+    pending = {t['id']: t for t in tasks_sorted}
+    for prev in sorted(previous or (), key=lambda p: p['start_time']):
+        task = pending.get(prev['task_id'])
+        if task is None:
+            continue
+        prev_start, prev_end = prev['start_time'], prev['end_time']
+        minutes = (prev_end - prev_start).total_seconds() / 60
+        due_dt = _to_datetime(task.get('due_date'), prefs.day_end) or horizon_end
+        if (
+            prev_end > due_dt
+            or booked[task['id']] + minutes > task.get('estimated_duration', 0)
+            or not free.contains(prev_start, prev_end)
+        ):
+            continue
+        sessions.append(dict(prev, title=task['title'], type=task.get('type')))
+        booked[task['id']] += minutes
+        book(prev_start, prev_end)
+
+    settings = settings or load_settings()
     use_learning = getattr(settings, "enable_learning_loop", False)
+    if use_learning and estimates is None:
+        estimates = metrics.load_estimates(get_engine(settings.sqlite_path))
 
-    # Scheduler loop
+    # Scheduler loop: every interval left in ``free`` is usable, since busy
+    # time, booked sessions and days at max_sessions_per_day are subtracted
+    # as they happen, so each task takes the earliest free interval.
     for task in tasks_sorted:
-        remaining = task.get('estimated_duration', 0)
+        remaining = task.get('estimated_duration', 0) - booked[task['id']]
         if remaining <= 0:
             continue
         due_dt = _to_datetime(task.get('due_date'), prefs.day_end) or horizon_end
+        session_minutes = prefs.default_session_minutes
+        if estimates is not None and use_learning:
+            session_minutes = estimates.get(
+                task.get("type"), task.get("course_label"), session_minutes
+            )
 
-        i = 0
-        while remaining > 0 and i < len(free_slots):
-            slot_start, slot_end = free_slots[i]
-            day = slot_start.date()
-            if slot_start >= due_dt:
+        while remaining > 0:
+            slot = free.first()
+            if slot is None or slot[0] >= due_dt:
                 break
-            if sessions_per_day[day] >= prefs.max_sessions_per_day:
-                i += 1
-                continue
+            slot_start, slot_end = slot
             allowed_end = min(slot_end, due_dt)
-            if allowed_end <= slot_start:
-                i += 1
-                continue
             available = (allowed_end - slot_start).total_seconds() / 60
-            if available <= 0:
-                i += 1
-                continue
-            session_minutes = prefs.default_session_minutes
-            if use_learning:
-                session_minutes = metrics.get_estimate(
-                    task.get("type"), task.get("course_label"), session_minutes
-                )
             chunk = min(session_minutes, remaining, available)
             session_start = slot_start
             session_end = session_start + timedelta(minutes=chunk)
@@ -139,15 +186,18 @@ def schedule(tasks: List[Dict], events: List[Dict], blocks: List[Dict], prefs: U
                 'rationale': f"due {due_dt.date()} priority {task.get('priority')}",
             })
             remaining -= chunk
-            sessions_per_day[day] += 1
-            # Update slot
-            new_start = session_end
-            if new_start < slot_end and new_start < allowed_end and sessions_per_day[day] < prefs.max_sessions_per_day:
-                free_slots[i] = (new_start, slot_end)
-            else:
-                free_slots.pop(i)
-                continue  # don't increment i; next slot now at same index
-            if remaining <= 0:
-                break
-        # end while slots
+            book(session_start, session_end)
     return sessions
+
+
+def replan(previous: List[Dict], tasks: List[Dict], events: List[Dict], blocks: List[Dict], prefs: UserPrefs, **kwargs: Any) -> List[Dict]:
+    """Update an earlier plan after tasks, events or blocks changed.
+
+    Sessions of ``previous`` that are still valid stay where they are; work
+    that was displaced (an event moved onto it, a block changed) or is new
+    (a task added or grown) is placed in the remaining free time. Sessions
+    of completed or deleted tasks are dropped. Takes the keyword arguments
+    of :func:`schedule` and returns the sessions ordered by start time.
+    """
+    sessions = schedule(tasks, events, blocks, prefs, previous=previous, **kwargs)
+    return sorted(sessions, key=lambda s: s['start_time'])
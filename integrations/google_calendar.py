@@ -1,9 +1,20 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from sqlalchemy import text
 
-from project.db_merge import merge_event, get_cursor, set_cursor
+from project.db import has_fts, table_columns
+from project.db_merge import merge_events, get_cursor, set_cursor
+from project.repo.query_builders import build_events_search_query
+
+
+# Staging rows merged and committed per transaction by fetch_since.
+STAGING_BATCH_SIZE = 500
+
+_STAGING_COLUMNS = (
+    "id, source, source_id, title, start_time, end_time, type, description, updated_at, etag"
+)
 
 
 def _to_dt(val: Optional[str | datetime]) -> Optional[datetime]:
@@ -16,6 +27,22 @@ def _to_dt(val: Optional[str | datetime]) -> Optional[datetime]:
     return datetime.fromisoformat(val)
 
 
+def _iso(val: str | datetime) -> str:
+    return val.isoformat() if isinstance(val, datetime) else val
+
+
+# Statement templates keyed by the sorted column set being written; the
+# update templates bind the row id as ``:id``.
+@lru_cache(maxsize=64)
+def _insert_sql(cols: Tuple[str, ...]):
+    return text(f"INSERT INTO events ({', '.join(cols)}) VALUES ({', '.join(':' + c for c in cols)})")
+
+
+@lru_cache(maxsize=64)
+def _update_sql(cols: Tuple[str, ...]):
+    return text(f"UPDATE events SET {', '.join(f'{c} = :{c}' for c in cols if c != 'id')} WHERE id = :id")
+
+
 class GoogleCalendarClient:
     """
     Local DB-backed calendar client (sample mode).
@@ -85,83 +112,197 @@ class GoogleCalendarClient:
         }
         return self.upsert_event(event_id, payload)
 
+    def sync_app_events(
+        self,
+        sessions: List[Dict[str, Any]],
+        *,
+        prune_prefix: Optional[str] = None,
+        since: Optional[datetime] = None,
+        app_tag: str = "ai-study-buddy",
+    ) -> Tuple[int, int, int]:
+        """Bring app-owned events in line with ``sessions`` in one transaction.
+
+        Each session needs ``source_id``, ``title``, ``start_time`` and
+        ``end_time`` (``description`` is optional). Existing app events are
+        loaded with one query and compared, so unchanged sessions are not
+        rewritten; inserts, updates and deletes each go out as a single
+        ``executemany``. With ``prune_prefix``, app events whose source id
+        starts with it (and, given ``since``, that start at or after it) but
+        are not in ``sessions`` are deleted. Returns
+        ``(inserted, updated, deleted)``.
+        """
+        wanted: Dict[str, Dict[str, Any]] = {}
+        for s in sessions:
+            wanted[s["source_id"]] = {
+                "title": s["title"],
+                "start_time": _iso(s["start_time"]),
+                "end_time": _iso(s["end_time"]),
+                "description": s.get("description") or "",
+            }
+        now = datetime.utcnow().isoformat()
+        with self.engine.begin() as conn:
+            cols = table_columns(conn, "events")
+            existing = {
+                r.source_id: r
+                for r in conn.execute(
+                    text(
+                        "SELECT id, source_id, title, start_time, end_time, description "
+                        "FROM events WHERE source = 'app'"
+                    )
+                )
+            }
+            stamp = {"updated_at": now} if "updated_at" in cols else {}
+            owned = {"app_owned": 1, "app_tag": app_tag} if "app_owned" in cols else {}
+            inserts: List[Dict[str, Any]] = []
+            updates: List[Dict[str, Any]] = []
+            for sid, row in wanted.items():
+                old = existing.get(sid)
+                if old is None:
+                    inserts.append(dict(row, source="app", source_id=sid, type="study_session", **owned, **stamp))
+                elif (old.title, old.start_time, old.end_time, old.description or "") != (
+                    row["title"], row["start_time"], row["end_time"], row["description"]
+                ):
+                    updates.append(dict(row, id=old.id, **stamp))
+            stale: List[Dict[str, Any]] = []
+            if prune_prefix is not None:
+                cutoff = since.isoformat() if since is not None else None
+                stale = [
+                    {"id": old.id}
+                    for sid, old in existing.items()
+                    if sid.startswith(prune_prefix)
+                    and sid not in wanted
+                    and (cutoff is None or old.start_time >= cutoff)
+                ]
+
+            if inserts:
+                conn.execute(_insert_sql(tuple(sorted(inserts[0]))), inserts)
+            if updates:
+                conn.execute(_update_sql(tuple(sorted(updates[0]))), updates)
+            if stale:
+                conn.execute(text("DELETE FROM events WHERE id = :id"), stale)
+        return len(inserts), len(updates), len(stale)
+
     # ---------- Reads ----------
 
     def list_events(self, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
         """
-        Return events in [start_time, end_time], normalized to datetime objects.
+        Return events overlapping (start_time, end_time) as naive local datetimes.
+
+        The window is matched on the integer ``start_ts``/``end_ts`` columns, so
+        events stored with mixed UTC offsets compare correctly.
         """
         with self.engine.begin() as conn:
             rows = conn.execute(
                 text(
-                    "SELECT id, source, source_id, title, start_time, end_time, type, description "
+                    "SELECT id, source, source_id, title, start_ts, end_ts, type, description "
                     "FROM events "
-                    "WHERE start_time < :end AND end_time > :start "
-                    "ORDER BY start_time"
+                    "WHERE start_ts < :end AND end_ts > :start "
+                    "ORDER BY start_ts"
                 ),
-                {"start": start_time.isoformat(), "end": end_time.isoformat()},
+                {"start": int(start_time.timestamp()), "end": int(end_time.timestamp())},
             ).fetchall()
 
         events: List[Dict[str, Any]] = []
         for row in rows:
-            (eid, source, source_id, title, start_iso, end_iso, etype, desc) = row
+            (eid, source, source_id, title, start_ts, end_ts, etype, desc) = row
             events.append(
                 {
                     "id": eid,
                     "source": source,
                     "source_id": source_id,
                     "title": title,
-                    "start_time": _to_dt(start_iso),
-                    "end_time": _to_dt(end_iso),
+                    "start_time": datetime.fromtimestamp(start_ts),
+                    "end_time": datetime.fromtimestamp(end_ts),
                     "type": etype,
                     "description": desc,
                 }
             )
         return events
 
-    def fetch_since(self, provider: str = "google", since_cursor: Optional[str] = None) -> str:
+    def search_events(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Full-text search over event titles and descriptions.
+
+        Uses the ``events_fts`` index (prefix matching, bm25 ranking) when it
+        exists and falls back to ``LIKE`` otherwise.
+        """
+        if not query.strip():
+            return []
+        with self.engine.begin() as conn:
+            sql, params = build_events_search_query(
+                query, use_fts=has_fts(conn, "events_fts"), limit=limit
+            )
+            rows = conn.execute(text(sql), params).fetchall()
+        return [
+            {
+                "id": eid,
+                "source": source,
+                "source_id": source_id,
+                "title": title,
+                "start_time": _to_dt(start_iso),
+                "end_time": _to_dt(end_iso),
+                "type": etype,
+                "description": desc,
+            }
+            for (eid, source, source_id, title, start_iso, end_iso, etype, desc) in rows
+        ]
+
+    def fetch_since(
+        self,
+        provider: str = "google",
+        since_cursor: Optional[str] = None,
+        *,
+        batch_size: int = STAGING_BATCH_SIZE,
+    ) -> str:
         """Merge events from staging_events updated after the cursor.
 
         If ``since_cursor`` is not provided, the last stored cursor for the
-        provider is used. Merged events are written to the ``events`` table via
-        :func:`merge_event`. The sync cursor is then advanced to ``datetime.utcnow()``.
+        provider is used. Staging rows are streamed in batches of about
+        ``batch_size`` ordered by ``updated_at``; each batch is merged via
+        :func:`merge_events` and committed together with a cursor at its last
+        ``updated_at``, so an interrupted import resumes after the last
+        committed batch. Once drained the cursor is advanced to
+        ``datetime.utcnow()`` (or the newest staged timestamp, if later).
         """
-        with self.engine.begin() as conn:
+        with self.engine.connect() as conn:
             cursor = since_cursor or get_cursor(conn, provider)
-            if cursor:
-                rows = conn.execute(
+        while True:
+            with self.engine.begin() as conn:
+                rows = self._staging_batch(conn, cursor or "", batch_size)
+                if not rows:
+                    break
+                merge_events(conn, [dict(row._mapping) for row in rows])
+                cursor = rows[-1].updated_at
+                set_cursor(conn, provider, cursor)
+        new_cursor = max(datetime.utcnow().isoformat(), cursor or "")
+        with self.engine.begin() as conn:
+            set_cursor(conn, provider, new_cursor)
+        return new_cursor
+
+    @staticmethod
+    def _staging_batch(conn, cursor: str, batch_size: int) -> list:
+        """Return the next staging rows after ``cursor``.
+
+        The batch is extended to include every row sharing the last row's
+        ``updated_at`` so a cursor on that value never skips a tied row.
+        """
+        rows = conn.execute(
+            text(
+                f"SELECT {_STAGING_COLUMNS} FROM staging_events "
+                "WHERE updated_at > :cursor ORDER BY updated_at, id LIMIT :limit"
+            ),
+            {"cursor": cursor, "limit": batch_size},
+        ).fetchall()
+        if len(rows) == batch_size:
+            rows.extend(
+                conn.execute(
                     text(
-                        "SELECT source, source_id, title, start_time, end_time, type, description, updated_at, etag "
-                        "FROM staging_events WHERE updated_at > :cursor ORDER BY updated_at"
+                        f"SELECT {_STAGING_COLUMNS} FROM staging_events "
+                        "WHERE updated_at = :last AND id > :last_id ORDER BY id"
                     ),
-                    {"cursor": cursor},
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    text(
-                        "SELECT source, source_id, title, start_time, end_time, type, description, updated_at, etag "
-                        "FROM staging_events ORDER BY updated_at"
-                    )
+                    {"last": rows[-1].updated_at, "last_id": rows[-1].id},
                 ).fetchall()
-            for row in rows:
-                (source, source_id, title, start_iso, end_iso, etype, desc, upd, etag) = row
-                merge_event(
-                    conn,
-                    {
-                        "source": source,
-                        "source_id": source_id,
-                        "title": title,
-                        "start_time": start_iso,
-                        "end_time": end_iso,
-                        "type": etype,
-                        "description": desc,
-                        "updated_at": upd,
-                        "etag": etag,
-                    },
-                )
-            new_cursor = datetime.utcnow().isoformat()
-            set_cursor(conn, provider, new_cursor)
-        return new_cursor
+            )
+        return rows
 
     # ---------- Writes (for future two-way sync) ----------
 
@@ -194,32 +335,35 @@ class GoogleCalendarClient:
         updates keys should align with columns: title, start_time (dt/iso), end_time (dt/iso), type, description, source, source_id
         Returns the event id.
         """
-        norm: Dict[str, Any] = {}
-        for k, v in updates.items():
-            if k in ("start_time", "end_time") and isinstance(v, datetime):
-                norm[k] = v.isoformat()
-            else:
-                norm[k] = v
+        return self.upsert_events([(event_id, updates)])[0]
 
+    def upsert_events(self, items: List[Tuple[Optional[int], Dict[str, Any]]]) -> List[int]:
+        """Create or update many events in one transaction.
+
+        ``items`` are ``(event_id, updates)`` pairs as for :meth:`upsert_event`.
+        Updates sharing a column set go out as one ``executemany``. Returns
+        the event ids in the order of ``items``.
+        """
+        now = datetime.utcnow().isoformat()
+        ids: List[int] = []
+        batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
         with self.engine.begin() as conn:
-            cols = {row[1] for row in conn.execute(text("PRAGMA table_info(events)"))}
-            if "updated_at" in cols:
-                norm.setdefault("updated_at", datetime.utcnow().isoformat())
-            if event_id is None:
-                # Insert path
-                cols = ", ".join(norm.keys())
-                binds = ", ".join(f":{k}" for k in norm.keys())
-                conn.execute(text(f"INSERT INTO events ({cols}) VALUES ({binds})"), norm)
-                event_id = conn.execute(text("SELECT last_insert_rowid() AS id")).scalar_one()
+            cols = table_columns(conn, "events")
+            for event_id, updates in items:
+                norm = {k: _iso(v) if k in ("start_time", "end_time") else v for k, v in updates.items()}
+                if "updated_at" in cols:
+                    norm.setdefault("updated_at", now)
                 if event_id is None:
-                    raise ValueError("Failed to retrieve event id after insert.")
-                return int(event_id)
-            else:
-                # Update path
-                set_clause = ", ".join(f"{k} = :{k}" for k in norm.keys())
-                norm["id"] = event_id
-                conn.execute(text(f"UPDATE events SET {set_clause} WHERE id = :id"), norm)
-                return int(event_id)
+                    new_id = conn.execute(_insert_sql(tuple(sorted(norm))), norm).lastrowid
+                    if new_id is None:
+                        raise ValueError("Failed to retrieve event id after insert.")
+                    ids.append(int(new_id))
+                else:
+                    batches.setdefault(tuple(sorted(norm)), []).append(dict(norm, id=event_id))
+                    ids.append(int(event_id))
+            for keys, params in batches.items():
+                conn.execute(_update_sql(keys), params)
+        return ids
 
     def delete_event(self, event_id: int) -> None:
         with self.engine.begin() as conn:
@@ -0,0 +1,131 @@
+"""Asyncio Supabase (PostgREST) client with pooled connections and backoff."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional
+import asyncio
+import logging
+
+import httpx
+
+from project.settings import Settings
+
+_logger = logging.getLogger(__name__)
+
+SYNC_TABLES = ("tasks", "events", "blocks", "planner_prefs")
+
+# Status codes worth retrying; everything else is raised immediately.
+_RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def _in_filter(values: Iterable[Any]) -> str:
+    return "in.(" + ",".join(str(v) for v in values) + ")"
+
+
+class AsyncSupabaseClient:
+    """Asyncio PostgREST client; :class:`~integrations.supabase_client.SupabaseClient` wraps it.
+
+    Requests share one keep-alive connection pool and at most
+    ``max_concurrency`` are in flight at once. Failed requests are retried
+    with exponential backoff via ``asyncio.sleep`` so waiting never blocks
+    the loop or other requests.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        *,
+        max_concurrency: int = 4,
+        retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if retries < 1:
+            raise ValueError("retries must be at least 1")
+        self._client = httpx.AsyncClient(
+            base_url=url.rstrip("/") + "/rest/v1",
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+            limits=httpx.Limits(
+                max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.retries = retries
+        self.backoff = backoff
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **kwargs: Any) -> "AsyncSupabaseClient":
+        if not settings.supabase_url or not settings.supabase_anon_key:
+            raise RuntimeError("Supabase credentials missing")
+        return cls(settings.supabase_url, settings.supabase_anon_key, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, table: str, **kwargs: Any) -> Any:
+        delay = self.backoff
+        for attempt in range(1, self.retries + 1):
+            try:
+                async with self._semaphore:
+                    resp = await self._client.request(method, f"/{table}", **kwargs)
+                if resp.status_code not in _RETRY_STATUS:
+                    resp.raise_for_status()
+                    return resp.json() if resp.content else None
+                error: Exception = httpx.HTTPStatusError(
+                    f"{resp.status_code} from {table}", request=resp.request, response=resp
+                )
+            except httpx.TransportError as exc:
+                error = exc
+            _logger.warning("supabase_request_error", extra={"attempt": attempt, "error": str(error)})
+            if attempt == self.retries:
+                break
+            await asyncio.sleep(delay)
+            delay *= 2
+        raise error
+
+    # ---- CRUD ----------------------------------------------------------
+    async def upsert(self, table: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        return await self.upsert_many(table, [payload])
+
+    async def upsert_many(self, table: str, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Upsert several rows in a single request."""
+        return await self._request(
+            "POST",
+            table,
+            json=payloads,
+            headers={"Prefer": "resolution=merge-duplicates,return=representation"},
+        )
+
+    async def delete(self, table: str, column: str, value: Any) -> None:
+        await self._request("DELETE", table, params={column: f"eq.{value}"})
+
+    async def delete_many(self, table: str, column: str, values: list[Any]) -> None:
+        """Delete every row whose ``column`` is in ``values`` in one request."""
+        await self._request("DELETE", table, params={column: _in_filter(values)})
+
+    async def select(self, table: str, query: str, **filters: Any) -> list[dict[str, Any]]:
+        params = {"select": query}
+        params.update({key: f"eq.{val}" for key, val in filters.items()})
+        return await self._request("GET", table, params=params)
+
+    async def select_changed(
+        self, table: str, since: Optional[str], limit: int, **filters: Any
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` rows with ``updated_at`` after ``since``."""
+        params = {"select": "*", "order": "updated_at.asc,id.asc", "limit": str(limit)}
+        params.update({key: f"eq.{val}" for key, val in filters.items()})
+        if since is not None:
+            params["updated_at"] = f"gt.{since}"
+        return await self._request("GET", table, params=params)
+
+    async def select_tables(
+        self, tables: Iterable[str] = SYNC_TABLES, query: str = "*", **filters: Any
+    ) -> Dict[str, list[dict[str, Any]]]:
+        """Fetch several independent tables concurrently."""
+        tables = list(tables)
+        results = await asyncio.gather(*(self.select(t, query, **filters) for t in tables))
+        return dict(zip(tables, results))
+
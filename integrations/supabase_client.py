@@ -1,59 +1,95 @@
-"""Supabase client helper with basic retry/backoff."""
+"""Blocking Supabase client helper.
+
+A thin wrapper over :class:`~integrations.supabase_async.AsyncSupabaseClient`:
+calls run on a private event loop thread, so retries back off there with
+``asyncio.sleep`` instead of blocking the caller, and requests share the async
+client's keep-alive pool.
+"""
 from __future__ import annotations
 
-from typing import Any, Optional
-import time
-import logging
+from typing import Any, Awaitable, Dict, Iterable, Optional, TypeVar
+import asyncio
+import threading
 
-from supabase import Client, create_client
+from integrations.supabase_async import SYNC_TABLES, AsyncSupabaseClient
 from project.settings import Settings
 
-_logger = logging.getLogger(__name__)
-_client: Optional[Client] = None
+T = TypeVar("T")
+
+_client: Optional["SupabaseClient"] = None
+_client_lock = threading.Lock()
 
 
-def get_client(settings: Settings) -> Client:
+def get_client(settings: Settings) -> "SupabaseClient":
     """Return a singleton Supabase client."""
     global _client
-    if _client is None:
-        if not settings.supabase_url or not settings.supabase_anon_key:
-            raise RuntimeError("Supabase credentials missing")
-        _client = create_client(settings.supabase_url, settings.supabase_anon_key)
-    return _client
-
-
-def _retry(fn, *args, **kwargs):
-    delay = 1.0
-    for attempt in range(3):
-        try:
-            return fn(*args, **kwargs)
-        except Exception as exc:  # pragma: no cover - network failures
-            _logger.warning("supabase_request_error", extra={"attempt": attempt + 1, "error": str(exc)})
-            if attempt == 2:
-                raise
-            time.sleep(delay)
-            delay *= 2
+    with _client_lock:
+        if _client is None:
+            if not settings.supabase_url or not settings.supabase_anon_key:
+                raise RuntimeError("Supabase credentials missing")
+            _client = SupabaseClient(settings.supabase_url, settings.supabase_anon_key)
+        return _client
 
 
 class SupabaseClient:
     """Typed helper wrapping basic CRUD operations."""
 
-    def __init__(self, client: Client):
-        self._client = client
+    def __init__(self, url: str, key: str, **kwargs: Any):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._async = self._call(self._make_client(url, key, kwargs))
 
     @classmethod
     def from_settings(cls, settings: Settings) -> "SupabaseClient":
-        return cls(get_client(settings))
+        return get_client(settings)
+
+    @staticmethod
+    async def _make_client(url: str, key: str, kwargs: Dict[str, Any]) -> AsyncSupabaseClient:
+        # Created on the loop thread so the semaphore and pool bind to it.
+        return AsyncSupabaseClient(url, key, **kwargs)
+
+    def _call(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._call(self._async.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
 
     # ---- tasks ---------------------------------------------------------
-    def upsert(self, table: str, payload: dict[str, Any]) -> dict[str, Any]:
-        return _retry(self._client.table(table).upsert, payload).data
+    def upsert(self, table: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        return self._call(self._async.upsert(table, payload))
+
+    def upsert_many(self, table: str, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Upsert several rows in a single request."""
+        return self._call(self._async.upsert_many(table, payloads))
 
     def delete(self, table: str, column: str, value: Any) -> None:
-        _retry(self._client.table(table).delete().eq, column, value)
+        self._call(self._async.delete(table, column, value))
+
+    def delete_many(self, table: str, column: str, values: list[Any]) -> None:
+        """Delete every row whose ``column`` is in ``values`` in one request."""
+        self._call(self._async.delete_many(table, column, values))
+
+    def select_changed(
+        self, table: str, since: Optional[str], limit: int, **filters: Any
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` rows with ``updated_at`` after ``since``.
+
+        Rows come back ordered by ``(updated_at, id)``; ``since=None`` starts
+        from the beginning of the table. Tombstones are included.
+        """
+        return self._call(self._async.select_changed(table, since, limit, **filters))
 
     def select(self, table: str, query: str, **filters: Any) -> list[dict[str, Any]]:
-        tbl = self._client.table(table).select(query)
-        for key, val in filters.items():
-            tbl = tbl.eq(key, val)
-        return _retry(tbl.execute).data
+        return self._call(self._async.select(table, query, **filters))
+
+    def select_tables(
+        self, tables: Iterable[str] = SYNC_TABLES, query: str = "*", **filters: Any
+    ) -> Dict[str, list[dict[str, Any]]]:
+        """Fetch several independent tables concurrently."""
+        return self._call(self._async.select_tables(tables, query, **filters))
@@ -0,0 +1,70 @@
+"""Full-text search indexes for tasks and events.
+
+Creates external-content FTS5 tables kept in sync by triggers. SQLite builds
+without FTS5 are left untouched; the application falls back to LIKE search.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010_fts_search'
+down_revision = '0009_supabase_cache'
+branch_labels = None
+depends_on = None
+
+FTS_TABLES = {
+    'tasks_fts': ('tasks', ('title', 'type', 'course_label')),
+    'events_fts': ('events', ('title', 'description')),
+}
+
+
+def _triggers(fts: str, table: str, cols: tuple) -> list[str]:
+    col_list = ', '.join(cols)
+    new_vals = ', '.join(f'new.{c}' for c in cols)
+    old_vals = ', '.join(f'old.{c}' for c in cols)
+    insert = f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    insp = sa.inspect(bind)
+    existing = set(insp.get_table_names())
+    for fts, (table, cols) in FTS_TABLES.items():
+        if table not in existing:
+            continue
+        table_cols = {c['name'] for c in insp.get_columns(table)}
+        if not set(cols) <= table_cols:
+            continue  # partially migrated table; indexed on a later upgrade
+        if fts not in existing:
+            try:
+                bind.execute(sa.text(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                    f"{', '.join(cols)}, content='{table}', content_rowid='id')"
+                ))
+            except sa.exc.OperationalError:
+                return  # no FTS5 in this SQLite build
+            bind.execute(sa.text(f"INSERT INTO {fts}({fts}) VALUES('rebuild')"))
+        for stmt in _triggers(fts, table, cols):
+            bind.execute(sa.text(stmt))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for fts in FTS_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+        bind.execute(sa.text(f"DROP TABLE IF EXISTS {fts}"))
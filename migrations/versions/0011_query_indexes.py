@@ -0,0 +1,97 @@
+"""Indexes matching the ordering and range predicates of the hot queries.
+
+Each task filter mode orders by its own key, so every mode gets an index on
+exactly that expression and SQLite can walk it instead of sorting. Calendar
+range reads get covering indexes and the pending-task lists an index on
+``(state, start_time)``. The plain range indexes from 0006 are superseded.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011_query_indexes'
+down_revision = '0010_fts_search'
+branch_labels = None
+depends_on = None
+
+# name -> (table, required columns, DDL)
+INDEXES = {
+    'tasks_created_idx': (
+        'tasks', ('created_at',),
+        "CREATE INDEX IF NOT EXISTS tasks_created_idx ON tasks(created_at)",
+    ),
+    'tasks_due_idx': (
+        'tasks', ('due_date',),
+        "CREATE INDEX IF NOT EXISTS tasks_due_idx ON tasks(due_date) WHERE due_date IS NOT NULL",
+    ),
+    'tasks_course_order_idx': (
+        'tasks', ('course_label', 'due_date'),
+        "CREATE INDEX IF NOT EXISTS tasks_course_order_idx "
+        "ON tasks(COALESCE(course_label, ''), COALESCE(due_date, '9999-12-31'))",
+    ),
+    'tasks_priority_order_idx': (
+        'tasks', ('priority', 'due_date'),
+        "CREATE INDEX IF NOT EXISTS tasks_priority_order_idx "
+        "ON tasks(COALESCE(priority, 3), COALESCE(due_date, '9999-12-31'))",
+    ),
+    'tasks_today_order_idx': (
+        'tasks', ('start_time', 'due_date'),
+        "CREATE INDEX IF NOT EXISTS tasks_today_order_idx "
+        "ON tasks(COALESCE(start_time, due_date, ''))",
+    ),
+    'tasks_state_start_idx': (
+        'tasks', ('state', 'start_time'),
+        "CREATE INDEX IF NOT EXISTS tasks_state_start_idx ON tasks(state, start_time)",
+    ),
+    'tasks_range_idx': (
+        'tasks', ('start_time', 'end_time', 'title', 'type'),
+        "CREATE INDEX IF NOT EXISTS tasks_range_idx ON tasks(start_time, end_time, title, type) "
+        "WHERE start_time IS NOT NULL AND end_time IS NOT NULL",
+    ),
+    'events_range_idx': (
+        'events', ('start_time', 'end_time', 'source', 'source_id', 'title', 'type'),
+        "CREATE INDEX IF NOT EXISTS events_range_idx "
+        "ON events(start_time, end_time, source, source_id, title, type)",
+    ),
+}
+
+SUPERSEDED = {
+    'idx_tasks_start_end': "CREATE INDEX IF NOT EXISTS idx_tasks_start_end ON tasks(start_time, end_time)",
+    'idx_events_start_end': "CREATE INDEX IF NOT EXISTS idx_events_start_end ON events(start_time, end_time)",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    insp = sa.inspect(bind)
+    existing = set(insp.get_table_names())
+    columns = {t: {c['name'] for c in insp.get_columns(t)} for t in ('tasks', 'events') if t in existing}
+    for table, required, ddl in INDEXES.values():
+        if table not in columns or not set(required) <= columns[table]:
+            continue  # partially migrated table; indexed on a later upgrade
+        bind.execute(sa.text(ddl))
+    for old, new in (
+        ('idx_tasks_start_end', 'tasks_range_idx'),
+        ('idx_events_start_end', 'events_range_idx'),
+    ):
+        created = bind.execute(
+            sa.text("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :n"),
+            {'n': new},
+        ).first()
+        if created:
+            bind.execute(sa.text(f"DROP INDEX IF EXISTS {old}"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for name in INDEXES:
+        bind.execute(sa.text(f"DROP INDEX IF EXISTS {name}"))
+    for ddl in SUPERSEDED.values():
+        bind.execute(sa.text(ddl))
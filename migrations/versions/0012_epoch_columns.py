@@ -0,0 +1,128 @@
+"""Integer UTC-epoch shadow columns for time range queries.
+
+ISO text times with mixed UTC offsets do not compare correctly as strings.
+Each time column gets an INTEGER ``*_ts`` companion, backfilled here and kept
+current by triggers, and the range indexes move from the text columns to the
+epoch ones.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012_epoch_columns'
+down_revision = '0011_query_indexes'
+branch_labels = None
+depends_on = None
+
+# table -> ((epoch column, ISO column), ...); naive values are local wall time
+EPOCH_COLUMNS = {
+    'tasks': (('start_ts', 'start_time'), ('end_ts', 'end_time'), ('due_ts', 'due_date')),
+    'events': (('start_ts', 'start_time'), ('end_ts', 'end_time')),
+    'blocks': (('start_ts', 'start_time'), ('end_ts', 'end_time')),
+}
+
+INDEXES = {
+    'tasks_range_ts_idx': (
+        'tasks',
+        "CREATE INDEX IF NOT EXISTS tasks_range_ts_idx ON tasks(start_ts, end_ts, title, type) "
+        "WHERE start_ts IS NOT NULL AND end_ts IS NOT NULL",
+    ),
+    'events_range_ts_idx': (
+        'events',
+        "CREATE INDEX IF NOT EXISTS events_range_ts_idx "
+        "ON events(start_ts, end_ts, source, source_id, title, type)",
+    ),
+    'blocks_range_ts_idx': (
+        'blocks',
+        "CREATE INDEX IF NOT EXISTS blocks_range_ts_idx ON blocks(start_ts, end_ts)",
+    ),
+}
+
+SUPERSEDED = {
+    'tasks_range_idx': "CREATE INDEX IF NOT EXISTS tasks_range_idx ON tasks(start_time, end_time, title, type) "
+    "WHERE start_time IS NOT NULL AND end_time IS NOT NULL",
+    'events_range_idx': "CREATE INDEX IF NOT EXISTS events_range_idx "
+    "ON events(start_time, end_time, source, source_id, title, type)",
+}
+
+
+def _epoch_sql(expr: str) -> str:
+    # Explicit offsets are applied by hand; the 'utc' modifier only handles
+    # naive (local) times consistently across SQLite versions.
+    wall = f"CAST(strftime('%s', substr({expr}, 1, 19)) AS INTEGER)"
+    naive = f"CAST(strftime('%s', substr({expr}, 1, 19), 'utc') AS INTEGER)"
+    return (
+        f"CASE WHEN {expr} IS NULL THEN NULL"
+        f" WHEN {expr} LIKE '%Z' THEN {wall}"
+        f" WHEN length({expr}) > 19 AND substr({expr}, -6, 1) IN ('+', '-')"
+        f" AND substr({expr}, -3, 1) = ':'"
+        f" THEN {wall} - (CASE substr({expr}, -6, 1) WHEN '-' THEN -1 ELSE 1 END)"
+        f" * (CAST(substr({expr}, -5, 2) AS INTEGER) * 3600 + CAST(substr({expr}, -2, 2) AS INTEGER) * 60)"
+        f" ELSE {naive} END"
+    )
+
+
+def _triggers(table: str, pairs: tuple) -> list[str]:
+    sources = ', '.join(src for _, src in pairs)
+    sets = ', '.join(f"{ts} = {_epoch_sql('new.' + src)}" for ts, src in pairs)
+    update = f"UPDATE {table} SET {sets} WHERE id = new.id;"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ts_ai AFTER INSERT ON {table} BEGIN {update} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ts_au AFTER UPDATE OF {sources} ON {table} "
+        f"BEGIN {update} END",
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    insp = sa.inspect(bind)
+    existing = set(insp.get_table_names())
+    migrated = set()
+    for table, pairs in EPOCH_COLUMNS.items():
+        if table not in existing:
+            continue
+        cols = {c['name'] for c in insp.get_columns(table)}
+        if not {src for _, src in pairs} <= cols:
+            continue  # partially migrated table; handled on a later upgrade
+        missing = [(ts, src) for ts, src in pairs if ts not in cols]
+        for ts, _ in missing:
+            bind.execute(sa.text(f"ALTER TABLE {table} ADD COLUMN {ts} INTEGER"))
+        if missing:
+            sets = ', '.join(f"{ts} = {_epoch_sql(src)}" for ts, src in missing)
+            bind.execute(sa.text(f"UPDATE {table} SET {sets}"))
+        for stmt in _triggers(table, pairs):
+            bind.execute(sa.text(stmt))
+        migrated.add(table)
+    for table, ddl in INDEXES.values():
+        if table in migrated:
+            bind.execute(sa.text(ddl))
+    if 'tasks' in migrated:
+        bind.execute(sa.text("DROP INDEX IF EXISTS tasks_range_idx"))
+    if 'events' in migrated:
+        bind.execute(sa.text("DROP INDEX IF EXISTS events_range_idx"))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    insp = sa.inspect(bind)
+    existing = set(insp.get_table_names())
+    for name in INDEXES:
+        bind.execute(sa.text(f"DROP INDEX IF EXISTS {name}"))
+    for table, pairs in EPOCH_COLUMNS.items():
+        bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {table}_ts_ai"))
+        bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {table}_ts_au"))
+        if table not in existing:
+            continue
+        cols = {c['name'] for c in insp.get_columns(table)}
+        for ts, _ in pairs:
+            if ts in cols:
+                bind.execute(sa.text(f"ALTER TABLE {table} DROP COLUMN {ts}"))
+    for ddl in SUPERSEDED.values():
+        bind.execute(sa.text(ddl))
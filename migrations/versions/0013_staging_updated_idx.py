@@ -0,0 +1,36 @@
+"""Index staging_events for the batched fetch_since stream.
+
+``fetch_since`` walks staging rows in ``(updated_at, id)`` order one batch at a
+time; without an index every batch would re-sort the remaining rows.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0013_staging_updated_idx'
+down_revision = '0012_epoch_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if not insp.has_table('staging_events'):
+        return
+    cols = {c['name'] for c in insp.get_columns('staging_events')}
+    if 'updated_at' not in cols:
+        return  # partially migrated table; indexed on a later upgrade
+    op.execute(
+        sa.text(
+            "CREATE INDEX IF NOT EXISTS staging_events_updated_idx "
+            "ON staging_events(updated_at, id)"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP INDEX IF EXISTS staging_events_updated_idx"))
@@ -0,0 +1,52 @@
+"""Retry scheduling and dead letters for the offline push queue.
+
+``pending_ops.next_attempt_at`` lets a failing op back off without blocking
+the ops behind it; ops that exhaust their attempts move to ``dead_letter_ops``,
+keeping their queue id so a replay slots back into the original order.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0014_pending_retry'
+down_revision = '0013_staging_updated_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table('pending_ops'):
+        cols = {c['name'] for c in insp.get_columns('pending_ops')}
+        if 'next_attempt_at' not in cols:
+            with op.batch_alter_table('pending_ops') as batch:
+                batch.add_column(sa.Column('next_attempt_at', sa.String(), nullable=True))
+    if not insp.has_table('dead_letter_ops'):
+        op.create_table(
+            'dead_letter_ops',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('table_name', sa.String(), nullable=False),
+            sa.Column('op_type', sa.String(), nullable=False),
+            sa.Column('row_local_id', sa.String(), nullable=False),
+            sa.Column('payload', sa.String(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('last_error', sa.String(), nullable=True),
+            sa.Column('created_at', sa.String(), nullable=True),
+            sa.Column('failed_at', sa.String(), server_default=sa.text('CURRENT_TIMESTAMP')),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table('dead_letter_ops'):
+        op.drop_table('dead_letter_ops')
+    if insp.has_table('pending_ops'):
+        cols = {c['name'] for c in insp.get_columns('pending_ops')}
+        if 'next_attempt_at' in cols:
+            with op.batch_alter_table('pending_ops') as batch:
+                batch.drop_column('next_attempt_at')
@@ -0,0 +1,62 @@
+"""Materialized EWMA session estimates.
+
+``estimates`` holds the running EWMA state per (type, course_label) so
+reading an estimate no longer replays ``session_log``. Existing logs are
+folded in once here.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0015_estimates'
+down_revision = '0014_pending_retry'
+branch_labels = None
+depends_on = None
+
+# Smoothing factor at the time of this migration (project.metrics.ALPHA).
+ALPHA = 0.3
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if not insp.has_table('estimates'):
+        op.create_table(
+            'estimates',
+            sa.Column('type', sa.String(), primary_key=True),
+            sa.Column('course_label', sa.String(), primary_key=True, server_default=''),
+            sa.Column('weighted', sa.Float(), nullable=False),
+            sa.Column('sessions', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.String(), nullable=False),
+        )
+    if not insp.has_table('session_log'):
+        return
+    state: dict[tuple[str, str], list] = {}
+    rows = bind.execute(sa.text(
+        "SELECT type, COALESCE(course_label, '') AS course, actual_minutes, logged_at "
+        "FROM session_log ORDER BY logged_at, id"
+    ))
+    for r in rows:
+        weighted, sessions, _ = state.get((r.type, r.course), (0.0, 0, None))
+        state[(r.type, r.course)] = [
+            ALPHA * float(r.actual_minutes) + (1 - ALPHA) * weighted, sessions + 1, r.logged_at
+        ]
+    for (task_type, course), (weighted, sessions, updated_at) in state.items():
+        bind.execute(
+            sa.text(
+                "INSERT OR REPLACE INTO estimates (type, course_label, weighted, sessions, updated_at) "
+                "VALUES (:type, :course, :weighted, :sessions, :updated_at)"
+            ),
+            {"type": task_type, "course": course, "weighted": weighted,
+             "sessions": sessions, "updated_at": updated_at},
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table('estimates'):
+        op.drop_table('estimates')
@@ -0,0 +1,39 @@
+"""Persisted planner sessions.
+
+``plan_sessions`` keeps the last plan so the next planning run can start
+from it and only re-place work that was displaced.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0016_plan_sessions'
+down_revision = '0015_estimates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if not insp.has_table('plan_sessions'):
+        op.create_table(
+            'plan_sessions',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('start_time', sa.String(), nullable=False),
+            sa.Column('end_time', sa.String(), nullable=False),
+            sa.Column('rationale', sa.String(), nullable=True),
+        )
+        op.create_index('plan_sessions_start_idx', 'plan_sessions', ['start_time'])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table('plan_sessions'):
+        op.drop_index('plan_sessions_start_idx', table_name='plan_sessions')
+        op.drop_table('plan_sessions')
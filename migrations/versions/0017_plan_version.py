@@ -0,0 +1,39 @@
+"""Plan versions for stored planner sessions.
+
+Each save that changes the plan bumps ``app_meta['plan_version']``; rows in
+``plan_sessions`` carry the version that wrote them, so readers can tell
+which sessions are new since they last looked.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0017_plan_version'
+down_revision = '0016_plan_sessions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table('plan_sessions'):
+        cols = {c['name'] for c in insp.get_columns('plan_sessions')}
+        if 'plan_version' not in cols:
+            with op.batch_alter_table('plan_sessions') as batch:
+                batch.add_column(
+                    sa.Column('plan_version', sa.Integer(), nullable=False, server_default='0')
+                )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table('plan_sessions'):
+        cols = {c['name'] for c in insp.get_columns('plan_sessions')}
+        if 'plan_version' in cols:
+            with op.batch_alter_table('plan_sessions') as batch:
+                batch.drop_column('plan_version')
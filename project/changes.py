@@ -0,0 +1,174 @@
+"""Row-level change notifications for writes to the local SQLite cache.
+
+Every pooled connection gets TEMP triggers on the watched tables that record
+``(table, id, op)`` into a per-connection ``temp.change_log``. Log rows roll
+back with the data, so only committed writes are seen; the log is drained as
+a transaction commits and the events are published once the connection is
+returned to the pool, i.e. after the commit is visible to other connections.
+All write paths are covered, whether they go through a repository or issue
+SQL directly.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+WATCHED_TABLES = ("tasks", "events", "blocks")
+
+# A commit touching more rows of one table than this is reported as a single
+# ``reset`` for that table; listeners reload instead of patching row by row.
+MAX_ROW_EVENTS = 500
+
+_INSTALLED = "change_log_installed"
+_STASH = "change_log_events"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One committed change: ``op`` is insert, update, delete or reset.
+
+    ``id`` is ``None`` for ``reset``, meaning any row of ``table`` may have
+    changed.
+    """
+
+    table: str
+    id: Optional[int]
+    op: str
+
+
+Listener = Callable[[ChangeEvent], None]
+
+
+class ChangeBus:
+    """Fan out committed :class:`ChangeEvent` s to subscribers."""
+
+    def __init__(self) -> None:
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Listener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def publish(self, events: List[ChangeEvent]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for ev in events:
+            for listener in listeners:
+                listener(ev)
+
+
+_buses: "WeakKeyDictionary[Engine, ChangeBus]" = WeakKeyDictionary()
+_buses_lock = threading.Lock()
+
+
+def change_bus(engine: Engine) -> ChangeBus:
+    """Return the bus for ``engine``, wiring up change capture on first use."""
+    with _buses_lock:
+        bus = _buses.get(engine)
+        if bus is None:
+            bus = ChangeBus()
+            _attach(engine, bus)
+            _buses[engine] = bus
+        return bus
+
+
+def _trigger_sql(table: str) -> List[str]:
+    # Trigger bodies may not qualify table names; temp objects resolve first.
+    log = "INSERT INTO change_log (tbl, row_id, op) VALUES"
+    return [
+        f"CREATE TEMP TRIGGER IF NOT EXISTS change_{table}_ai AFTER INSERT ON main.{table} "
+        f"BEGIN {log} ('{table}', new.id, 'insert'); END",
+        f"CREATE TEMP TRIGGER IF NOT EXISTS change_{table}_au AFTER UPDATE ON main.{table} "
+        f"BEGIN {log} ('{table}', new.id, 'update'); END",
+        f"CREATE TEMP TRIGGER IF NOT EXISTS change_{table}_ad AFTER DELETE ON main.{table} "
+        f"BEGIN {log} ('{table}', old.id, 'delete'); END",
+    ]
+
+
+def _install(dbapi_conn) -> bool:
+    """Create the log and triggers on this connection; False if tables are missing."""
+    cur = dbapi_conn.cursor()
+    try:
+        present = {
+            row[0]
+            for row in cur.execute(
+                "SELECT name FROM main.sqlite_master WHERE type = 'table'"
+            ).fetchall()
+        }
+        tables = [t for t in WATCHED_TABLES if t in present]
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS change_log "
+            "(seq INTEGER PRIMARY KEY, tbl TEXT NOT NULL, row_id INTEGER, op TEXT NOT NULL)"
+        )
+        for table in tables:
+            for stmt in _trigger_sql(table):
+                cur.execute(stmt)
+    finally:
+        cur.close()
+    return len(tables) == len(WATCHED_TABLES)
+
+
+def _coalesce(rows: List[Tuple[str, int, str]]) -> List[ChangeEvent]:
+    """Reduce a transaction's log to one event per row (or one reset per table)."""
+    net: Dict[Tuple[str, int], str] = {}
+    for table, row_id, op in rows:
+        key = (table, row_id)
+        first = net.get(key)
+        if first == "insert":
+            # inserted in this transaction: later updates are part of the insert
+            if op == "delete":
+                net[key] = "gone"
+            continue
+        net[key] = op
+    per_table: Dict[str, List[ChangeEvent]] = {}
+    for (table, row_id), op in net.items():
+        if op != "gone":
+            per_table.setdefault(table, []).append(ChangeEvent(table, row_id, op))
+    events: List[ChangeEvent] = []
+    for table, table_events in per_table.items():
+        if len(table_events) > MAX_ROW_EVENTS:
+            events.append(ChangeEvent(table, None, "reset"))
+        else:
+            events.extend(table_events)
+    return events
+
+
+def _attach(engine: Engine, bus: ChangeBus) -> None:
+    def on_begin(conn) -> None:
+        info = conn.connection.info
+        if not info.get(_INSTALLED):
+            info[_INSTALLED] = _install(conn.connection.dbapi_connection)
+
+    def on_commit(conn) -> None:
+        info = conn.connection.info
+        if _INSTALLED not in info:
+            return
+        cur = conn.connection.dbapi_connection.cursor()
+        try:
+            rows = cur.execute("SELECT tbl, row_id, op FROM temp.change_log ORDER BY seq").fetchall()
+            if rows:
+                cur.execute("DELETE FROM temp.change_log")
+        finally:
+            cur.close()
+        if rows:
+            info.setdefault(_STASH, []).extend(rows)
+
+    def on_checkin(_dbapi_conn, record) -> None:
+        rows = record.info.pop(_STASH, None)
+        if rows:
+            bus.publish(_coalesce(rows))
+
+    event.listen(engine, "begin", on_begin)
+    event.listen(engine, "commit", on_commit)
+    event.listen(engine.pool, "checkin", on_checkin)
@@ -1,13 +1,254 @@
 from __future__ import annotations
 """SQLite helpers for the local cache."""
 
-from sqlalchemy import create_engine, text
+import os
+import threading
+from typing import Dict, FrozenSet
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+# Pool sized for the UI thread plus the WorkerPool/SyncEngine background
+# threads; overflow connections cover short bursts (e.g. several workers).
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 5
+DEFAULT_POOL_TIMEOUT = 30.0
+
+# Per-connection tuning. Negative cache_size is in KiB (SQLite convention).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def _apply_pragmas(dbapi_conn, _record) -> None:
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cur.execute(f"PRAGMA {name}={value}")
+    finally:
+        cur.close()
+
+
+def _registry_key(sqlite_path: str) -> str:
+    if sqlite_path == ":memory:":
+        return sqlite_path
+    return os.path.abspath(sqlite_path)
+
+
+def get_engine(
+    sqlite_path: str,
+    *,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_timeout: float = DEFAULT_POOL_TIMEOUT,
+) -> Engine:
+    """Return the shared SQLAlchemy engine for ``sqlite_path``.
+
+    Engines are cached per database path for the lifetime of the process so
+    callers can ask for one freely. Every pooled connection runs in WAL mode
+    with the PRAGMAs in :data:`SQLITE_PRAGMAS`, so readers on the UI thread do
+    not block behind writes from background threads. Pool arguments only take
+    effect for the first call for a given path.
+    """
+    key = _registry_key(sqlite_path)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is not None:
+            return engine
+        if key == ":memory:":
+            # A single shared connection; each new one would be a fresh DB.
+            engine = create_engine(
+                "sqlite:///:memory:",
+                echo=False,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+        else:
+            engine = create_engine(
+                f"sqlite:///{key}",
+                echo=False,
+                connect_args={"check_same_thread": False, "timeout": pool_timeout},
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+            )
+        event.listen(engine, "connect", _apply_pragmas)
+        _engines[key] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close pooled connections and forget all cached engines."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+# Column names per table, introspected once per engine. Schema changes made
+# through ensure_db clear it; anything else altering tables at runtime (e.g.
+# an in-process Alembic upgrade) should call invalidate_table_columns.
+_columns: "WeakKeyDictionary[Engine, Dict[str, FrozenSet[str]]]" = WeakKeyDictionary()
+_columns_lock = threading.Lock()
+
+
+def table_columns(conn, table: str) -> FrozenSet[str]:
+    """Return the column names of ``table``, cached per engine."""
+    with _columns_lock:
+        cached = _columns.get(conn.engine, {}).get(table)
+    if cached is not None:
+        return cached
+    cols = frozenset(row[1] for row in conn.execute(text(f"PRAGMA table_info({table})")))
+    if cols:  # don't cache a table that does not exist yet
+        with _columns_lock:
+            _columns.setdefault(conn.engine, {})[table] = cols
+    return cols
+
+
+def invalidate_table_columns(engine: Engine | None = None) -> None:
+    """Forget cached columns for ``engine``, or for every engine."""
+    with _columns_lock:
+        if engine is None:
+            _columns.clear()
+        else:
+            _columns.pop(engine, None)
+
+
+# Indexes backing the ORDER BY of each task filter mode, calendar range reads
+# and the pending-task lists (mirrors migration 0011).
+QUERY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS tasks_created_idx ON tasks(created_at)",
+    "CREATE INDEX IF NOT EXISTS tasks_due_idx ON tasks(due_date) WHERE due_date IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS tasks_course_order_idx"
+    " ON tasks(COALESCE(course_label, ''), COALESCE(due_date, '9999-12-31'))",
+    "CREATE INDEX IF NOT EXISTS tasks_priority_order_idx"
+    " ON tasks(COALESCE(priority, 3), COALESCE(due_date, '9999-12-31'))",
+    "CREATE INDEX IF NOT EXISTS tasks_today_order_idx ON tasks(COALESCE(start_time, due_date, ''))",
+    "CREATE INDEX IF NOT EXISTS tasks_state_start_idx ON tasks(state, start_time)",
+    "CREATE INDEX IF NOT EXISTS tasks_range_ts_idx ON tasks(start_ts, end_ts, title, type)"
+    " WHERE start_ts IS NOT NULL AND end_ts IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS events_range_ts_idx"
+    " ON events(start_ts, end_ts, source, source_id, title, type)",
+    "CREATE INDEX IF NOT EXISTS blocks_range_ts_idx ON blocks(start_ts, end_ts)",
+)
+
+# Text range indexes replaced by the epoch ones above (migration 0012).
+SUPERSEDED_INDEXES = ("tasks_range_idx", "events_range_idx")
+
+# Integer UTC-epoch shadow columns: table -> ((epoch column, ISO column), ...).
+# Naive ISO values are local wall time (see epoch_sql). They are maintained by
+# triggers so every write path keeps them current.
+EPOCH_COLUMNS = {
+    "tasks": (("start_ts", "start_time"), ("end_ts", "end_time"), ("due_ts", "due_date")),
+    "events": (("start_ts", "start_time"), ("end_ts", "end_time")),
+    "blocks": (("start_ts", "start_time"), ("end_ts", "end_time")),
+}
+
+
+def epoch_sql(expr: str) -> str:
+    """Return SQL converting the ISO-8601 text ``expr`` to integer epoch seconds.
+
+    Strings with a ``Z`` or ``±HH:MM`` suffix are converted using that offset.
+    Naive strings are local wall time (the app stores ``datetime.isoformat()``
+    of naive local datetimes). The offset is applied by hand because the ``'utc'`` modifier's handling of explicit offsets
+    differs between SQLite versions.
+    """
+    wall = f"CAST(strftime('%s', substr({expr}, 1, 19)) AS INTEGER)"
+    naive = f"CAST(strftime('%s', substr({expr}, 1, 19), 'utc') AS INTEGER)"
+    return (
+        f"CASE WHEN {expr} IS NULL THEN NULL"
+        f" WHEN {expr} LIKE '%Z' THEN {wall}"
+        f" WHEN length({expr}) > 19 AND substr({expr}, -6, 1) IN ('+', '-')"
+        f" AND substr({expr}, -3, 1) = ':'"
+        f" THEN {wall} - (CASE substr({expr}, -6, 1) WHEN '-' THEN -1 ELSE 1 END)"
+        f" * (CAST(substr({expr}, -5, 2) AS INTEGER) * 3600 + CAST(substr({expr}, -2, 2) AS INTEGER) * 60)"
+        f" ELSE {naive} END"
+    )
+
+
+def _epoch_trigger_sql(table: str, pairs: tuple) -> list:
+    sources = ", ".join(src for _, src in pairs)
+    sets = ", ".join(f"{ts} = {epoch_sql('new.' + src)}" for ts, src in pairs)
+    update = f"UPDATE {table} SET {sets} WHERE id = new.id;"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ts_ai AFTER INSERT ON {table} BEGIN {update} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ts_au AFTER UPDATE OF {sources} ON {table} "
+        f"BEGIN {update} END",
+    ]
+
+
+def _ensure_epoch_columns(conn) -> None:
+    """Add, backfill and wire up the epoch shadow columns on older databases."""
+    for table, pairs in EPOCH_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+        missing = [(ts, src) for ts, src in pairs if ts not in existing]
+        for ts, _ in missing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ts} INTEGER"))
+        if missing:
+            sets = ", ".join(f"{ts} = {epoch_sql(src)}" for ts, src in missing)
+            conn.execute(text(f"UPDATE {table} SET {sets}"))
+        for stmt in _epoch_trigger_sql(table, pairs):
+            conn.execute(text(stmt))
+
+
+# Full-text indexes: external-content FTS5 tables kept in sync by triggers.
+
+FTS_TABLES = {
+    "tasks_fts": ("tasks", ("title", "type", "course_label")),
+    "events_fts": ("events", ("title", "description")),
+}
 
 
-def get_engine(sqlite_path: str) -> Engine:
-    """Return a SQLAlchemy engine pointing at the SQLite database."""
-    return create_engine(f"sqlite:///{sqlite_path}", echo=False, future=True)
+def _fts_trigger_sql(fts: str, table: str, cols: tuple) -> list:
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    insert = f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});"
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def has_fts(conn, fts: str = "tasks_fts") -> bool:
+    """Return True if the FTS5 index ``fts`` exists in the database."""
+    row = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+        {"name": fts},
+    ).first()
+    return row is not None
+
+
+def _ensure_fts(conn) -> None:
+    """Create FTS5 search indexes; silently skipped when FTS5 is unavailable."""
+    for fts, (table, cols) in FTS_TABLES.items():
+        if not has_fts(conn, fts):
+            try:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                    f"{', '.join(cols)}, content='{table}', content_rowid='id')"
+                ))
+            except OperationalError:
+                return  # SQLite built without FTS5; search falls back to LIKE
+            conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES('rebuild')"))
+        for stmt in _fts_trigger_sql(fts, table, cols):
+            conn.execute(text(stmt))
 
 
 def ensure_db(engine: Engine) -> None:
@@ -45,7 +286,10 @@ def ensure_db(engine: Engine) -> None:
                 updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 deleted_at TEXT,
                 version TEXT NOT NULL DEFAULT '',
-                dirty INTEGER NOT NULL DEFAULT 0
+                dirty INTEGER NOT NULL DEFAULT 0,
+                start_ts INTEGER,
+                end_ts INTEGER,
+                due_ts INTEGER
             )
             """
         ))
@@ -74,7 +318,9 @@ def ensure_db(engine: Engine) -> None:
                 updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 deleted_at TEXT,
                 version TEXT NOT NULL DEFAULT '',
-                dirty INTEGER NOT NULL DEFAULT 0
+                dirty INTEGER NOT NULL DEFAULT 0,
+                start_ts INTEGER,
+                end_ts INTEGER
             )
             """
         ))
@@ -107,7 +353,9 @@ def ensure_db(engine: Engine) -> None:
                 start_time TEXT NOT NULL,
                 end_time TEXT NOT NULL,
                 dirty INTEGER NOT NULL DEFAULT 0,
-                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                start_ts INTEGER,
+                end_ts INTEGER
             )
             """
         ))
@@ -137,7 +385,69 @@ def ensure_db(engine: Engine) -> None:
                 payload TEXT NOT NULL,
                 attempts INTEGER NOT NULL DEFAULT 0,
                 last_error TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                next_attempt_at TEXT
             )
             """
         ))
+        cols = {row[1] for row in conn.execute(text("PRAGMA table_info(pending_ops)"))}
+        if "next_attempt_at" not in cols:
+            conn.execute(text("ALTER TABLE pending_ops ADD COLUMN next_attempt_at TEXT"))
+        # ops that kept failing, parked under their pending_ops id until replayed
+        conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS dead_letter_ops (
+                id INTEGER PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                op_type TEXT NOT NULL,
+                row_local_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at TEXT,
+                failed_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        ))
+        # learned session lengths per (type, course_label); see project.metrics
+        conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS estimates (
+                type TEXT NOT NULL,
+                course_label TEXT NOT NULL DEFAULT '',
+                weighted REAL NOT NULL,
+                sessions INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (type, course_label)
+            )
+            """
+        ))
+        # persisted planner output; see project.plan
+        conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS plan_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                rationale TEXT,
+                plan_version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        ))
+        cols = {row[1] for row in conn.execute(text("PRAGMA table_info(plan_sessions)"))}
+        if "plan_version" not in cols:
+            conn.execute(text(
+                "ALTER TABLE plan_sessions ADD COLUMN plan_version INTEGER NOT NULL DEFAULT 0"
+            ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS plan_sessions_start_idx ON plan_sessions(start_time)"
+        ))
+        _ensure_epoch_columns(conn)
+        for name in SUPERSEDED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for ddl in QUERY_INDEXES:
+            conn.execute(text(ddl))
+        # full-text search
+        _ensure_fts(conn)
+    invalidate_table_columns(engine)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
 from datetime import datetime
 import structlog
 from sqlalchemy import text
@@ -30,6 +31,105 @@ def _norm_event(event: Dict[str, Any]) -> Dict[str, Any]:
     return payload
 
 
+_MERGE_COLUMNS = (
+    "source", "source_id", "title", "start_time", "end_time", "type", "description", "etag", "updated_at",
+)
+
+# Scratch table holding one merge chunk; ``seq`` preserves input order.
+_MERGE_TABLE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS merge_in (
+        seq INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        source_id TEXT NOT NULL,
+        title TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        type TEXT,
+        description TEXT,
+        etag TEXT,
+        updated_at TEXT NOT NULL,
+        event_id INTEGER,
+        existed INTEGER NOT NULL DEFAULT 0,
+        conflict INTEGER NOT NULL DEFAULT 0,
+        keep_remote INTEGER NOT NULL DEFAULT 1
+    )
+"""
+
+# Classify every row against the current events in one pass (see merge_event
+# for the policy). Empty strings are "unset" like in the Python original.
+_CLASSIFY_SQL = """
+    UPDATE merge_in AS m SET
+        event_id = e.id,
+        existed = 1,
+        conflict = (
+            (COALESCE(e.last_synced_at, '') <> '' AND COALESCE(e.updated_at, '') <> ''
+             AND e.updated_at > e.last_synced_at)
+            AND (e.last_synced_at IS NULL OR m.updated_at > e.last_synced_at)
+        ),
+        keep_remote = (
+            NOT (COALESCE(e.last_synced_at, '') <> '' AND COALESCE(e.updated_at, '') <> ''
+                 AND e.updated_at > e.last_synced_at)
+            OR m.updated_at >= e.updated_at
+        )
+    FROM events AS e
+    WHERE e.source = m.source AND e.source_id = m.source_id
+"""
+
+_CONFLICT_COPIES_SQL = """
+    INSERT INTO events (source, source_id, title, start_time, end_time, type, description, updated_at)
+    SELECT 'local', 'conflict-' || e.id, e.title || ' (conflict)', e.start_time, e.end_time,
+           e.type, e.description, e.updated_at
+    FROM merge_in AS m JOIN events AS e ON e.id = m.event_id
+    WHERE m.conflict
+    ORDER BY m.seq
+"""
+
+_APPLY_REMOTE_SQL = """
+    UPDATE events SET
+        title = COALESCE(m.title, events.title),
+        start_time = COALESCE(m.start_time, events.start_time),
+        end_time = COALESCE(m.end_time, events.end_time),
+        type = COALESCE(m.type, events.type),
+        description = COALESCE(m.description, events.description),
+        etag = m.etag,
+        updated_at = m.updated_at,
+        last_synced_at = :now
+    FROM merge_in AS m
+    WHERE events.id = m.event_id AND m.existed AND m.keep_remote
+"""
+
+_TOUCH_SQL = """
+    UPDATE events SET last_synced_at = :now
+    FROM merge_in AS m
+    WHERE events.id = m.event_id AND m.existed AND NOT m.keep_remote
+"""
+
+_INSERT_NEW_SQL = """
+    INSERT INTO events (source, source_id, title, start_time, end_time, type, description,
+                        etag, updated_at, last_synced_at)
+    SELECT source, source_id, title, start_time, end_time, type, COALESCE(description, ''),
+           etag, updated_at, :now
+    FROM merge_in WHERE NOT existed ORDER BY seq
+"""
+
+_NEW_IDS_SQL = """
+    UPDATE merge_in AS m SET event_id = e.id
+    FROM events AS e
+    WHERE NOT m.existed AND e.source = m.source AND e.source_id = m.source_id
+"""
+
+
+@dataclass
+class MergeResult:
+    """Outcome of :func:`merge_events`: one id per input event plus counts."""
+
+    ids: List[int] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0  # remote version applied to an existing row
+    kept_local: int = 0  # local edit newer than the remote one
+    conflicts: int = 0  # "(conflict)" copies created
+
+
 def merge_event(conn, event: Dict[str, Any], logger: Optional[structlog.BoundLogger] = None) -> int:
     """Insert or update an event record and return its id.
 
@@ -39,82 +139,77 @@ def merge_event(conn, event: Dict[str, Any], logger: Optional[structlog.BoundLog
           the unsynced changes.
         - Otherwise, whichever side has the newer ``updated_at`` wins.
     """
+    return merge_events(conn, [event], logger).ids[0]
+
+
+def merge_events(
+    conn, events: Sequence[Dict[str, Any]], logger: Optional[structlog.BoundLogger] = None
+) -> MergeResult:
+    """Merge many events with the :func:`merge_event` policy.
+
+    Events are loaded into a temp table and classified against ``events`` in a
+    single joined UPDATE; conflict copies, remote updates and inserts are then
+    applied as set-based statements. A key seen twice starts a new chunk so
+    later versions are merged against the earlier ones, as they would be one
+    at a time.
+    """
     if logger is None or not hasattr(logger, "warning"):
         logger = structlog.get_logger(__name__)
-    payload = _norm_event(event)
-    lookup = {"source": payload["source"], "source_id": payload["source_id"]}
-    row = conn.execute(
+    result = MergeResult()
+    chunk: List[Dict[str, Any]] = []
+    seen: set = set()
+    for event in events:
+        payload = _norm_event(event)
+        key = (payload["source"], payload["source_id"])
+        if key in seen:
+            _merge_chunk(conn, chunk, logger, result)
+            chunk, seen = [], set()
+        chunk.append(payload)
+        seen.add(key)
+    _merge_chunk(conn, chunk, logger, result)
+    return result
+
+
+def _merge_chunk(conn, payloads: List[Dict[str, Any]], logger, result: MergeResult) -> None:
+    if not payloads:
+        return
+    now = datetime.utcnow().isoformat()
+    conn.execute(text(_MERGE_TABLE_SQL))
+    conn.execute(text("DELETE FROM merge_in"))
+    rows = []
+    for seq, payload in enumerate(payloads):
+        row = {col: payload.get(col) for col in _MERGE_COLUMNS}
+        row["updated_at"] = payload.get("updated_at", now)
+        row["seq"] = seq
+        rows.append(row)
+    conn.execute(
         text(
-            "SELECT id, title, start_time, end_time, type, description, etag, updated_at, last_synced_at "
-            "FROM events WHERE source = :source AND source_id = :source_id"
+            f"INSERT INTO merge_in (seq, {', '.join(_MERGE_COLUMNS)}) "
+            f"VALUES (:seq, {', '.join(':' + c for c in _MERGE_COLUMNS)})"
         ),
-        lookup,
-    ).fetchone()
-    now = datetime.utcnow().isoformat()
-    remote_updated = payload.get("updated_at", now)
-    remote_etag = payload.get("etag")
-    if row:
-        event_id = int(row.id if hasattr(row, "id") else row[0])
-        local_updated = row.updated_at if hasattr(row, "updated_at") else row[7]
-        last_synced = row.last_synced_at if hasattr(row, "last_synced_at") else row[8]
-        local_edited = bool(last_synced and local_updated and local_updated > last_synced)
-        remote_changed = bool(last_synced is None or remote_updated > last_synced)
-        if local_edited and remote_changed:
-            conflict_payload = {
-                "source": "local",
-                "source_id": f"conflict-{event_id}",
-                "title": f"{row.title} (conflict)",
-                "start_time": row.start_time,
-                "end_time": row.end_time,
-                "type": row.type,
-                "description": row.description,
-                "updated_at": local_updated,
-            }
-            conn.execute(
-                text(
-                    "INSERT INTO events (source, source_id, title, start_time, end_time, type, description, updated_at) "
-                    "VALUES (:source, :source_id, :title, :start_time, :end_time, :type, :description, :updated_at)"
-                ),
-                conflict_payload,
-            )
-            if logger is not None and hasattr(logger, "warning"):
-                logger.warning("sync_conflict", source_id=lookup["source_id"])
-        keep_remote = not local_edited or remote_updated >= local_updated
-        if keep_remote:
-            conn.execute(
-                text(
-                    "UPDATE events SET title=:title, start_time=:start_time, end_time=:end_time, "
-                    "type=:type, description=:description, etag=:etag, updated_at=:updated_at, last_synced_at=:last_synced_at "
-                    "WHERE id=:id"
-                ),
-                {
-                    **payload,
-                    "etag": remote_etag,
-                    "updated_at": remote_updated,
-                    "last_synced_at": now,
-                    "id": event_id,
-                },
-            )
+        rows,
+    )
+    conn.execute(text(_CLASSIFY_SQL))
+    conn.execute(text(_CONFLICT_COPIES_SQL))
+    conn.execute(text(_APPLY_REMOTE_SQL), {"now": now})
+    conn.execute(text(_TOUCH_SQL), {"now": now})
+    conn.execute(text(_INSERT_NEW_SQL), {"now": now})
+    conn.execute(text(_NEW_IDS_SQL))
+    for row in conn.execute(
+        text("SELECT source_id, event_id, existed, conflict, keep_remote FROM merge_in ORDER BY seq")
+    ):
+        result.ids.append(int(row.event_id))
+        if not row.existed:
+            result.inserted += 1
+            continue
+        if row.conflict:
+            result.conflicts += 1
+            logger.warning("sync_conflict", source_id=row.source_id)
+        if row.keep_remote:
+            result.updated += 1
         else:
-            conn.execute(
-                text(
-                    "UPDATE events SET last_synced_at=:last_synced_at WHERE id=:id"
-                ),
-                {"last_synced_at": now, "id": event_id},
-            )
-        return event_id
-    # No existing row: insert
-    insert_payload = {
-        **payload,
-        "etag": remote_etag,
-        "updated_at": remote_updated,
-        "last_synced_at": now,
-    }
-    cols = ", ".join(insert_payload.keys())
-    binds = ", ".join(f":{k}" for k in insert_payload.keys())
-    conn.execute(text(f"INSERT INTO events ({cols}) VALUES ({binds})"), insert_payload)
-    event_id = conn.execute(text("SELECT last_insert_rowid() AS id")).scalar_one()
-    return int(event_id)
+            result.kept_local += 1
+    conn.execute(text("DELETE FROM merge_in"))
 
 
 def get_cursor(conn, provider: str) -> Optional[str]:
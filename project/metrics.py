@@ -1,19 +1,91 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+import threading
+from typing import Dict, Optional, Tuple
 
 from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
 
 from .db import get_engine
 from .settings import load_settings
 
 ALPHA = 0.3
 
+EstimateKey = Tuple[Optional[str], Optional[str]]  # (type, course_label)
 
-def _engine():
-    settings = load_settings()
-    return get_engine(settings.sqlite_path)
+
+def _course_key(course_label: Optional[str]) -> Optional[str]:
+    """Fold an empty course label into ``None``; both share one estimate."""
+    return course_label or None
+
+
+# ``estimates`` stores a missing course label as '' so it can be part of the key.
+_FOLD_ESTIMATE_SQL = """
+    INSERT INTO estimates (type, course_label, weighted, sessions, updated_at)
+    VALUES (:type, COALESCE(:course, ''), :alpha * :actual, 1, :ts)
+    ON CONFLICT (type, course_label) DO UPDATE SET
+        weighted = :alpha * :actual + (1 - :alpha) * estimates.weighted,
+        sessions = estimates.sessions + 1,
+        updated_at = excluded.updated_at
+    WHERE estimates.updated_at <= excluded.updated_at
+"""
+
+_SAVE_ESTIMATE_SQL = """
+    INSERT OR REPLACE INTO estimates (type, course_label, weighted, sessions, updated_at)
+    VALUES (:type, COALESCE(:course, ''), :weighted, :sessions, :ts)
+"""
+
+
+_engine_cache: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def _engine() -> Engine:
+    """Return the metrics engine; settings are only read on first use."""
+    global _engine_cache
+    with _engine_lock:
+        if _engine_cache is None:
+            _engine_cache = get_engine(load_settings().sqlite_path)
+        return _engine_cache
+
+
+def reset_engine() -> None:
+    """Forget the cached engine so the next call re-reads the settings."""
+    global _engine_cache
+    with _engine_lock:
+        _engine_cache = None
+
+
+@dataclass
+class Estimates:
+    """EWMA session lengths per (type, course_label).
+
+    An EWMA seeded with ``d`` after ``n`` sessions equals
+    ``(1 - ALPHA) ** n * d + weighted``, where ``weighted`` depends only on
+    the logged minutes. Keeping ``(weighted, n)`` per key lets one snapshot
+    answer for any default, and lets ``record_session`` fold a new session
+    into the stored state without replaying the log.
+    """
+
+    stats: Dict[EstimateKey, Tuple[float, int]] = field(default_factory=dict)
+
+    def add(self, task_type: Optional[str], course_label: Optional[str], actual_minutes: float) -> None:
+        key = (task_type, _course_key(course_label))
+        weighted, count = self.stats.get(key, (0.0, 0))
+        self.stats[key] = (
+            ALPHA * float(actual_minutes) + (1 - ALPHA) * weighted,
+            count + 1,
+        )
+
+    def get(self, task_type: Optional[str], course_label: Optional[str], default_minutes: int) -> int:
+        weighted, count = self.stats.get((task_type, _course_key(course_label)), (0.0, 0))
+        return _blend(weighted, count, default_minutes)
+
+
+def _blend(weighted: float, count: int, default_minutes: int) -> int:
+    return int(round((1 - ALPHA) ** count * float(default_minutes) + weighted))
 
 
 def record_session(
@@ -24,7 +96,8 @@ def record_session(
     course_label: Optional[str],
     timestamp: Optional[datetime] = None,
 ) -> None:
-    """Record a completed study session."""
+    """Record a completed study session and fold it into its estimate."""
+    course_label = _course_key(course_label)
     ts = (timestamp or datetime.utcnow()).isoformat()
     engine = _engine()
     with engine.begin() as conn:
@@ -44,24 +117,66 @@ def record_session(
                 "ts": ts,
             },
         )
+        folded = conn.execute(
+            text(_FOLD_ESTIMATE_SQL),
+            {"type": task_type, "course": course_label, "actual": actual_minutes,
+             "alpha": ALPHA, "ts": ts},
+        ).rowcount
+        if not folded:
+            # logged out of order (e.g. a backdated entry): replay this key
+            _rebuild(conn, task_type, course_label)
+
+
+def _rebuild(conn: Connection, task_type: Optional[str] = None, course_label: Optional[str] = None) -> int:
+    """Recompute estimates from ``session_log``, for one key or (with no type) all."""
+    sql = "SELECT type, course_label, actual_minutes, logged_at FROM session_log"
+    params: dict = {}
+    if task_type is not None:
+        sql += " WHERE type = :type AND COALESCE(course_label, '') = COALESCE(:course, '')"
+        params = {"type": task_type, "course": course_label}
+    else:
+        conn.execute(text("DELETE FROM estimates"))
+    estimates = Estimates()
+    updated: Dict[EstimateKey, str] = {}
+    for r in conn.execute(text(sql + " ORDER BY logged_at, id"), params):
+        key = (r.type, _course_key(r.course_label))
+        estimates.add(*key, r.actual_minutes)
+        updated[key] = r.logged_at
+    for (key_type, key_course), (weighted, count) in estimates.stats.items():
+        conn.execute(
+            text(_SAVE_ESTIMATE_SQL),
+            {"type": key_type, "course": key_course, "weighted": weighted,
+             "sessions": count, "ts": updated[(key_type, key_course)]},
+        )
+    return len(estimates.stats)
+
+
+def rebuild_estimates(engine: Optional[Engine] = None) -> int:
+    """Recompute every estimate from ``session_log``; returns the number of keys."""
+    with (engine or _engine()).begin() as conn:
+        return _rebuild(conn)
+
+
+def load_estimates(engine: Optional[Engine] = None) -> Estimates:
+    """Return the stored estimates for every (type, course_label)."""
+    estimates = Estimates()
+    with (engine or _engine()).connect() as conn:
+        for r in conn.execute(text("SELECT type, course_label, weighted, sessions FROM estimates")):
+            estimates.stats[(r.type, _course_key(r.course_label))] = (r.weighted, r.sessions)
+    return estimates
 
 
 def get_estimate(task_type: Optional[str], course_label: Optional[str], default_minutes: int) -> int:
     """Return EWMA estimate for session minutes."""
     engine = _engine()
-    with engine.begin() as conn:
-        rows = conn.execute(
+    with engine.connect() as conn:
+        row = conn.execute(
             text(
-                """
-                SELECT actual_minutes FROM session_log
-                WHERE type = :type
-                  AND ((course_label = :course) OR (course_label IS NULL AND :course IS NULL))
-                ORDER BY logged_at
-                """
+                "SELECT weighted, sessions FROM estimates "
+                "WHERE type = :type AND course_label = COALESCE(:course, '')"
             ),
             {"type": task_type, "course": course_label},
-        ).fetchall()
-    estimate = float(default_minutes)
-    for r in rows:
-        estimate = ALPHA * float(r.actual_minutes) + (1 - ALPHA) * estimate
-    return int(round(estimate))
+        ).first()
+    if row is None:
+        return int(default_minutes)
+    return _blend(row.weighted, row.sessions, default_minutes)
@@ -0,0 +1,121 @@
+"""Persistence for planner sessions (``plan_sessions``).
+
+The stored plan is the full multi-session schedule. Every save that changes
+it bumps ``app_meta['plan_version']`` and stamps the rows it inserts with the
+new version, so views reading the plan can tell whether it moved on.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+SessionKey = Tuple[int, str, str]  # (task_id, start_time, end_time)
+
+_BUMP_VERSION_SQL = """
+    INSERT INTO app_meta (key, value) VALUES ('plan_version', '1')
+    ON CONFLICT (key) DO UPDATE SET value = CAST(app_meta.value AS INTEGER) + 1
+"""
+
+# Only tasks whose first session moved are touched.
+_TASK_TIMES_SQL = (
+    "UPDATE tasks SET start_time = :start, end_time = :end WHERE id = :id "
+    "AND (start_time IS NOT :start OR end_time IS NOT :end)"
+)
+
+
+def _version(conn: Connection) -> int:
+    value = conn.execute(text("SELECT value FROM app_meta WHERE key = 'plan_version'")).scalar()
+    return int(value) if value is not None else 0
+
+
+def plan_version(engine: Engine) -> int:
+    """Return the current plan version (0 before the first save)."""
+    with engine.connect() as conn:
+        return _version(conn)
+
+
+def load_plan(engine: Engine, since: datetime, until: Optional[datetime] = None) -> List[Dict]:
+    """Return the stored sessions starting in ``[since, until)``."""
+    sql = (
+        "SELECT task_id, start_time, end_time, rationale, plan_version FROM plan_sessions "
+        "WHERE start_time >= :since"
+    )
+    params = {"since": since.isoformat()}
+    if until is not None:
+        sql += " AND start_time < :until"
+        params["until"] = until.isoformat()
+    with engine.connect() as conn:
+        rows = conn.execute(text(sql + " ORDER BY start_time"), params).fetchall()
+    return [
+        {
+            "task_id": r.task_id,
+            "start_time": datetime.fromisoformat(r.start_time),
+            "end_time": datetime.fromisoformat(r.end_time),
+            "rationale": r.rationale,
+            "plan_version": r.plan_version,
+        }
+        for r in rows
+    ]
+
+
+def save_plan(engine: Engine, sessions: List[Dict], since: datetime) -> Tuple[int, int]:
+    """Replace the stored plan from ``since`` on with ``sessions``.
+
+    Only the difference is written, in one ``executemany`` per statement:
+    sessions already stored are left alone, and the plan version is only
+    bumped when something changed. Returns ``(inserted, deleted)``.
+    """
+    wanted: Dict[SessionKey, Dict] = {
+        (s["task_id"], s["start_time"].isoformat(), s["end_time"].isoformat()): s
+        for s in sessions
+    }
+    with engine.begin() as conn:
+        stored = {
+            (r.task_id, r.start_time, r.end_time): r.id
+            for r in conn.execute(
+                text("SELECT id, task_id, start_time, end_time FROM plan_sessions WHERE start_time >= :since"),
+                {"since": since.isoformat()},
+            )
+        }
+        stale = [{"id": row_id} for key, row_id in stored.items() if key not in wanted]
+        new = [key for key in wanted if key not in stored]
+        if not stale and not new:
+            return 0, 0
+        conn.execute(text(_BUMP_VERSION_SQL))
+        version = _version(conn)
+        if stale:
+            conn.execute(text("DELETE FROM plan_sessions WHERE id = :id"), stale)
+        if new:
+            conn.execute(
+                text(
+                    "INSERT INTO plan_sessions (task_id, start_time, end_time, rationale, plan_version) "
+                    "VALUES (:task_id, :start, :end, :rationale, :version)"
+                ),
+                [
+                    {"task_id": key[0], "start": key[1], "end": key[2],
+                     "rationale": wanted[key].get("rationale"), "version": version}
+                    for key in new
+                ],
+            )
+    return len(new), len(stale)
+
+
+def save_task_times(engine: Engine, sessions: List[Dict]) -> int:
+    """Write each task's first session back to ``tasks`` in one batch.
+
+    Returns the number of tasks whose times changed.
+    """
+    first: Dict[int, Dict] = {}
+    for s in sorted(sessions, key=lambda s: s["start_time"]):
+        first.setdefault(s["task_id"], s)
+    if not first:
+        return 0
+    params = [
+        {"id": task_id, "start": s["start_time"].isoformat(), "end": s["end_time"].isoformat()}
+        for task_id, s in first.items()
+    ]
+    with engine.begin() as conn:
+        return conn.execute(text(_TASK_TIMES_SQL), params).rowcount
@@ -1,8 +1,8 @@
 """Repository data structures and protocol interfaces."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Protocol, Sequence, Optional
+from dataclasses import dataclass, field
+from typing import Any, List, Protocol, Sequence, Optional, Tuple
 
 
 @dataclass
@@ -27,11 +27,43 @@ class Task:
     dirty: int = 0
 
 
+@dataclass
+class TaskPage:
+    """One page of a keyset-paginated task listing.
+
+    ``cursor`` holds the sort key values of the last row and is ``None`` once
+    the listing is exhausted; ``keys`` holds the sort key values of every row.
+    """
+
+    tasks: List[Task]
+    cursor: Optional[Tuple[Any, ...]] = None
+    keys: List[Tuple[Any, ...]] = field(default_factory=list)
+
+
 class Repository(Protocol):
     """Interface for task and event repositories."""
 
     # Tasks
-    def list_tasks(self, filter_mode: str = "All", search: str = "") -> Sequence[Task]: ...
+    def list_tasks(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        *,
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: Optional[int] = None,
+    ) -> Sequence[Task]: ...
+
+    def list_tasks_page(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: int = 100,
+    ) -> TaskPage: ...
+
+    def locate_task(
+        self, filter_mode: str, search: str, task_id: int
+    ) -> Optional[Tuple[Task, Tuple[Any, ...]]]: ...
 
     def upsert_task(self, task: Task) -> Task: ...
 
@@ -0,0 +1,271 @@
+"""Bounded in-memory read cache in front of the task repository."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import threading
+from typing import Any, Generic, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from project.changes import ChangeEvent, change_bus
+
+from .base import Task, TaskPage, Repository
+from .local_sqlite import DEFAULT_PAGE_SIZE
+from .syncing import SyncingRepo
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of one cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe mapping that drops the least recently used entry when full."""
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._stats.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._stats.hits, self._stats.misses, self._stats.evictions, len(self._data)
+            )
+
+
+def _copy_page(page: TaskPage) -> TaskPage:
+    return TaskPage([replace(t) for t in page.tasks], page.cursor, list(page.keys))
+
+
+class CachedRepo(Repository):
+    """Write-through LRU cache over a :class:`SyncingRepo`.
+
+    Task rows are cached by id and listings by their query arguments. Every
+    committed write to ``tasks`` -- through this repository, sync, or the
+    calendar and planner writing SQL directly -- arrives on the engine's
+    change bus and evicts that row and the cached listings; other rows stay
+    cached.
+
+    A read that misses takes the invalidation generation before going to the
+    database and only fills the cache if no invalidation happened meanwhile,
+    so a row read just before another thread's commit is never cached after
+    that commit's eviction. Tasks are copied in and out of the cache, so
+    callers may modify what they get back.
+    """
+
+    def __init__(self, inner: SyncingRepo, *, max_tasks: int = 2048, max_queries: int = 64):
+        self.inner = inner
+        self._tasks: LRUCache[int, Optional[Task]] = LRUCache(max_tasks)
+        self._queries: LRUCache[Tuple[Any, ...], Any] = LRUCache(max_queries)
+        self._generation = 0
+        self._fill_lock = threading.Lock()
+        self._bus = change_bus(inner.local.engine)
+        self._bus.subscribe(self._on_change)
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self._on_change)
+
+    def _on_change(self, ev: ChangeEvent) -> None:
+        if ev.table != "tasks":
+            return
+        if ev.id is None:
+            self.invalidate_all()
+        else:
+            self.invalidate_task(ev.id)
+
+    @property
+    def local(self):
+        return self.inner.local
+
+    @property
+    def remote(self):
+        return self.inner.remote
+
+    @remote.setter
+    def remote(self, remote) -> None:
+        self.inner.remote = remote
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict[str, CacheStats]:
+        return {"tasks": self._tasks.stats(), "queries": self._queries.stats()}
+
+    def invalidate_task(self, task_id: int) -> None:
+        """Forget one task and every cached listing."""
+        with self._fill_lock:
+            self._generation += 1
+            self._tasks.pop(task_id)
+            self._queries.clear()
+
+    def invalidate_queries(self) -> None:
+        """Forget cached listings but keep cached rows."""
+        with self._fill_lock:
+            self._generation += 1
+            self._queries.clear()
+
+    def invalidate_all(self) -> None:
+        with self._fill_lock:
+            self._generation += 1
+            self._tasks.clear()
+            self._queries.clear()
+
+    def _fill(self, generation: int, tasks: Sequence[Task], key: Any = None, value: Any = None) -> bool:
+        """Cache copies of ``tasks`` (and ``value`` under ``key``) unless invalidated since ``generation``."""
+        with self._fill_lock:
+            if generation != self._generation:
+                return False
+            for task in tasks:
+                if task.id is not None:
+                    self._tasks.put(task.id, replace(task))
+            if key is not None:
+                self._queries.put(key, value)
+            return True
+
+    # ------------------------------------------------------------------
+    def get_task(self, task_id: int) -> Optional[Task]:
+        task = self._tasks.get(task_id, _MISSING)
+        if task is _MISSING:
+            generation = self._generation
+            task = self.inner.get_task(task_id)
+            if task is None:
+                with self._fill_lock:
+                    if generation == self._generation:
+                        self._tasks.put(task_id, None)
+                return None
+            self._fill(generation, [task])
+            return task
+        return replace(task) if task is not None else None
+
+    def list_tasks(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        *,
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: Optional[int] = None,
+    ) -> Sequence[Task]:
+        if cursor is not None or page_size is not None:
+            return self.list_tasks_page(
+                filter_mode, search, cursor, page_size or DEFAULT_PAGE_SIZE
+            ).tasks
+        key = ("list", filter_mode, search)
+        tasks = self._queries.get(key)
+        if tasks is None:
+            generation = self._generation
+            tasks = list(self.inner.list_tasks(filter_mode, search))
+            self._fill(generation, tasks, key, [replace(t) for t in tasks])
+            return tasks
+        return [replace(t) for t in tasks]
+
+    def list_tasks_page(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> TaskPage:
+        key = ("page", filter_mode, search, cursor, page_size)
+        page = self._queries.get(key)
+        if page is None:
+            generation = self._generation
+            page = self.inner.list_tasks_page(filter_mode, search, cursor, page_size)
+            self._fill(generation, page.tasks, key, _copy_page(page))
+            return page
+        return _copy_page(page)
+
+    def locate_task(
+        self, filter_mode: str, search: str, task_id: int
+    ) -> Optional[Tuple[Task, Tuple[Any, ...]]]:
+        return self.inner.locate_task(filter_mode, search, task_id)
+
+    def list_pending_tasks(self) -> List[Task]:
+        key = ("pending",)
+        tasks = self._queries.get(key)
+        if tasks is None:
+            generation = self._generation
+            tasks = self.inner.list_pending_tasks()
+            self._fill(generation, tasks, key, [replace(t) for t in tasks])
+            return tasks
+        return [replace(t) for t in tasks]
+
+    # ------------------------------------------------------------------
+    def upsert_task(self, task: Task) -> Task:
+        saved = self.inner.upsert_task(task)
+        # our own commit has already been published, so this is the new row
+        self._fill(self._generation, [saved])
+        return saved
+
+    def upsert_tasks(self, tasks: Sequence[Task]) -> List[Task]:
+        saved = self.inner.upsert_tasks(tasks)
+        self._fill(self._generation, saved)
+        return saved
+
+    def delete_task(self, local_id: int) -> None:
+        self.inner.delete_task(local_id)
+
+    def mark_clean(self, local_id: int) -> None:
+        self.inner.local.mark_clean(local_id)
+
+    # ------------------------------------------------------------------
+    def push_pending(self, *args: Any, **kwargs: Any) -> None:
+        if self.inner.local.pending_count():
+            self.inner.push_pending(*args, **kwargs)
+
+    def pull_changes(self, *args: Any, **kwargs: Any) -> int:
+        return self.inner.pull_changes(*args, **kwargs)
+
+    def list_dead_letters(self) -> List[dict]:
+        return self.inner.list_dead_letters()
+
+    def replay_dead_letters(self, ids: Optional[Sequence[int]] = None) -> int:
+        return self.inner.replay_dead_letters(ids)
@@ -1,7 +1,8 @@
 """Local SQLite cache repository."""
 from __future__ import annotations
 
-from typing import Sequence, List, Optional
+from typing import Any, Callable, Dict, Sequence, List, Optional, Tuple
+from dataclasses import fields
 from datetime import datetime
 import json
 import uuid
@@ -9,8 +10,141 @@ import uuid
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
-from .base import Task
-from .query_builders import build_tasks_query
+from project.db import has_fts
+
+from .base import Task, TaskPage
+from .query_builders import build_tasks_query, sort_key_columns
+
+DEFAULT_PAGE_SIZE = 100
+
+_TASK_FIELDS = tuple(f.name for f in fields(Task))
+_TASK_COLUMNS = ", ".join(_TASK_FIELDS)
+
+_GET_TASK_SQL = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id = :id"
+
+# Walks tasks_state_start_idx for both the filter and the ordering.
+PENDING_TASKS_SQL = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE state = 'pending' ORDER BY start_time"
+
+
+_UPSERT_TASK_SQL = """
+INSERT INTO tasks (
+    id, owner_user_id, source, source_id, title, type, estimated_duration,
+    due_date, state, start_time, end_time, course_label, priority,
+    updated_at, version, dirty
+) VALUES (
+    :id, :owner_user_id, :source, :source_id, :title, :type, :estimated_duration,
+    :due_date, :state, :start_time, :end_time, :course_label, :priority,
+    :updated_at, :version, :dirty
+)
+ON CONFLICT(id) DO UPDATE SET
+    owner_user_id=excluded.owner_user_id,
+    source=excluded.source,
+    source_id=excluded.source_id,
+    title=excluded.title,
+    type=excluded.type,
+    estimated_duration=excluded.estimated_duration,
+    due_date=excluded.due_date,
+    state=excluded.state,
+    start_time=excluded.start_time,
+    end_time=excluded.end_time,
+    course_label=excluded.course_label,
+    priority=excluded.priority,
+    updated_at=excluded.updated_at,
+    version=excluded.version,
+    dirty=excluded.dirty
+"""
+
+# New rows go in as multi-row INSERTs; keep each statement under SQLite's
+# historical 999 bound-parameter limit.
+_INSERT_TASK_COLUMNS = (
+    "owner_user_id", "source", "source_id", "title", "type", "estimated_duration",
+    "due_date", "state", "start_time", "end_time", "course_label", "priority",
+    "updated_at", "version", "dirty",
+)
+_INSERT_CHUNK_ROWS = 999 // len(_INSERT_TASK_COLUMNS)
+
+# Rows pulled from the remote never overwrite local edits that are still
+# waiting to be pushed, and a row whose source key already belongs to another
+# local id is left alone rather than aborting the batch.
+_APPLY_PULLED_TASK_SQL = _UPSERT_TASK_SQL + """WHERE tasks.dirty = 0
+ON CONFLICT DO NOTHING
+"""
+
+_SAVE_SYNC_STATE_SQL = """
+INSERT INTO sync_state (owner_user_id, provider, cursor)
+VALUES (:owner, :provider, :cursor)
+ON CONFLICT(owner_user_id, provider) DO UPDATE SET cursor = excluded.cursor
+"""
+
+# ``:keys`` is a JSON array of ``[owner_user_id, source, source_id]`` triples.
+# Driving the join from json_each keeps it a single statement regardless of
+# batch size while each probe is an index seek on ``tasks_src_idx``.
+_LOOKUP_BY_SOURCE_SQL = """
+SELECT t.id, t.owner_user_id, t.source, t.source_id
+FROM json_each(:keys) k
+CROSS JOIN tasks t
+    ON t.owner_user_id IS json_extract(k.value, '$[0]')
+   AND t.source = json_extract(k.value, '$[1]')
+   AND t.source_id = json_extract(k.value, '$[2]')
+"""
+
+
+def _task_params(task: Task, updated_at: str, version: str, dirty: bool) -> dict:
+    return {
+        "id": task.id,
+        "owner_user_id": task.owner_user_id,
+        "source": task.source,
+        "source_id": task.source_id,
+        "title": task.title,
+        "type": task.type,
+        "estimated_duration": task.estimated_duration,
+        "due_date": task.due_date,
+        "state": task.state,
+        "start_time": task.start_time,
+        "end_time": task.end_time,
+        "course_label": task.course_label,
+        "priority": task.priority,
+        "updated_at": updated_at,
+        "version": version,
+        "dirty": int(dirty),
+    }
+
+
+def _task_from_row(row: dict) -> Task:
+    return Task(**{name: row[name] for name in _TASK_FIELDS if name in row})
+
+
+def _insert_tasks_sql(n: int) -> str:
+    values = ",\n".join(
+        "(" + ", ".join(f":{col}_{i}" for col in _INSERT_TASK_COLUMNS) + ")"
+        for i in range(n)
+    )
+    return (
+        f"INSERT INTO tasks ({', '.join(_INSERT_TASK_COLUMNS)}) VALUES\n{values}\n"
+        "RETURNING id"
+    )
+
+
+def _insert_tasks(conn, rows: List[dict]) -> List[int]:
+    """Insert ``rows`` without ids and return the new ids in input order."""
+    ids: List[int] = []
+    for start in range(0, len(rows), _INSERT_CHUNK_ROWS):
+        chunk = rows[start:start + _INSERT_CHUNK_ROWS]
+        params = {
+            f"{col}_{i}": row[col]
+            for i, row in enumerate(chunk)
+            for col in _INSERT_TASK_COLUMNS
+        }
+        # One statement hands out ascending rowids in VALUES order, but
+        # RETURNING order is unspecified, so sort to line the ids back up.
+        new_ids = sorted(conn.execute(text(_insert_tasks_sql(len(chunk))), params).scalars())
+        ids.extend(new_ids)
+    return ids
+
+
+def _ids_by_source(conn, keys: str) -> Dict[Tuple[Optional[str], str, str], int]:
+    rows = conn.execute(text(_LOOKUP_BY_SOURCE_SQL), {"keys": keys}).fetchall()
+    return {(row.owner_user_id, row.source, row.source_id): int(row.id) for row in rows}
 
 
 class LocalCacheRepo:
@@ -18,126 +152,399 @@ class LocalCacheRepo:
 
     def __init__(self, engine: Engine):
         self.engine = engine
+        self._use_fts: Optional[bool] = None
+        self._pending_listeners: List[Callable[[], None]] = []
+
+    def _fts_enabled(self, conn) -> bool:
+        if self._use_fts is None:
+            self._use_fts = has_fts(conn, "tasks_fts")
+        return self._use_fts
 
     # ------------------------------------------------------------------
-    def list_tasks(self, filter_mode: str = "All", search: str = "") -> Sequence[Task]:
-        sql, params = build_tasks_query(filter_mode, search, include_sync_columns=True)
+    def list_tasks(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        *,
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: Optional[int] = None,
+    ) -> Sequence[Task]:
+        if cursor is not None or page_size is not None:
+            return self.list_tasks_page(
+                filter_mode, search, cursor, page_size or DEFAULT_PAGE_SIZE
+            ).tasks
         with self.engine.begin() as conn:
+            sql, params = build_tasks_query(
+                filter_mode,
+                search,
+                include_sync_columns=True,
+                use_fts=bool(search) and self._fts_enabled(conn),
+            )
             rows = conn.execute(text(sql), params).mappings().all()
             return [Task(**row) for row in rows]
 
+    def list_tasks_page(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> TaskPage:
+        """Return up to ``page_size`` tasks after ``cursor`` (keyset pagination)."""
+        with self.engine.begin() as conn:
+            sql, params = build_tasks_query(
+                filter_mode,
+                search,
+                include_sync_columns=True,
+                use_fts=bool(search) and self._fts_enabled(conn),
+                cursor=cursor,
+                page_size=page_size,
+            )
+            rows = conn.execute(text(sql), params).mappings().all()
+        tasks: List[Task] = []
+        keys: List[Tuple[Any, ...]] = []
+        for row in rows:
+            data, key = sort_key_columns(row)
+            tasks.append(Task(**data))
+            keys.append(key)
+        next_cursor = keys[-1] if len(tasks) == page_size else None
+        return TaskPage(tasks, next_cursor, keys)
+
+    def locate_task(
+        self, filter_mode: str, search: str, task_id: int
+    ) -> Optional[Tuple[Task, Tuple[Any, ...]]]:
+        """Return the task and its sort key if it is part of the listing, else ``None``."""
+        with self.engine.connect() as conn:
+            sql, params = build_tasks_query(
+                filter_mode,
+                search,
+                include_sync_columns=True,
+                use_fts=bool(search) and self._fts_enabled(conn),
+                page_size=1,
+                task_id=task_id,
+            )
+            row = conn.execute(text(sql), params).mappings().first()
+        if row is None:
+            return None
+        data, key = sort_key_columns(row)
+        return Task(**data), key
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        with self.engine.connect() as conn:
+            row = conn.execute(text(_GET_TASK_SQL), {"id": task_id}).mappings().first()
+        return Task(**row) if row else None
+
+    def list_pending_tasks(self) -> List[Task]:
+        """Return pending tasks ordered by start time (unscheduled first)."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(PENDING_TASKS_SQL)).mappings().all()
+        return [Task(**row) for row in rows]
+
     # ------------------------------------------------------------------
     def upsert_task(self, task: Task, dirty: bool = False) -> Task:
+        return self.upsert_tasks([task], dirty=dirty)[0]
+
+    def upsert_tasks(self, tasks: Sequence[Task], dirty: bool = False) -> List[Task]:
+        """Insert or update many tasks in a single transaction.
+
+        Existing tasks are written with one ``executemany``; new tasks go in
+        as chunked multi-row ``INSERT ... RETURNING id`` statements so each
+        gets the id of its own row, even when several share an
+        ``(owner, source, source_id)`` key. The given ``Task`` objects are
+        updated in place and returned.
+        """
+        if not tasks:
+            return []
         updated_at = datetime.utcnow().isoformat()
-        version = str(uuid.uuid4())
+        versions = [str(uuid.uuid4()) for _ in tasks]
+        params = [
+            _task_params(task, updated_at, version, dirty)
+            for task, version in zip(tasks, versions)
+        ]
+        existing = [p for task, p in zip(tasks, params) if task.id is not None]
         with self.engine.begin() as conn:
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO tasks (
-                        id, owner_user_id, source, source_id, title, type, estimated_duration,
-                        due_date, state, start_time, end_time, course_label, priority,
-                        updated_at, version, dirty
-                    ) VALUES (
-                        :id, :owner_user_id, :source, :source_id, :title, :type, :estimated_duration,
-                        :due_date, :state, :start_time, :end_time, :course_label, :priority,
-                        :updated_at, :version, :dirty
-                    )
-                    ON CONFLICT(id) DO UPDATE SET
-                        owner_user_id=excluded.owner_user_id,
-                        source=excluded.source,
-                        source_id=excluded.source_id,
-                        title=excluded.title,
-                        type=excluded.type,
-                        estimated_duration=excluded.estimated_duration,
-                        due_date=excluded.due_date,
-                        state=excluded.state,
-                        start_time=excluded.start_time,
-                        end_time=excluded.end_time,
-                        course_label=excluded.course_label,
-                        priority=excluded.priority,
-                        updated_at=excluded.updated_at,
-                        version=excluded.version,
-                        dirty=excluded.dirty
-                    """
-                ),
-                {
-                    "id": task.id,
-                    "owner_user_id": task.owner_user_id,
-                    "source": task.source,
-                    "source_id": task.source_id,
-                    "title": task.title,
-                    "type": task.type,
-                    "estimated_duration": task.estimated_duration,
-                    "due_date": task.due_date,
-                    "state": task.state,
-                    "start_time": task.start_time,
-                    "end_time": task.end_time,
-                    "course_label": task.course_label,
-                    "priority": task.priority,
-                    "updated_at": updated_at,
-                    "version": version,
-                    "dirty": int(dirty),
-                },
-            )
-            if task.id is None:
-                row = conn.execute(
-                    text(
-                        "SELECT id FROM tasks WHERE source=:source AND source_id=:source_id"
-                    ),
-                    {"source": task.source, "source_id": task.source_id},
-                ).fetchone()
-                if row is None:
-                    # Something went very wrong – the row should have been inserted
-                    raise RuntimeError("Failed to fetch inserted task id")
-                task.id = int(row[0])
-        task.updated_at = updated_at
-        task.version = version
-        task.dirty = int(dirty)
-        return task
+            if existing:
+                conn.execute(text(_UPSERT_TASK_SQL), existing)
+            new = [task for task in tasks if task.id is None]
+            if new:
+                rows = [p for task, p in zip(tasks, params) if task.id is None]
+                for task, task_id in zip(new, _insert_tasks(conn, rows)):
+                    task.id = task_id
+        for task, version in zip(tasks, versions):
+            task.updated_at = updated_at
+            task.version = version
+            task.dirty = int(dirty)
+        return list(tasks)
 
     # ------------------------------------------------------------------
+    def add_pending_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` after every commit that queues pending ops."""
+        self._pending_listeners.append(callback)
+
+    def remove_pending_listener(self, callback: Callable[[], None]) -> None:
+        if callback in self._pending_listeners:
+            self._pending_listeners.remove(callback)
+
+    def _notify_pending(self) -> None:
+        for callback in list(self._pending_listeners):
+            callback()
+
     def queue_pending(
         self, table: str, op_type: str, row_local_id: Optional[int], payload: dict
     ) -> None:
         """Queue an operation for later sync.
 
         If ``row_local_id`` is ``None`` we attempt to resolve the id from the
-        payload using ``(source, source_id)``. This makes the function robust
+        payload using ``(owner_user_id, source, source_id)``. This makes the function robust
         when callers have not yet persisted the row locally.
         """
         with self.engine.begin() as conn:
             if row_local_id is None:
                 source = payload.get("source")
                 source_id = payload.get("source_id")
-                if source and source_id:
-                    res = conn.execute(
-                        text(
-                            "SELECT id FROM tasks WHERE source=:source AND source_id=:source_id"
-                        ),
-                        {"source": source, "source_id": source_id},
-                    ).fetchone()
-                    if res is None:
-                        raise ValueError("row_local_id missing and task not found")
-                    row_local_id = int(res[0])
-                else:
+                if not (source and source_id):
                     raise ValueError("row_local_id required when source identifiers missing")
+                owner = payload.get("owner_user_id")
+                ids = _ids_by_source(conn, json.dumps([[owner, source, source_id]]))
+                row_local_id = ids.get((owner, source, source_id))
+                if row_local_id is None:
+                    raise ValueError("row_local_id missing and task not found")
             conn.execute(
                 text(
                     "INSERT INTO pending_ops (table_name, op_type, row_local_id, payload) VALUES (:t,:o,:r,:p)"
                 ),
                 {"t": table, "o": op_type, "r": row_local_id, "p": json.dumps(payload)},
             )
+        self._notify_pending()
+
+    def queue_pending_many(
+        self, table: str, op_type: str, ops: Sequence[Tuple[Optional[int], dict]]
+    ) -> None:
+        """Queue several ``(row_local_id, payload)`` operations at once.
+
+        Missing ids are resolved like :meth:`queue_pending`, but with a single
+        keyed lookup for the whole batch.
+        """
+        if not ops:
+            return
+        with self.engine.begin() as conn:
+            unresolved = [payload for row_id, payload in ops if row_id is None]
+            ids: Dict[Tuple[Optional[str], str, str], int] = {}
+            if unresolved:
+                if any(not (p.get("source") and p.get("source_id")) for p in unresolved):
+                    raise ValueError("row_local_id required when source identifiers missing")
+                keys = json.dumps(
+                    [[p.get("owner_user_id"), p["source"], p["source_id"]] for p in unresolved]
+                )
+                ids = _ids_by_source(conn, keys)
+            params = []
+            for row_id, payload in ops:
+                if row_id is None:
+                    key = (payload.get("owner_user_id"), payload["source"], payload["source_id"])
+                    row_id = ids.get(key)
+                    if row_id is None:
+                        raise ValueError("row_local_id missing and task not found")
+                params.append(
+                    {"t": table, "o": op_type, "r": row_id, "p": json.dumps(payload)}
+                )
+            conn.execute(
+                text(
+                    "INSERT INTO pending_ops (table_name, op_type, row_local_id, payload) VALUES (:t,:o,:r,:p)"
+                ),
+                params,
+            )
+        self._notify_pending()
 
     def get_pending_ops(self) -> List[dict]:
         with self.engine.begin() as conn:
             rows = conn.execute(text("SELECT * FROM pending_ops ORDER BY id")).mappings().all()
             return [dict(r) for r in rows]
 
+    def pending_count(self) -> int:
+        with self.engine.connect() as conn:
+            return int(conn.execute(text("SELECT COUNT(*) FROM pending_ops")).scalar_one())
+
     def delete_pending_op(self, op_id: int) -> None:
         with self.engine.begin() as conn:
             conn.execute(text("DELETE FROM pending_ops WHERE id=:id"), {"id": op_id})
 
+    def complete_pending_ops(self, op_ids: Sequence[int], clean_ids: Sequence[int]) -> None:
+        """Drop pushed ops and mark their rows clean in one transaction.
+
+        A row stays dirty when another op for it was queued after the push
+        started, so that edit is not lost. Dead letters for the pushed rows
+        are superseded and dropped as well.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "DELETE FROM dead_letter_ops WHERE table_name='tasks' "
+                    "AND row_local_id IN (SELECT value FROM json_each(:ids))"
+                ),
+                {"ids": json.dumps([str(i) for i in clean_ids])},
+            )
+            conn.execute(
+                text("DELETE FROM pending_ops WHERE id IN (SELECT value FROM json_each(:ids))"),
+                {"ids": json.dumps(list(op_ids))},
+            )
+            conn.execute(
+                text(
+                    "UPDATE tasks SET dirty=0 WHERE id IN (SELECT value FROM json_each(:ids)) "
+                    "AND NOT EXISTS (SELECT 1 FROM pending_ops p "
+                    "WHERE p.table_name='tasks' AND p.row_local_id=tasks.id)"
+                ),
+                {"ids": json.dumps(list(clean_ids))},
+            )
+
+    def fail_pending_ops(
+        self, op_ids: Sequence[int], error: str, attempts: int, retry_at: Optional[str]
+    ) -> None:
+        """Record a failed push and hold the ops back until ``retry_at``.
+
+        With ``retry_at`` of ``None`` the ops are due again on the next push.
+
+        The ops keep their place in the queue; ops behind them are still
+        pushed in the meantime.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE pending_ops SET attempts=:attempts, last_error=:err, "
+                    "next_attempt_at=:retry_at WHERE id IN (SELECT value FROM json_each(:ids))"
+                ),
+                {
+                    "ids": json.dumps(list(op_ids)),
+                    "err": error,
+                    "attempts": attempts,
+                    "retry_at": retry_at,
+                },
+            )
+
+    def dead_letter_pending_ops(self, op_ids: Sequence[int], error: str, attempts: int) -> None:
+        """Move ops that exhausted their attempts to ``dead_letter_ops``."""
+        params = {"ids": json.dumps(list(op_ids)), "err": error, "attempts": attempts}
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO dead_letter_ops "
+                    "(id, table_name, op_type, row_local_id, payload, attempts, last_error, created_at) "
+                    "SELECT id, table_name, op_type, row_local_id, payload, :attempts, :err, created_at "
+                    "FROM pending_ops WHERE id IN (SELECT value FROM json_each(:ids)) ORDER BY id"
+                ),
+                params,
+            )
+            conn.execute(
+                text("DELETE FROM pending_ops WHERE id IN (SELECT value FROM json_each(:ids))"),
+                params,
+            )
+
+    def list_dead_letters(self) -> List[dict]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT * FROM dead_letter_ops ORDER BY id")).mappings().all()
+            return [dict(r) for r in rows]
+
+    def replay_dead_letters(self, ids: Optional[Sequence[int]] = None) -> int:
+        """Requeue dead letters (all of them by default) with a fresh attempt count.
+
+        Ops go back under their original id, so an edit queued after them
+        still wins compaction. Returns the number of ops requeued.
+        """
+        where = "" if ids is None else " WHERE id IN (SELECT value FROM json_each(:ids))"
+        params = {"ids": json.dumps(list(ids or []))}
+        with self.engine.begin() as conn:
+            moved = conn.execute(
+                text(
+                    "INSERT INTO pending_ops (id, table_name, op_type, row_local_id, payload, created_at) "
+                    f"SELECT id, table_name, op_type, row_local_id, payload, created_at FROM dead_letter_ops{where} "
+                    "ORDER BY id"
+                ),
+                params,
+            ).rowcount
+            conn.execute(text(f"DELETE FROM dead_letter_ops{where}"), params)
+        if moved:
+            self._notify_pending()
+        return moved
+
+    # ------------------------------------------------------------------
+    # ``sync_state.owner_user_id`` is part of the primary key, so the
+    # single-user case (no owner) is stored under ''.
+    def get_sync_state(
+        self, owner_user_id: Optional[str], provider: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(cursor, last_full_sync)`` for ``provider``."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    "SELECT cursor, last_full_sync FROM sync_state "
+                    "WHERE owner_user_id=:owner AND provider=:provider"
+                ),
+                {"owner": owner_user_id or "", "provider": provider},
+            ).first()
+        return (row.cursor, row.last_full_sync) if row else (None, None)
+
+    def apply_pulled_tasks(
+        self,
+        rows: Sequence[dict],
+        owner_user_id: Optional[str],
+        provider: str,
+        cursor: Optional[str],
+    ) -> None:
+        """Merge one page of remote task rows and advance the pull cursor.
+
+        Live rows are upserted by id, tombstones (``deleted_at`` set) delete
+        the local row; rows with unpushed local edits are skipped. The page
+        and the new ``sync_state`` cursor commit together.
+        """
+        live = [row for row in rows if not row.get("deleted_at")]
+        gone = [row["id"] for row in rows if row.get("deleted_at")]
+        with self.engine.begin() as conn:
+            if live:
+                conn.execute(
+                    text(_APPLY_PULLED_TASK_SQL),
+                    [
+                        _task_params(_task_from_row(row), row.get("updated_at"), row.get("version") or "", False)
+                        for row in live
+                    ],
+                )
+            if gone:
+                conn.execute(
+                    text("DELETE FROM tasks WHERE dirty=0 AND id IN (SELECT value FROM json_each(:ids))"),
+                    {"ids": json.dumps(gone)},
+                )
+            conn.execute(
+                text(_SAVE_SYNC_STATE_SQL),
+                {"owner": owner_user_id or "", "provider": provider, "cursor": cursor},
+            )
+
+    def finish_full_sync(
+        self,
+        seen_ids: Sequence[int],
+        owner_user_id: Optional[str],
+        provider: str,
+        synced_at: str,
+    ) -> int:
+        """Drop clean local tasks the remote no longer has; return how many.
+
+        Called after a full pull so rows deleted remotely without a tombstone
+        are reconciled too. Without an owner every clean task is considered.
+        """
+        sql = "DELETE FROM tasks WHERE dirty=0 AND id NOT IN (SELECT value FROM json_each(:ids))"
+        if owner_user_id:
+            sql += " AND owner_user_id = :uid"
+        with self.engine.begin() as conn:
+            removed = conn.execute(
+                text(sql), {"ids": json.dumps(list(seen_ids)), "uid": owner_user_id}
+            ).rowcount
+            conn.execute(
+                text(
+                    "INSERT INTO sync_state (owner_user_id, provider, last_full_sync) "
+                    "VALUES (:owner, :provider, :at) ON CONFLICT(owner_user_id, provider) "
+                    "DO UPDATE SET last_full_sync = excluded.last_full_sync"
+                ),
+                {"at": synced_at, "owner": owner_user_id or "", "provider": provider},
+            )
+        return removed
+
     # ------------------------------------------------------------------
     def mark_clean(self, local_id: int) -> None:
         with self.engine.begin() as conn:
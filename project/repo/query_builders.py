@@ -2,7 +2,22 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Tuple, Dict
+from typing import Any, Dict, Optional, Sequence, Tuple
+import re
+
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_fts_match(search: str) -> Optional[str]:
+    """Turn free text into an FTS5 MATCH expression with prefix matching.
+
+    Every word becomes a quoted prefix term (``"word"*``) and terms are
+    implicitly AND-ed. Returns ``None`` if the text contains no words.
+    """
+    tokens = _FTS_TOKEN.findall(search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{tok}"*' for tok in tokens)
 
 
 def build_tasks_query(
@@ -10,15 +25,31 @@ def build_tasks_query(
     search: str,
     *,
     include_sync_columns: bool = False,
-) -> Tuple[str, Dict[str, str]]:
+    use_fts: bool = False,
+    cursor: Optional[Sequence[Any]] = None,
+    page_size: Optional[int] = None,
+    task_id: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
     """Construct SQL and params for tasks filtering.
 
     If ``include_sync_columns`` is True, additional sync metadata columns are
     included in the SELECT list. Tests that create their own schema can rely on
     the default which matches the legacy column set.
+
+    With ``use_fts`` the search runs against the ``tasks_fts`` index using
+    prefix matching and results are ranked by ``bm25`` before the filter's own
+    ordering. Without it (or when FTS5 is unavailable) search falls back to
+    ``LIKE``.
+
+    Results are always ordered by the filter's sort keys followed by ``id`` so
+    the order is total. When ``page_size`` is given the query is limited and
+    the sort key values are selected as ``sort_k0 .. sort_kN``; passing the
+    last row's values back as ``cursor`` continues after that row (keyset
+    pagination, see :func:`sort_key_columns`). ``task_id`` restricts the
+    listing to that one task, e.g. to find where a changed row now sorts.
     """
     where_clauses = []
-    params: Dict[str, str] = {}
+    params: Dict[str, Any] = {}
 
     if filter_mode == "Today":
         today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -28,26 +59,47 @@ def build_tasks_query(
         where_clauses.append(
             "(state = 'pending' OR (start_time >= :today AND start_time < :tomorrow))"
         )
-        order_clause = "ORDER BY COALESCE(start_time, due_date)"
+        order_keys = ["COALESCE(start_time, due_date, '')"]
     elif filter_mode == "Upcoming":
         where_clauses.append("due_date IS NOT NULL")
-        order_clause = "ORDER BY due_date"
+        order_keys = ["due_date"]
     elif filter_mode == "By Course":
-        order_clause = (
-            "ORDER BY COALESCE(course_label, ''), COALESCE(due_date, '9999-12-31')"
-        )
+        order_keys = ["COALESCE(course_label, '')", "COALESCE(due_date, '9999-12-31')"]
     elif filter_mode == "By Priority":
-        order_clause = (
-            "ORDER BY COALESCE(priority, 3), COALESCE(due_date, '9999-12-31')"
-        )
+        order_keys = ["COALESCE(priority, 3)", "COALESCE(due_date, '9999-12-31')"]
     else:  # All
-        order_clause = "ORDER BY created_at"
+        order_keys = ["created_at"]
 
-    if search:
+    join_sql = ""
+    fts_match = build_fts_match(search) if (search and use_fts) else None
+    if fts_match:
+        params["fts"] = fts_match
+        join_sql = (
+            "JOIN (SELECT rowid AS fts_id, bm25(tasks_fts) AS rank "
+            "FROM tasks_fts WHERE tasks_fts MATCH :fts) hits ON hits.fts_id = tasks.id"
+        )
+        order_keys.insert(0, "hits.rank")
+    elif search:
         params["q"] = f"%{search.lower()}%"
         where_clauses.append(
             "(LOWER(title) LIKE :q OR LOWER(type) LIKE :q OR LOWER(COALESCE(course_label,'')) LIKE :q)"
         )
+    order_keys.append("tasks.id")
+    if task_id is not None:
+        params["task_id"] = task_id
+        where_clauses.append("tasks.id = :task_id")
+
+    if cursor is not None:
+        if len(cursor) != len(order_keys):
+            raise ValueError("cursor does not match the sort keys of this filter")
+        binds = []
+        for idx, value in enumerate(cursor):
+            params[f"c{idx}"] = value
+            binds.append(f":c{idx}")
+        # The redundant bound on the leading key lets SQLite seek the ordering
+        # index; it does not derive a range from a row value over expressions.
+        where_clauses.append(f"{order_keys[0]} >= :c0")
+        where_clauses.append(f"({', '.join(order_keys)}) > ({', '.join(binds)})")
 
     where_sql = ""
     if where_clauses:
@@ -69,6 +121,42 @@ def build_tasks_query(
         cols.extend(
             ["owner_user_id", "source", "source_id", "updated_at", "version", "dirty"]
         )
+    limit_sql = ""
+    if page_size is not None:
+        cols.extend(f"{key} AS sort_k{idx}" for idx, key in enumerate(order_keys))
+        params["limit"] = page_size
+        limit_sql = "LIMIT :limit"
     cols_sql = ", ".join(cols)
-    sql = f"SELECT {cols_sql} FROM tasks {where_sql} {order_clause}"
+    order_clause = "ORDER BY " + ", ".join(order_keys)
+    sql = f"SELECT {cols_sql} FROM tasks {join_sql} {where_sql} {order_clause} {limit_sql}"
+    return sql, params
+
+
+def sort_key_columns(row: Dict[str, Any]) -> Tuple[Dict[str, Any], Tuple[Any, ...]]:
+    """Split a paged row into its task columns and its keyset cursor."""
+    data = dict(row)
+    keys = sorted((k for k in data if k.startswith("sort_k")), key=lambda k: int(k[6:]))
+    return data, tuple(data.pop(k) for k in keys)
+
+
+def build_events_search_query(search: str, *, use_fts: bool = False, limit: int = 50) -> Tuple[str, Dict[str, object]]:
+    """Construct SQL and params for searching event titles/descriptions."""
+    params: Dict[str, object] = {"limit": limit}
+    fts_match = build_fts_match(search) if use_fts else None
+    cols = "events.id, source, source_id, title, start_time, end_time, type, description"
+    if fts_match:
+        params["fts"] = fts_match
+        sql = (
+            f"SELECT {cols} FROM events "
+            "JOIN (SELECT rowid AS fts_id, bm25(events_fts) AS rank "
+            "FROM events_fts WHERE events_fts MATCH :fts) hits ON hits.fts_id = events.id "
+            "ORDER BY hits.rank, start_time LIMIT :limit"
+        )
+    else:
+        params["q"] = f"%{search.lower()}%"
+        sql = (
+            f"SELECT {cols} FROM events "
+            "WHERE LOWER(title) LIKE :q OR LOWER(COALESCE(description,'')) LIKE :q "
+            "ORDER BY start_time LIMIT :limit"
+        )
     return sql, params
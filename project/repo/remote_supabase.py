@@ -1,7 +1,7 @@
 """Remote repository backed by Supabase."""
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 from .base import Task
 from integrations.supabase_client import SupabaseClient
@@ -15,14 +15,45 @@ class RemoteSupabaseRepo:
         data = self.client.select("tasks", "*")
         return [Task(**row) for row in data]
 
+    def fetch_task_changes(
+        self, since: Optional[str], limit: int, owner_user_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return one page of task rows changed after ``since``, tombstones included.
+
+        A full page is extended with every row sharing its last ``updated_at``
+        so the next page can resume strictly after that timestamp without
+        skipping ties.
+        """
+        filters = {"owner_user_id": owner_user_id} if owner_user_id else {}
+        rows = self.client.select_changed("tasks", since, limit, **filters)
+        if len(rows) < limit:
+            return rows
+        last = rows[-1]["updated_at"]
+        seen = {row["id"] for row in rows}
+        ties = self.client.select("tasks", "*", updated_at=last, **filters)
+        return rows + [row for row in ties if row["id"] not in seen]
+
     def upsert_task(self, task: Task) -> Task:
         payload = task.__dict__.copy()
         self.client.upsert("tasks", payload)
         task.dirty = 0
         return task
 
+    def upsert_tasks(self, tasks: Sequence[Task]) -> List[Task]:
+        """Upsert ``tasks`` with one bulk request."""
+        if tasks:
+            self.client.upsert_many("tasks", [task.__dict__.copy() for task in tasks])
+        for task in tasks:
+            task.dirty = 0
+        return list(tasks)
+
     def delete_task(self, local_id: int) -> None:
         self.client.delete("tasks", "id", local_id)
 
+    def delete_tasks(self, local_ids: Sequence[int]) -> None:
+        """Delete several tasks with one bulk request."""
+        if local_ids:
+            self.client.delete_many("tasks", "id", list(local_ids))
+
     def push_pending(self) -> None:  # pragma: no cover - remote is authoritative
         pass
@@ -1,15 +1,91 @@
 """Repository orchestrator that syncs between remote and local stores."""
 from __future__ import annotations
 
-from typing import Sequence, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Sequence, Optional, Tuple
 import json
 
+import httpx
 from sqlalchemy import text
 
-from .base import Task, Repository
-from .local_sqlite import LocalCacheRepo
+from .base import Task, TaskPage, Repository
+from .local_sqlite import DEFAULT_PAGE_SIZE, LocalCacheRepo
 from .remote_supabase import RemoteSupabaseRepo
 
+PUSH_BATCH_SIZE = 500
+# A failing op is retried after RETRY_BASE, doubling up to RETRY_CAP, and is
+# dead-lettered once it has failed MAX_PUSH_ATTEMPTS times.
+MAX_PUSH_ATTEMPTS = 8
+RETRY_BASE = timedelta(seconds=30)
+RETRY_CAP = timedelta(hours=1)
+# This many failures in a row with nothing pushed is treated as the remote
+# being unreachable rather than as bad ops.
+OUTAGE_PROBE = 3
+# Errors that say nothing about the op itself (network down, timeouts).
+TRANSPORT_ERRORS = (OSError, httpx.TransportError)
+PULL_PAGE_SIZE = 500
+PULL_PROVIDER = "supabase:tasks"
+FULL_SYNC_INTERVAL = timedelta(days=1)
+
+
+@dataclass
+class PendingOp:
+    """The net effect of every queued op for one row.
+
+    ``op_ids`` lists all ``pending_ops`` ids folded into this op; they are
+    removed together once it has been pushed. Retry state comes from the
+    newest op, so a fresh edit to a failing row is tried right away.
+    """
+
+    table_name: str
+    op_type: str
+    row_local_id: int
+    payload: dict
+    op_ids: List[int] = field(default_factory=list)
+    attempts: int = 0
+    next_attempt_at: Optional[str] = None
+
+
+def compact_pending_ops(ops: Sequence[dict]) -> List[PendingOp]:
+    """Collapse queued ops to the latest one per ``(table_name, row)``.
+
+    Repeated upserts keep only the newest payload and a trailing delete
+    replaces the upserts before it. Rows are ordered by their last op, so the
+    relative order of the final writes is preserved.
+    """
+    compacted: Dict[Tuple[str, int], PendingOp] = {}
+    for op in ops:
+        key = (op["table_name"], int(op["row_local_id"]))
+        prev = compacted.pop(key, None)
+        op_ids = prev.op_ids if prev else []
+        op_ids.append(op["id"])
+        compacted[key] = PendingOp(
+            table_name=op["table_name"],
+            op_type=op["op_type"],
+            row_local_id=key[1],
+            payload=json.loads(op["payload"]),
+            op_ids=op_ids,
+            attempts=op.get("attempts") or 0,
+            next_attempt_at=op.get("next_attempt_at"),
+        )
+    return list(compacted.values())
+
+
+def batch_pending_ops(ops: Sequence[PendingOp], batch_size: int) -> Iterator[List[PendingOp]]:
+    """Yield runs of ops sharing table and op type, at most ``batch_size`` long."""
+    batch: List[PendingOp] = []
+    for op in ops:
+        if batch and (
+            len(batch) >= batch_size
+            or (op.table_name, op.op_type) != (batch[0].table_name, batch[0].op_type)
+        ):
+            yield batch
+            batch = []
+        batch.append(op)
+    if batch:
+        yield batch
+
 
 class SyncingRepo(Repository):
     """Repository that delegates to local cache and remote Supabase."""
@@ -19,8 +95,35 @@ class SyncingRepo(Repository):
         self.remote = remote
 
     # ------------------------------------------------------------------
-    def list_tasks(self, filter_mode: str = "All", search: str = "") -> Sequence[Task]:
-        return self.local.list_tasks(filter_mode, search)
+    def list_tasks(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        *,
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: Optional[int] = None,
+    ) -> Sequence[Task]:
+        return self.local.list_tasks(filter_mode, search, cursor=cursor, page_size=page_size)
+
+    def list_tasks_page(
+        self,
+        filter_mode: str = "All",
+        search: str = "",
+        cursor: Optional[Tuple[Any, ...]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> TaskPage:
+        return self.local.list_tasks_page(filter_mode, search, cursor, page_size)
+
+    def locate_task(
+        self, filter_mode: str, search: str, task_id: int
+    ) -> Optional[Tuple[Task, Tuple[Any, ...]]]:
+        return self.local.locate_task(filter_mode, search, task_id)
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        return self.local.get_task(task_id)
+
+    def list_pending_tasks(self) -> List[Task]:
+        return self.local.list_pending_tasks()
 
     # ------------------------------------------------------------------
     def upsert_task(self, task: Task) -> Task:
@@ -32,6 +135,15 @@ class SyncingRepo(Repository):
             self.local.queue_pending("tasks", "upsert", task.id, task.__dict__)
         return task
 
+    def upsert_tasks(self, tasks: Sequence[Task]) -> List[Task]:
+        """Bulk variant of :meth:`upsert_task` for imports."""
+        if self.remote is not None:
+            self.remote.upsert_tasks(tasks)
+            return self.local.upsert_tasks(tasks, dirty=False)
+        saved = self.local.upsert_tasks(tasks, dirty=True)
+        self.local.queue_pending_many("tasks", "upsert", [(t.id, t.__dict__) for t in saved])
+        return saved
+
     def delete_task(self, local_id: int) -> None:
         if self.remote is not None:
             self.remote.delete_task(local_id)
@@ -46,18 +158,132 @@ class SyncingRepo(Repository):
                 )
 
     # ------------------------------------------------------------------
-    def push_pending(self) -> None:
+    def push_pending(self, batch_size: int = PUSH_BATCH_SIZE) -> None:
+        """Replay the offline queue against the remote.
+
+        The queue is compacted first and the due ops are sent as bulk
+        requests of up to ``batch_size`` rows, each batch's local bookkeeping
+        committed in one transaction. When a batch fails its ops are retried
+        one by one so a bad op only holds back itself: it is rescheduled with
+        exponential backoff and dead-lettered after ``MAX_PUSH_ATTEMPTS``.
+        If ``OUTAGE_PROBE`` ops fail in a row without any success the remote
+        is assumed down: the last error is re-raised and those failures are
+        not counted against the ops.
+        """
         if self.remote is None:
             return
-        for op in self.local.get_pending_ops():
+        now = datetime.utcnow()
+        stamp = now.isoformat()
+        due = [
+            op
+            for op in compact_pending_ops(self.local.get_pending_ops())
+            if op.next_attempt_at is None or op.next_attempt_at <= stamp
+        ]
+        # Failures since the last success: until something goes through (or
+        # the run ends) they may just as well be an outage, so they are only
+        # counted against the ops once another op succeeds.
+        streak: List[Tuple[PendingOp, Exception]] = []
+
+        def failed(op: PendingOp, exc: Exception) -> None:
+            streak.append((op, exc))
+            if len(streak) >= OUTAGE_PROBE:
+                for failed_op, failed_exc in streak:
+                    self._record_failure(failed_op, failed_exc, now, count=False)
+                raise exc
+
+        def succeeded() -> None:
+            for failed_op, failed_exc in streak:
+                self._record_failure(failed_op, failed_exc, now)
+            streak.clear()
+
+        for batch in batch_pending_ops(due, batch_size):
             try:
-                if op["op_type"] == "upsert":
-                    self.remote.upsert_task(Task(**json.loads(op["payload"])))
-                    self.local.mark_clean(int(op["row_local_id"]))
-                elif op["op_type"] == "delete":
-                    payload = json.loads(op["payload"])
-                    self.remote.delete_task(payload["id"])
-                self.local.delete_pending_op(op["id"])
-            except Exception as exc:  # pragma: no cover - network
-                self.local.queue_pending(op["table_name"], op["op_type"], op["row_local_id"], json.loads(op["payload"]))
+                self._push_batch(batch)
+            except Exception as exc:
+                if len(batch) == 1:
+                    failed(batch[0], exc)
+                    continue
+                for op in batch:
+                    try:
+                        self._push_batch([op])
+                    except Exception as exc:
+                        failed(op, exc)
+                        continue
+                    succeeded()
+                    self.local.complete_pending_ops(op.op_ids, [op.row_local_id])
+                continue
+            succeeded()
+            self.local.complete_pending_ops(
+                [op_id for op in batch for op_id in op.op_ids],
+                [op.row_local_id for op in batch],
+            )
+        succeeded()
+
+    def _push_batch(self, batch: Sequence[PendingOp]) -> None:
+        if batch[0].op_type == "upsert":
+            self.remote.upsert_tasks([Task(**op.payload) for op in batch])
+        else:
+            self.remote.delete_tasks([op.payload["id"] for op in batch])
+
+    def _record_failure(self, op: PendingOp, exc: Exception, now: datetime, *, count: bool = True) -> None:
+        """Reschedule ``op`` after a failed push.
+
+        Only rejections of the op itself count towards ``MAX_PUSH_ATTEMPTS``;
+        transport errors and outages keep the attempt count and the op is
+        retried on the next run.
+        """
+        if not count or isinstance(exc, TRANSPORT_ERRORS):
+            self.local.fail_pending_ops(op.op_ids, str(exc), op.attempts, None)
+            return
+        attempts = op.attempts + 1
+        if attempts >= MAX_PUSH_ATTEMPTS:
+            self.local.dead_letter_pending_ops(op.op_ids, str(exc), attempts)
+            return
+        delay = min(RETRY_CAP, RETRY_BASE * 2 ** (attempts - 1))
+        self.local.fail_pending_ops(op.op_ids, str(exc), attempts, (now + delay).isoformat())
+
+    def list_dead_letters(self) -> List[dict]:
+        return self.local.list_dead_letters()
+
+    def replay_dead_letters(self, ids: Optional[Sequence[int]] = None) -> int:
+        return self.local.replay_dead_letters(ids)
+
+    def pull_changes(
+        self,
+        owner_user_id: Optional[str] = None,
+        *,
+        page_size: int = PULL_PAGE_SIZE,
+        full: Optional[bool] = None,
+    ) -> int:
+        """Pull remote task changes into the local cache; return rows applied.
+
+        Only rows updated after the ``sync_state`` cursor are requested, page
+        by page; each page and the advanced cursor commit together. Every
+        ``FULL_SYNC_INTERVAL`` (or when ``full`` is set) the whole table is
+        re-read instead and clean local rows the remote no longer has are
+        dropped.
+        """
+        if self.remote is None:
+            return 0
+        cursor, last_full = self.local.get_sync_state(owner_user_id, PULL_PROVIDER)
+        now = datetime.utcnow()
+        if full is None:
+            full = last_full is None or datetime.fromisoformat(last_full) <= now - FULL_SYNC_INTERVAL
+        since = None if full else cursor
+        seen: List[int] = []
+        applied = 0
+        while True:
+            rows = self.remote.fetch_task_changes(since, page_size, owner_user_id)
+            if not rows:
+                break
+            since = rows[-1]["updated_at"]
+            cursor = max(cursor or since, since)
+            self.local.apply_pulled_tasks(rows, owner_user_id, PULL_PROVIDER, cursor)
+            applied += len(rows)
+            if full:
+                seen.extend(row["id"] for row in rows if not row.get("deleted_at"))
+            if len(rows) < page_size:
                 break
+        if full:
+            self.local.finish_full_sync(seen, owner_user_id, PULL_PROVIDER, now.isoformat())
+        return applied
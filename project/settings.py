@@ -51,6 +51,9 @@ class Settings(BaseSettings):
     sqlite_path: str = Field(
         default_factory=lambda: str(Settings._default_appdata() / "ai_study_buddy.db")
     )
+    # Connection pool for the UI thread plus background workers/sync
+    sqlite_pool_size: int = 5
+    sqlite_max_overflow: int = 5
 
     # Providers (kept optional; presence flips from sample→live mode)
     supabase_url: Optional[str] = None
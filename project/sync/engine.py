@@ -1,6 +1,7 @@
 """Background syncing engine."""
 from __future__ import annotations
 
+import random
 import threading
 import time
 from typing import Optional
@@ -10,40 +11,139 @@ from PyQt6.QtCore import QObject, pyqtSignal
 from project.repo.syncing import SyncingRepo
 
 
+def backoff_delay(
+    failures: int,
+    base: float,
+    cap: float,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """Return the retry delay after ``failures`` consecutive failures.
+
+    The delay doubles per failure up to ``cap``; the upper half is jittered
+    so clients that went offline together do not retry in lockstep.
+    """
+    if failures <= 0:
+        return 0.0
+    delay = min(cap, base * 2 ** (failures - 1))
+    return delay / 2 + (rng or random).uniform(0, delay / 2)
+
+
 class SyncEngine(QObject):
-    """Runs pull/push sync in a background thread."""
+    """Runs pull/push sync in a background thread.
+
+    The thread sleeps until something needs doing: a local write queued a
+    pending op (pushed ``debounce`` seconds after the first one, so a burst
+    of edits goes out together), the pull deadline (every ``interval``
+    seconds) arrives, or a retry after a failure is due. Failures back off
+    exponentially with jitter; while the queue is empty no push is attempted.
+    """
 
     sync_started = pyqtSignal()
     sync_finished = pyqtSignal()
     sync_error = pyqtSignal(str)
+    queue_depth_changed = pyqtSignal(int)
+    last_success_changed = pyqtSignal(float)  # wall-clock epoch seconds
+    next_wake_changed = pyqtSignal(float)  # wall-clock epoch seconds
 
-    def __init__(self, repo: SyncingRepo, interval: float = 30.0):
+    def __init__(
+        self,
+        repo: SyncingRepo,
+        interval: float = 30.0,
+        *,
+        debounce: float = 2.0,
+        backoff_base: float = 5.0,
+        backoff_cap: float = 300.0,
+        rng: Optional[random.Random] = None,
+    ):
         super().__init__()
         self.repo = repo
         self.interval = interval
+        self.debounce = debounce
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rng = rng or random.Random()
         self._thread: Optional[threading.Thread] = None
         self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._changed_at: Optional[float] = None
+        self._failures = 0
+        self._retry_at: Optional[float] = None
+        self._next_pull = 0.0
+        self.last_success: Optional[float] = None
 
     def start(self) -> None:
         if self._thread is not None:
             return
+        self._stop.clear()
+        self._next_pull = time.monotonic()
+        self.repo.local.add_pending_listener(self.notify_change)
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
         if self._thread is None:
             return
+        self.repo.local.remove_pending_listener(self.notify_change)
         self._stop.set()
+        self._wake.set()
         self._thread.join()
         self._thread = None
 
+    def notify_change(self) -> None:
+        """Wake the scheduler because a local write queued a pending op."""
+        with self._lock:
+            if self._changed_at is None:
+                self._changed_at = time.monotonic()
+        self._wake.set()
+
     # ------------------------------------------------------------------
+    def next_deadline(self, pending: int) -> float:
+        """Return the monotonic time of the next sync attempt."""
+        with self._lock:
+            if self._retry_at is not None:
+                return self._retry_at
+            deadline = self._next_pull
+            if pending and self._changed_at is not None:
+                deadline = min(deadline, self._changed_at + self.debounce)
+            return deadline
+
     def _run(self) -> None:
         while not self._stop.is_set():
-            try:
-                self.sync_started.emit()
+            pending = self.repo.local.pending_count()
+            self.queue_depth_changed.emit(pending)
+            deadline = self.next_deadline(pending)
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self.next_wake_changed.emit(time.time() + delay)
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue  # re-evaluate: woken early by a change or stop()
+            self._sync(pending)
+
+    def _sync(self, pending: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._changed_at = None
+            pull = now >= self._next_pull
+            if pull:
+                self._next_pull = now + self.interval
+        try:
+            self.sync_started.emit()
+            if pending:
                 self.repo.push_pending()
-                self.sync_finished.emit()
-            except Exception as exc:  # pragma: no cover - background
-                self.sync_error.emit(str(exc))
-            self._stop.wait(self.interval)
+            if pull:
+                self.repo.pull_changes()
+            self.sync_finished.emit()
+        except Exception as exc:
+            with self._lock:
+                self._failures += 1
+                delay = backoff_delay(self._failures, self.backoff_base, self.backoff_cap, self._rng)
+                self._retry_at = time.monotonic() + delay
+            self.sync_error.emit(str(exc))
+            return
+        with self._lock:
+            self._failures = 0
+            self._retry_at = None
+        self.last_success = time.time()
+        self.last_success_changed.emit(self.last_success)
@@ -0,0 +1,86 @@
+"""Compare pairwise, sweep-line and incremental conflict detection.
+
+Simulates busy shared calendars: each day holds hundreds of imported events
+of 15 minutes to 2 hours spread over the day. Also times a single drag (one item moved) applied
+through ``ConflictIndex.move`` against recomputing the whole day.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_conflicts.py [events_per_day]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from ui.calendar.conflicts import ConflictIndex, TimeRange, find_conflicts
+
+DAYS = 7
+
+
+def _pairwise(ranges: list[TimeRange]) -> list[tuple[int, int]]:
+    return [
+        (i, j)
+        for i in range(len(ranges))
+        for j in range(i + 1, len(ranges))
+        if ranges[i].overlaps(ranges[j])
+    ]
+
+
+def _day(rng: random.Random, day: datetime, n: int) -> list[TimeRange]:
+    out = []
+    for _ in range(n):
+        start = day + timedelta(minutes=5 * rng.randrange(12 * 24))
+        out.append(TimeRange(start, start + timedelta(minutes=15 * rng.randint(1, 8))))
+    return out
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(per_day: int = 400) -> None:
+    rng = random.Random(42)
+    base = datetime(2025, 3, 3)
+    week = [_day(rng, base + timedelta(days=d), per_day) for d in range(DAYS)]
+    assert all(find_conflicts(day) == _pairwise(day) for day in week)
+
+    pairwise = _best(lambda: [_pairwise(day) for day in week])
+    sweep = _best(lambda: [find_conflicts(day) for day in week])
+    pairs = sum(len(find_conflicts(day)) for day in week)
+    print(f"events/day={per_day} days={DAYS} conflicts={pairs}")
+    print(f"week refresh   pairwise {pairwise * 1000:8.1f}ms  sweep {sweep * 1000:8.1f}ms  "
+          f"({pairwise / sweep:.1f}x)")
+
+    day = week[0]
+    index = ConflictIndex(enumerate(day))
+    moves = [(rng.randrange(per_day), rng.randint(-8, 8)) for _ in range(200)]
+
+    def incremental() -> None:
+        for key, delta in moves:
+            rng_ = day[key]
+            shift = timedelta(minutes=15 * delta)
+            index.move(key, TimeRange(rng_.start + shift, rng_.end + shift))
+
+    def recompute() -> None:
+        ranges = list(day)
+        for key, delta in moves:
+            shift = timedelta(minutes=15 * delta)
+            ranges[key] = TimeRange(day[key].start + shift, day[key].end + shift)
+            find_conflicts(ranges)
+
+    inc = _best(incremental, repeat=1) / len(moves)
+    full = _best(recompute, repeat=1) / len(moves)
+    print(f"single drag    recompute {full * 1e6:8.1f}us  incremental {inc * 1e6:8.1f}us  "
+          f"({full / inc:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
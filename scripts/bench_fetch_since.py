@@ -0,0 +1,88 @@
+"""Time an initial ``fetch_since`` import of staged calendar events.
+
+Runs the Alembic migrations into a temporary database, stages ``rows`` events
+and imports them, reporting wall time. A second import into a fresh database
+runs under tracemalloc to report the peak Python heap.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_fetch_since.py [rows]
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
+from integrations.google_calendar import GoogleCalendarClient
+from project.db import get_engine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _migrate(db_path: Path) -> None:
+    cfg = Config(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "migrations"))
+    cfg.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    command.upgrade(cfg, "head")
+    logging.disable(logging.WARNING)
+
+
+def _stage(engine, rows: int) -> None:
+    params = [
+        {
+            "sid": f"ev-{i}",
+            "title": f"Shared event {i}",
+            "start": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T{8 + i % 10:02d}:00:00",
+            "end": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T{9 + i % 10:02d}:00:00",
+            "upd": f"2025-01-01T00:{i // 6000 % 60:02d}:{i // 100 % 60:02d}.{i % 100:06d}",
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO staging_events (source, source_id, title, start_time, end_time, type, description, updated_at) "
+                "VALUES ('google', :sid, :title, :start, :end, 'meeting', '', :upd)"
+            ),
+            params,
+        )
+
+
+def _import(rows: int, trace: bool) -> tuple[float, int, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        _migrate(db_path)
+        engine = get_engine(str(db_path))
+        _stage(engine, rows)
+        client = GoogleCalendarClient(engine)
+        if trace:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        client.fetch_since("google")
+        elapsed = time.perf_counter() - t0
+        peak = 0
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        with engine.connect() as conn:
+            merged = conn.execute(text("SELECT COUNT(*) FROM events")).scalar_one()
+        engine.dispose()
+    return elapsed, merged, peak
+
+
+def main(rows: int = 50_000) -> None:
+    elapsed, merged, _ = _import(rows, trace=False)
+    _, _, peak = _import(rows, trace=True)
+    print(f"rows={rows} merged={merged} time={elapsed:.2f}s peak_heap={peak / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
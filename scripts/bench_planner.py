@@ -0,0 +1,138 @@
+"""Time ``planner_engine.schedule`` over a long horizon.
+
+Builds a 90-day horizon with thousands of calendar events and tasks and
+compares the ``FreeList``-backed scheduler with the previous list-based one,
+which rescanned every busy interval per study window and every earlier
+(already full) day per task. The NumPy grid backend is timed too when numpy
+is installed; try ``120`` days for a semester.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_planner.py [events] [tasks] [days]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, time as dtime, timedelta
+
+from agents import planner_engine
+from project.prefs import UserPrefs
+
+
+def _legacy(tasks, busy, windows, prefs) -> int:
+    """Previous algorithm: nested-loop subtraction, then first fit from slot 0."""
+    free_slots = []
+    busy_sorted = sorted(busy)
+    for start, end in windows:
+        cur = start
+        for bstart, bend in busy_sorted:
+            if bend <= cur or bstart >= end:
+                continue
+            if bstart > cur:
+                free_slots.append((cur, min(bstart, end)))
+            cur = max(cur, bend)
+            if cur >= end:
+                break
+        if cur < end:
+            free_slots.append((cur, end))
+    free_slots.sort()
+
+    booked = 0
+    per_day = defaultdict(int)
+    for task in tasks:
+        remaining = task["estimated_duration"]
+        due = task["due_date"]
+        i = 0
+        while remaining > 0 and i < len(free_slots):
+            slot_start, slot_end = free_slots[i]
+            day = slot_start.date()
+            if slot_start >= due:
+                break
+            if per_day[day] >= prefs.max_sessions_per_day:
+                i += 1
+                continue
+            allowed_end = min(slot_end, due)
+            available = (allowed_end - slot_start).total_seconds() / 60
+            if available <= 0:
+                i += 1
+                continue
+            chunk = min(prefs.default_session_minutes, remaining, available)
+            end = slot_start + timedelta(minutes=chunk)
+            remaining -= chunk
+            per_day[day] += 1
+            booked += 1
+            if end < allowed_end and per_day[day] < prefs.max_sessions_per_day:
+                free_slots[i] = (end, slot_end)
+            else:
+                free_slots.pop(i)
+    return booked
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n_events: int = 5000, n_tasks: int = 2000, days: int = 90) -> None:
+    rng = random.Random(7)
+    base = datetime(2025, 1, 6, 8, 0)
+    prefs = UserPrefs(
+        day_start=dtime(8, 0), day_end=dtime(22, 0),
+        default_session_minutes=45, max_sessions_per_day=12,
+    )
+    events = []
+    for _ in range(n_events):
+        start = base + timedelta(days=rng.randrange(days), minutes=15 * rng.randrange(96) - 480)
+        events.append({"start_time": start, "end_time": start + timedelta(minutes=15 * rng.randint(1, 4))})
+    tasks = [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "estimated_duration": 30 * rng.randint(1, 6),
+            "due_date": base + timedelta(days=rng.randrange(min(7, days - 1), days), hours=12),
+            "priority": rng.randint(1, 5),
+            "state": "pending",
+        }
+        for i in range(n_tasks)
+    ]
+
+    sessions = planner_engine.schedule(tasks, events, [], prefs, start=base, horizon_days=days)
+    new = _best(lambda: planner_engine.schedule(tasks, events, [], prefs, start=base, horizon_days=days))
+
+    windows = [
+        (datetime.combine(base.date() + timedelta(days=d), prefs.day_start),
+         datetime.combine(base.date() + timedelta(days=d), prefs.day_end))
+        for d in range(days)
+    ]
+    busy = [(e["start_time"], e["end_time"]) for e in events]
+    ordered = sorted(tasks, key=lambda t: (t["due_date"], t["priority"], -t["estimated_duration"]))
+    booked = _legacy(ordered, busy, windows, prefs)
+    old = _best(lambda: _legacy(ordered, busy, windows, prefs))
+
+    print(f"days={days} events={n_events} tasks={n_tasks}")
+    print(f"legacy   {old * 1000:8.1f}ms  sessions={booked}")
+    print(f"freelist {new * 1000:8.1f}ms  sessions={len(sessions)}  ({old / new:.1f}x)")
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("grid     skipped (numpy not installed)")
+        return
+    grid_sessions = planner_engine.schedule(
+        tasks, events, [], prefs, start=base, horizon_days=days, backend="grid"
+    )
+    grid = _best(lambda: planner_engine.schedule(
+        tasks, events, [], prefs, start=base, horizon_days=days, backend="grid"
+    ))
+    print(f"grid     {grid * 1000:8.1f}ms  sessions={len(grid_sessions)}  ({old / grid:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,89 @@
+"""Show how ``planner.schedule_tasks`` scales with the number of tasks.
+
+Each run places ``n`` tasks around ``n`` calendar events spread over the
+horizon. The previous implementation (rescan every busy interval per task,
+re-sort after every placement) is timed alongside for the smaller sizes.
+``us/(n log n)`` staying flat is the linearithmic scaling.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_schedule_tasks.py [max_tasks]
+"""
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+from agents.planner import schedule_tasks
+
+WORK_START, WORK_END = dtime(8, 0), dtime(20, 0)
+LEGACY_LIMIT = 4000
+
+
+def _legacy(tasks, busy, day: date) -> None:
+    """Previous algorithm: first gap on one day, else pile after the last busy block."""
+    busy = sorted(busy)
+    for task in tasks:
+        duration = task["estimated_duration"]
+        pointer = datetime.combine(day, WORK_START)
+        slot = None
+        for bstart, bend in busy:
+            if bend <= pointer:
+                continue
+            if bstart > pointer and (bstart - pointer).total_seconds() / 60 >= duration:
+                slot = (pointer, pointer + timedelta(minutes=duration))
+                break
+            pointer = max(pointer, bend)
+        if slot is None:
+            if (datetime.combine(day, WORK_END) - pointer).total_seconds() / 60 >= duration:
+                slot = (pointer, pointer + timedelta(minutes=duration))
+            else:
+                start = busy[-1][1] + timedelta(minutes=5)
+                slot = (start, start + timedelta(minutes=duration))
+        busy.append(slot)
+        busy.sort()
+
+
+def _case(rng: random.Random, n: int, day: date, days: int):
+    events = []
+    for _ in range(n):
+        start = datetime.combine(day, WORK_START) + timedelta(
+            days=rng.randrange(days), minutes=15 * rng.randrange(48)
+        )
+        events.append({"start_time": start, "end_time": start + timedelta(minutes=15 * rng.randint(1, 4))})
+    tasks = [
+        {"id": i, "title": f"Task {i}", "estimated_duration": 15 * rng.randint(1, 8),
+         "due_date": datetime.combine(day, WORK_END) + timedelta(days=rng.randrange(days))}
+        for i in range(n)
+    ]
+    return tasks, events
+
+
+def main(max_tasks: int = 16000) -> None:
+    rng = random.Random(11)
+    day = date(2025, 3, 3)
+    print(f"{'tasks':>7} {'ms':>9} {'us/(n log n)':>13} {'legacy ms':>10}")
+    n = 500
+    while n <= max_tasks:
+        days = max(7, n // 20)
+        tasks, events = _case(rng, n, day, days)
+        t0 = time.perf_counter()
+        schedule_tasks(tasks, events, work_start=WORK_START, work_end=WORK_END,
+                       start_day=day, horizon_days=days)
+        new = time.perf_counter() - t0
+        legacy = ""
+        if n <= LEGACY_LIMIT:
+            busy = [(e["start_time"], e["end_time"]) for e in events]
+            ordered = sorted(tasks, key=lambda t: (t["due_date"], t["title"]))
+            t0 = time.perf_counter()
+            _legacy(ordered, busy, day)
+            legacy = f"{(time.perf_counter() - t0) * 1000:10.1f}"
+        print(f"{n:7d} {new * 1000:9.1f} {new * 1e6 / (n * math.log2(n)):13.3f} {legacy:>10}")
+        n *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16000)
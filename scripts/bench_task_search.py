@@ -0,0 +1,78 @@
+"""Compare LIKE and FTS5 task search on a large local cache.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_task_search.py [rows]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from project.db import get_engine, ensure_db
+from project.repo.query_builders import build_tasks_query
+
+WORDS = [
+    "read", "chapter", "essay", "lab", "report", "problem", "set", "quiz",
+    "review", "notes", "project", "draft", "outline", "exam", "practice",
+    "lecture", "summary", "presentation", "research", "reading",
+]
+TYPES = ["homework", "study", "test", "project", "class"]
+SEARCHES = ["rep", "essay draft", "quiz", "math", "presentation research"]
+
+
+def _populate(engine, rows: int) -> None:
+    rnd = random.Random(42)
+    params = [
+        {
+            "title": " ".join(rnd.choice(WORDS) for _ in range(4)) + f" {i}",
+            "type": rnd.choice(TYPES),
+            "course": f"{rnd.choice(['MATH', 'BIO', 'ENG', 'CHEM', 'HIST'])}{rnd.randint(100, 400)}",
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO tasks (title, type, estimated_duration, course_label) "
+                "VALUES (:title, :type, 30, :course)"
+            ),
+            params,
+        )
+
+
+def _time(engine, search: str, use_fts: bool, repeat: int = 5) -> tuple[float, int]:
+    sql, params = build_tasks_query("All", search, include_sync_columns=True, use_fts=use_fts)
+    best = float("inf")
+    count = 0
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            count = len(conn.execute(text(sql), params).fetchall())
+            best = min(best, time.perf_counter() - t0)
+    return best, count
+
+
+def main(rows: int = 100_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = get_engine(str(Path(tmp) / "bench.db"))
+        ensure_db(engine)
+        _populate(engine, rows)
+        print(f"rows={rows}")
+        for search in SEARCHES:
+            like_s, like_n = _time(engine, search, use_fts=False)
+            fts_s, fts_n = _time(engine, search, use_fts=True)
+            print(
+                f"{search!r:26} LIKE {like_s * 1000:8.1f}ms ({like_n:6} rows)  "
+                f"FTS5 {fts_s * 1000:8.1f}ms ({fts_n:6} rows)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
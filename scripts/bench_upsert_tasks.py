@@ -0,0 +1,65 @@
+"""Compare per-row ``upsert_task`` with bulk ``upsert_tasks``.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_upsert_tasks.py [rows]
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import LocalCacheRepo
+
+
+def _tasks(n: int, prefix: str) -> list[Task]:
+    return [
+        Task(
+            id=None,
+            owner_user_id="bench",
+            source="import",
+            source_id=f"{prefix}-{i}",
+            title=f"Task {i}",
+            type="homework",
+            estimated_duration=30 + i % 90,
+            due_date=f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T23:59:00",
+            course_label=f"COURSE{i % 7}",
+        )
+        for i in range(n)
+    ]
+
+
+def main(rows: int = 10_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = get_engine(str(Path(tmp) / "bench.db"))
+        ensure_db(engine)
+        repo = LocalCacheRepo(engine)
+
+        loop_tasks = _tasks(rows, "loop")
+        t0 = time.perf_counter()
+        for task in loop_tasks:
+            repo.upsert_task(task, dirty=True)
+        loop_s = time.perf_counter() - t0
+
+        bulk_tasks = _tasks(rows, "bulk")
+        t0 = time.perf_counter()
+        repo.upsert_tasks(bulk_tasks, dirty=True)
+        bulk_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        repo.queue_pending_many("tasks", "upsert", [(t.id, t.__dict__) for t in bulk_tasks])
+        queue_s = time.perf_counter() - t0
+        engine.dispose()
+
+    print(f"rows={rows}")
+    print(f"upsert_task loop : {loop_s:8.3f}s")
+    print(f"upsert_tasks bulk: {bulk_s:8.3f}s  ({loop_s / bulk_s:.1f}x faster)")
+    print(f"queue_pending_many: {queue_s:7.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -13,7 +13,11 @@ def main():
     settings = load_settings()
     logger = configure_logging(settings.app_log_level)
     init_worker_pool(logger)
-    engine = get_engine(settings.sqlite_path)
+    engine = get_engine(
+        settings.sqlite_path,
+        pool_size=settings.sqlite_pool_size,
+        max_overflow=settings.sqlite_max_overflow,
+    )
     ensure_db(engine)
     install_global_exception_hook(logger)
     app = QApplication(sys.argv)
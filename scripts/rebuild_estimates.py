@@ -0,0 +1,21 @@
+"""Recompute the materialized session estimates from ``session_log``.
+
+``record_session`` keeps ``estimates`` current; run this after editing or
+importing the log by hand, or after changing ``metrics.ALPHA``.
+
+Usage::
+
+    PYTHONPATH=. python scripts/rebuild_estimates.py
+"""
+from __future__ import annotations
+
+from project import metrics
+
+
+def main() -> None:
+    keys = metrics.rebuild_estimates()
+    print(f"rebuilt {keys} estimate(s)")
+
+
+if __name__ == "__main__":
+    main()
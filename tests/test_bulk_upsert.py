@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import LocalCacheRepo
+
+
+def _repo(tmp_path) -> LocalCacheRepo:
+    engine = get_engine(str(tmp_path / "bulk.db"))
+    ensure_db(engine)
+    return LocalCacheRepo(engine)
+
+
+def _task(i: int, **kw) -> Task:
+    return Task(
+        id=None,
+        owner_user_id="u1",
+        source="import",
+        source_id=f"s{i}",
+        title=f"Task {i}",
+        type="study",
+        estimated_duration=30,
+        **kw,
+    )
+
+
+def test_upsert_tasks_assigns_ids_and_updates(tmp_path):
+    repo = _repo(tmp_path)
+    tasks = repo.upsert_tasks([_task(i) for i in range(5)], dirty=True)
+    ids = [t.id for t in tasks]
+    assert all(isinstance(i, int) for i in ids)
+    assert len(set(ids)) == 5
+    assert all(t.dirty == 1 and t.version for t in tasks)
+
+    tasks[2].title = "Renamed"
+    repo.upsert_tasks([tasks[2], _task(99)])
+    listed = {t.id: t for t in repo.list_tasks()}
+    assert len(listed) == 6
+    assert listed[ids[2]].title == "Renamed"
+    assert listed[ids[2]].dirty == 0
+
+
+def test_upsert_tasks_ids_follow_their_own_rows(tmp_path):
+    repo = _repo(tmp_path)
+    first, second = _task(1), _task(2)
+    for task in (first, second):
+        task.owner_user_id = None
+        task.source_id = "same"
+    second.title = "Second"
+    repo.upsert_tasks([first, second])
+    assert first.id != second.id
+    assert repo.get_task(second.id).title == "Second"
+
+
+def test_upsert_tasks_maps_ids_across_insert_chunks(tmp_path):
+    repo = _repo(tmp_path)
+    existing = repo.upsert_tasks([_task(0)])[0]
+    existing.title = "Kept"
+    batch = [_task(i) for i in range(1, 151)]
+    batch.insert(70, existing)
+    repo.upsert_tasks(batch)
+    assert existing.id == batch[70].id
+    for task in batch:
+        stored = repo.get_task(task.id)
+        assert (stored.source_id, stored.title) == (task.source_id, task.title)
+
+
+def test_queue_pending_matches_owner(tmp_path):
+    repo = _repo(tmp_path)
+    mine, theirs = _task(1), _task(1)
+    theirs.owner_user_id = "u2"
+    repo.upsert_tasks([mine, theirs])
+    repo.queue_pending("tasks", "upsert", None, theirs.__dict__)
+    (op,) = repo.get_pending_ops()
+    assert int(op["row_local_id"]) == theirs.id
+
+
+def test_queue_pending_many_resolves_missing_ids(tmp_path):
+    repo = _repo(tmp_path)
+    tasks = repo.upsert_tasks([_task(1), _task(2)], dirty=True)
+    repo.queue_pending_many(
+        "tasks",
+        "upsert",
+        [(None, tasks[0].__dict__), (tasks[1].id, tasks[1].__dict__)],
+    )
+    ops = repo.get_pending_ops()
+    assert [int(op["row_local_id"]) for op in ops] == [tasks[0].id, tasks[1].id]
+    assert json.loads(ops[0]["payload"])["source_id"] == "s1"
+
+
+def test_queue_pending_many_requires_identifiers(tmp_path):
+    repo = _repo(tmp_path)
+    with pytest.raises(ValueError):
+        repo.queue_pending_many("tasks", "upsert", [(None, {"foo": "bar"})])
+    assert repo.get_pending_ops() == []
@@ -1,6 +1,9 @@
 from __future__ import annotations
+import time
+from dataclasses import replace
 from datetime import datetime, date, timezone, timedelta
 from sqlalchemy import text
+import pytest
 
 from project.db import get_engine, ensure_db
 from ui.calendar.calendar_model import CalendarModel
@@ -49,3 +52,110 @@ def test_calendar_model_groups_and_normalizes(tmp_path):
     narrow = model.fetch_range(date(2024, 1, 1), date(2024, 1, 1))
     assert local_day_event in narrow
     assert task_start.date() not in narrow
+
+
+def _seed(engine, day: date, n_events: int, n_tasks: int) -> None:
+    with engine.begin() as conn:
+        for i in range(n_events):
+            start = datetime.combine(day, datetime.min.time()) + timedelta(hours=8 + i)
+            conn.execute(
+                text(
+                    "INSERT INTO events (source, source_id, title, start_time, end_time, type) "
+                    "VALUES ('app', :sid, 'e', :s, :e, 'meeting')"
+                ),
+                {"sid": f"{day}-{i}", "s": start.isoformat(), "e": (start + timedelta(minutes=30)).isoformat()},
+            )
+        for i in range(n_tasks):
+            start = datetime.combine(day, datetime.min.time()) + timedelta(hours=14 + i)
+            conn.execute(
+                text(
+                    "INSERT INTO tasks (title, type, start_time, end_time) "
+                    "VALUES ('t', 'study', :s, :e)"
+                ),
+                {"s": start.isoformat(), "e": (start + timedelta(hours=1)).isoformat()},
+            )
+
+
+def test_count_by_day_matches_fetch_range(tmp_path):
+    engine = get_engine(str(tmp_path / "counts.db"))
+    ensure_db(engine)
+    _seed(engine, date(2024, 5, 2), 3, 2)
+    _seed(engine, date(2024, 5, 31), 1, 0)
+    _seed(engine, date(2024, 6, 1), 2, 1)
+    model = CalendarModel(engine)
+    items = model.fetch_range(date(2024, 5, 1), date(2024, 5, 31))
+    assert model.count_by_day(date(2024, 5, 1), date(2024, 5, 31)) == {
+        d: len(v) for d, v in items.items()
+    }
+    assert model.count_by_day(date(2024, 5, 1), date(2024, 5, 31)) == {
+        date(2024, 5, 2): 5,
+        date(2024, 5, 31): 1,
+    }
+
+
+def test_month_counts_are_cached_and_patched_by_writes(tmp_path, monkeypatch):
+    engine = get_engine(str(tmp_path / "cache.db"))
+    ensure_db(engine)
+    _seed(engine, date(2024, 5, 2), 2, 1)
+    model = CalendarModel(engine)
+    assert model.month_counts(2024, 5) == {date(2024, 5, 2): 3}
+
+    queries = []
+    real = model.count_by_day
+    monkeypatch.setattr(model, "count_by_day", lambda s, e: queries.append((s, e)) or real(s, e))
+
+    item = next(i for i in model.fetch_range(date(2024, 5, 2), date(2024, 5, 2))[date(2024, 5, 2)])
+    assert model.update_item_time(item, item.start + timedelta(days=1), item.end + timedelta(days=1))
+    assert model.month_counts(2024, 5) == {date(2024, 5, 2): 2, date(2024, 5, 3): 1}
+    model.delete_item(replace(item, start=item.start + timedelta(days=1)))
+    model.note_added(date(2024, 5, 9))
+    assert model.month_counts(2024, 5) == {date(2024, 5, 2): 2, date(2024, 5, 9): 1}
+    assert queries == []
+
+    model.invalidate_counts(date(2024, 5, 9))
+    assert model.month_counts(2024, 5) == {date(2024, 5, 2): 2}
+    assert len(queries) == 1
+
+
+@pytest.fixture
+def london_tz(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset unavailable")
+    monkeypatch.setenv("TZ", "Europe/London")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_items_use_the_offset_in_force_at_each_instant(tmp_path, london_tz):
+    engine = get_engine(str(tmp_path / "cal.db"))
+    ensure_db(engine)
+    rows = [
+        ("e1", datetime(2026, 1, 5, 9, 0)),     # GMT
+        ("e2", datetime(2026, 1, 5, 23, 30)),   # GMT, late evening
+        ("e3", datetime(2026, 7, 6, 23, 30)),   # BST, late evening
+    ]
+    with engine.begin() as conn:
+        for source_id, start in rows:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO events (source, source_id, title, start_time, end_time, type, description)
+                    VALUES ('local',:sid,'Lecture',:s,:e,'class','')
+                    """
+                ),
+                {"sid": source_id, "s": start.isoformat(),
+                 "e": (start + timedelta(minutes=20)).isoformat()},
+            )
+    model = CalendarModel(engine)
+
+    january = model.fetch_range(date(2026, 1, 1), date(2026, 1, 31))
+    assert [i.start.replace(tzinfo=None) for i in january[date(2026, 1, 5)]] == [
+        rows[0][1], rows[1][1]
+    ]
+    july = model.fetch_range(date(2026, 7, 1), date(2026, 7, 31))
+    assert [i.start.replace(tzinfo=None) for i in july[date(2026, 7, 6)]] == [rows[2][1]]
+
+    assert model.count_by_day(date(2026, 1, 1), date(2026, 1, 31)) == {date(2026, 1, 5): 2}
+    assert model.count_by_day(date(2026, 7, 1), date(2026, 7, 31)) == {date(2026, 7, 6): 1}
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from project import changes
+from project.changes import ChangeEvent, change_bus
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import LocalCacheRepo
+from project.repo.syncing import SyncingRepo
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = get_engine(str(tmp_path / "db.sqlite"))
+    ensure_db(engine)
+    return engine
+
+
+@pytest.fixture
+def seen(engine):
+    events = []
+    bus = change_bus(engine)
+    bus.subscribe(events.append)
+    yield events
+    bus.unsubscribe(events.append)
+
+
+def _task(n: int) -> Task:
+    return Task(id=None, owner_user_id=None, source="app", source_id=f"t{n}",
+                title=f"Task {n}", type="study", estimated_duration=30)
+
+
+def test_committed_writes_are_published_per_row(engine, seen):
+    repo = LocalCacheRepo(engine)
+    first = repo.upsert_task(_task(1))
+    assert seen == [ChangeEvent("tasks", first.id, "insert")]
+
+    seen.clear()
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET title='x' WHERE id=:id"), {"id": first.id})
+        conn.execute(text("UPDATE tasks SET title='y' WHERE id=:id"), {"id": first.id})
+        conn.execute(
+            text("INSERT INTO events (source, source_id, title, start_time, end_time, type)"
+                 " VALUES ('app', 'e1', 'Lecture', '2024-01-01T09:00', '2024-01-01T10:00', 'class')")
+        )
+        event_id = conn.execute(text("SELECT id FROM events")).scalar_one()
+        conn.execute(text("DELETE FROM events WHERE id=:id"), {"id": event_id})
+    # two updates coalesce; an insert deleted in the same transaction never existed
+    assert seen == [ChangeEvent("tasks", first.id, "update")]
+
+    seen.clear()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM tasks WHERE id=:id"), {"id": first.id})
+    assert seen == [ChangeEvent("tasks", first.id, "delete")]
+
+
+def test_rolled_back_writes_are_not_published(engine, seen):
+    with pytest.raises(RuntimeError):
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO tasks (source, source_id, title, type, estimated_duration)"
+                     " VALUES ('app', 'r', 'Rolled back', 'study', 30)")
+            )
+            raise RuntimeError("abort")
+    assert seen == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM temp.change_log")).scalar_one() == 0
+
+
+def test_bulk_writes_collapse_to_a_reset(engine, seen, monkeypatch):
+    monkeypatch.setattr(changes, "MAX_ROW_EVENTS", 5)
+    LocalCacheRepo(engine).upsert_tasks([_task(n) for n in range(6)])
+    assert seen == [ChangeEvent("tasks", None, "reset")]
+
+
+def test_task_list_model_patches_changed_rows(engine):
+    from ui.pages.tasks import TaskListModel
+
+    repo = SyncingRepo(LocalCacheRepo(engine))
+    saved = repo.upsert_tasks([_task(n) for n in range(3)])
+    model = TaskListModel(repo, page_size=10)
+    model.set_query("All", "")
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET title='Renamed' WHERE id=:id"), {"id": saved[1].id})
+    model.apply_change(ChangeEvent("tasks", saved[1].id, "update"))
+    assert model.task_at(1).title == "Renamed"
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM tasks WHERE id=:id"), {"id": saved[0].id})
+    model.apply_change(ChangeEvent("tasks", saved[0].id, "delete"))
+    assert [model.task_at(r).id for r in range(model.rowCount())] == [saved[1].id, saved[2].id]
+    assert not resets
+
+    added = repo.upsert_task(_task(9))
+    model.apply_change(ChangeEvent("tasks", added.id, "insert"))
+    assert model.rowCount() == 3 and model.task_at(2).id == added.id
+    assert not resets
+
+
+def _ids(model):
+    return [model.task_at(r).id for r in range(model.rowCount())]
+
+
+def test_task_list_model_moves_and_filters_changed_rows(engine):
+    from ui.pages.tasks import TaskListModel
+
+    repo = SyncingRepo(LocalCacheRepo(engine))
+    saved = repo.upsert_tasks([_task(n) for n in range(6)])
+    for priority, task in enumerate(saved):
+        task.priority = priority
+    repo.upsert_tasks(saved)
+    model = TaskListModel(repo, page_size=3)
+    model.set_query("By Priority", "")
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    assert _ids(model) == [t.id for t in saved[:3]]
+
+    def update(task_id, sql):
+        with engine.begin() as conn:
+            conn.execute(text(f"UPDATE tasks SET {sql} WHERE id=:id"), {"id": task_id})
+        model.apply_change(ChangeEvent("tasks", task_id, "update"))
+
+    # a priority change moves the row to its new place
+    update(saved[0].id, "priority=2, title='Bumped'")
+    assert _ids(model) == [saved[1].id, saved[0].id, saved[2].id]
+    assert model.task_at(1).title == "Bumped"
+    # sorting past the loaded pages drops it until fetchMore reaches it
+    update(saved[1].id, "priority=9")
+    assert _ids(model) == [saved[0].id, saved[2].id]
+    # a row from a later page that now sorts first is pulled in
+    update(saved[5].id, "priority=0")
+    assert _ids(model) == [saved[5].id, saved[0].id, saved[2].id]
+    model.fetchMore()
+    assert _ids(model) == [saved[5].id, saved[0].id, saved[2].id, saved[3].id, saved[4].id, saved[1].id]
+
+    # leaving the filter removes the row
+    model.set_query("All", "task 2")
+    update(saved[2].id, "title='Other'")
+    assert _ids(model) == []
+    update(saved[2].id, "title='Task 2 again'")
+    assert _ids(model) == [saved[2].id]
+    assert len(resets) == 1
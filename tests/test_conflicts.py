@@ -1,5 +1,6 @@
+import random
 from datetime import datetime, timedelta
-from ui.calendar.conflicts import TimeRange, find_conflicts
+from ui.calendar.conflicts import ConflictIndex, TimeRange, find_conflicts
 
 
 BASE = datetime(2024, 1, 1)
@@ -21,3 +22,64 @@ def test_simple_conflict_pair():
 def test_multiple_conflicts_chain():
     ranges = [tr(9, 11), tr(10, 12), tr(11, 13), tr(12, 14)]
     assert find_conflicts(ranges) == [(0, 1), (1, 2), (2, 3)]
+
+
+def _brute_force(ranges):
+    return [
+        (i, j)
+        for i in range(len(ranges))
+        for j in range(i + 1, len(ranges))
+        if ranges[i].overlaps(ranges[j])
+    ]
+
+
+def _random_ranges(rng, n):
+    out = []
+    for _ in range(n):
+        start = BASE + timedelta(minutes=15 * rng.randrange(96))
+        out.append(TimeRange(start, start + timedelta(minutes=15 * rng.randrange(0, 12))))
+    return out
+
+
+def test_sweep_matches_pairwise_comparison():
+    rng = random.Random(7)
+    for n in (0, 1, 5, 40, 200):
+        ranges = _random_ranges(rng, n)
+        assert find_conflicts(ranges) == _brute_force(ranges)
+
+
+def test_conflict_index_tracks_moves_adds_and_removes():
+    rng = random.Random(11)
+    ranges = dict(enumerate(_random_ranges(rng, 60)))
+    index = ConflictIndex(ranges.items())
+    next_key = len(ranges)
+    for _ in range(300):
+        op = rng.random()
+        if op < 0.5 and ranges:
+            key = rng.choice(list(ranges))
+            ranges[key] = _random_ranges(rng, 1)[0]
+            index.move(key, ranges[key])
+        elif op < 0.75 or not ranges:
+            ranges[next_key] = _random_ranges(rng, 1)[0]
+            index.add(next_key, ranges[next_key])
+            next_key += 1
+        else:
+            key = rng.choice(list(ranges))
+            del ranges[key]
+            index.remove(key)
+        keys = list(ranges)
+        expected = {
+            frozenset((keys[i], keys[j]))
+            for i, j in find_conflicts([ranges[k] for k in keys])
+        }
+        assert index.pairs() == expected
+
+
+def test_conflict_index_reports_changed_neighbours():
+    index = ConflictIndex([("a", tr(9, 11)), ("b", tr(10, 12)), ("c", tr(13, 14))])
+    assert index.conflicted_keys() == {"a", "b"}
+    lost, gained = index.move("b", tr(13, 15))
+    assert lost == {"a"} and gained == {"c"}
+    assert index.conflicts_with("c") == {"b"}
+    assert index.remove("c") == {"b"}
+    assert index.conflicted_keys() == set()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import text
+
+from project.db import get_engine, ensure_db
+
+
+def test_engine_is_shared_per_path(tmp_path):
+    db_path = tmp_path / "shared.db"
+    first = get_engine(str(db_path))
+    second = get_engine(str(db_path))
+    other = get_engine(str(tmp_path / "other.db"))
+    assert first is second
+    assert first is not other
+
+
+def test_connections_are_tuned(tmp_path):
+    engine = get_engine(str(tmp_path / "tuned.db"))
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar_one().lower() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar_one() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar_one() == 1
+        assert conn.execute(text("PRAGMA temp_store")).scalar_one() == 2  # MEMORY
+
+
+def test_reader_not_blocked_by_open_write(tmp_path):
+    engine = get_engine(str(tmp_path / "wal.db"))
+    ensure_db(engine)
+    writer_ready = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO tasks (title, type, estimated_duration) VALUES ('w', 'study', 10)")
+            )
+            writer_ready.set()
+            release.wait(5)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    assert writer_ready.wait(5)
+    try:
+        with engine.connect() as conn:
+            # WAL readers see the last committed snapshot instead of waiting
+            count = conn.execute(text("SELECT COUNT(*) FROM tasks")).scalar_one()
+        assert count == 0
+    finally:
+        release.set()
+        t.join()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from integrations.google_calendar import GoogleCalendarClient
+from project.db import get_engine, ensure_db
+from ui.calendar.calendar_model import CalendarModel
+
+
+def _insert_event(conn, source_id, start, end):
+    conn.execute(
+        text(
+            "INSERT INTO events (source, source_id, title, start_time, end_time, type) "
+            "VALUES ('local', :sid, :sid, :s, :e, 'meeting')"
+        ),
+        {"sid": source_id, "s": start, "e": end},
+    )
+
+
+def test_epoch_columns_follow_inserts_and_updates(tmp_path):
+    engine = get_engine(str(tmp_path / "ts.db"))
+    ensure_db(engine)
+    start = datetime(2024, 1, 1, 9, 30)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO tasks (title, type, due_date, start_time, end_time) "
+                "VALUES ('t', 'study', '2024-01-05', :s, :e)"
+            ),
+            {"s": start.isoformat(), "e": "2024-01-01T10:30:00+00:00"},
+        )
+        row = conn.execute(text("SELECT start_ts, end_ts, due_ts FROM tasks")).one()
+        assert row.start_ts == int(start.timestamp())
+        assert row.end_ts == int(datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc).timestamp())
+        assert row.due_ts == int(datetime(2024, 1, 5).timestamp())
+
+        conn.execute(text("UPDATE tasks SET start_time = '2024-01-02T08:00:00-05:00'"))
+        moved = conn.execute(text("SELECT start_ts FROM tasks")).scalar_one()
+        assert moved == int(datetime(2024, 1, 2, 13, 0, tzinfo=timezone.utc).timestamp())
+
+
+def test_range_queries_compare_instants_not_strings(tmp_path):
+    engine = get_engine(str(tmp_path / "mixed.db"))
+    ensure_db(engine)
+    window_start = datetime(2024, 3, 4, 12, 0)
+    with engine.begin() as conn:
+        # 12:30 local written with a far-away offset: sorts outside as text
+        inside = datetime(2024, 3, 4, 12, 30).astimezone(timezone(timedelta(hours=-11)))
+        _insert_event(conn, "inside", inside.isoformat(), (inside + timedelta(minutes=20)).isoformat())
+        outside = datetime(2024, 3, 4, 15, 0).astimezone(timezone(timedelta(hours=11)))
+        _insert_event(conn, "outside", outside.isoformat(), (outside + timedelta(hours=1)).isoformat())
+
+    events = GoogleCalendarClient(engine).list_events(window_start, window_start + timedelta(hours=2))
+    assert [e["source_id"] for e in events] == ["inside"]
+    assert events[0]["start_time"] == datetime(2024, 3, 4, 12, 30)
+
+    items = CalendarModel(engine).fetch_range(date(2024, 3, 4), date(2024, 3, 4))
+    assert {i.title for i in items[date(2024, 3, 4)]} == {"inside", "outside"}
+
+
+def test_ensure_db_backfills_existing_database(tmp_path):
+    engine = get_engine(str(tmp_path / "old.db"))
+    ensure_db(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TRIGGER events_ts_ai"))
+        conn.execute(text("DROP TRIGGER events_ts_au"))
+        conn.execute(text("DROP INDEX events_range_ts_idx"))
+        conn.execute(text("ALTER TABLE events DROP COLUMN start_ts"))
+        conn.execute(text("ALTER TABLE events DROP COLUMN end_ts"))
+        _insert_event(conn, "old", "2024-01-01T10:00:00Z", "2024-01-01T11:00:00Z")
+
+    ensure_db(engine)
+    with engine.begin() as conn:
+        row = conn.execute(text("SELECT start_ts, end_ts FROM events")).one()
+    assert row.start_ts == int(datetime(2024, 1, 1, 10, tzinfo=timezone.utc).timestamp())
+    assert row.end_ts == row.start_ts + 3600
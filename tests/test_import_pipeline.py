@@ -7,7 +7,7 @@ from alembic.config import Config
 from sqlalchemy import text
 
 from project.db import get_engine
-from project.db_merge import merge_event, get_cursor, set_cursor
+from project.db_merge import merge_event, merge_events, get_cursor, set_cursor
 from integrations.google_calendar import GoogleCalendarClient
 
 
@@ -98,3 +98,73 @@ def test_client_list_and_fetch_since(tmp_path):
     assert cursor2 > cursor
     events2 = client.list_events(start, end)
     assert len(events2) == len(events)
+
+
+def _stage(engine, n, updated_at=lambda i: f"2024-01-01T08:{i // 60:02d}:{i % 60:02d}"):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO staging_events (source, source_id, title, start_time, end_time, type, description, updated_at) "
+                "VALUES ('google', :sid, :title, '2024-01-05T09:00:00', '2024-01-05T10:00:00', 'meeting', '', :upd)"
+            ),
+            [{"sid": str(i), "title": f"E{i}", "upd": updated_at(i)} for i in range(n)],
+        )
+
+
+def test_fetch_since_batches_commit_cursor_and_resume(tmp_path, monkeypatch):
+    engine = setup_engine(tmp_path)
+    # ties on updated_at straddle the batch boundary
+    _stage(engine, 25, updated_at=lambda i: f"2024-01-01T08:00:{i // 4:02d}")
+    client = GoogleCalendarClient(engine)
+
+    import integrations.google_calendar as gc
+
+    real = gc.merge_events
+    calls = []
+
+    def failing(conn, events):
+        calls.append(len(events))
+        if len(calls) == 3:
+            raise RuntimeError("crash mid-import")
+        return real(conn, events)
+
+    monkeypatch.setattr(gc, "merge_events", failing)
+    try:
+        client.fetch_since("google", batch_size=5)
+    except RuntimeError:
+        pass
+    # two batches of 5 + the tie with the 6th row committed
+    assert calls[:2] == [8, 8]
+    with engine.begin() as conn:
+        assert get_cursor(conn, "google") == "2024-01-01T08:00:03"
+        assert conn.execute(text("SELECT COUNT(*) FROM events")).scalar_one() == 16
+
+    monkeypatch.setattr(gc, "merge_events", real)
+    client.fetch_since("google", batch_size=5)
+    with engine.begin() as conn:
+        titles = [r[0] for r in conn.execute(text("SELECT title FROM events ORDER BY CAST(source_id AS INTEGER)"))]
+    assert titles == [f"E{i}" for i in range(25)]
+
+
+def test_merge_events_matches_row_at_a_time(tmp_path):
+    engine = setup_engine(tmp_path)
+    events = [
+        {
+            "source": "google",
+            "source_id": str(i % 7),
+            "title": f"v{i}",
+            "start_time": "2024-01-01T09:00:00",
+            "end_time": "2024-01-01T10:00:00",
+            "type": "meeting",
+            "description": "",
+            "updated_at": f"2024-01-01T08:00:{i:02d}",
+        }
+        for i in range(20)
+    ]
+    with engine.begin() as conn:
+        ids = merge_events(conn, events).ids
+        rows = conn.execute(text("SELECT id, source_id, title FROM events ORDER BY id")).fetchall()
+    assert len(rows) == 7
+    by_sid = {r.source_id: r for r in rows}
+    assert ids == [by_sid[e["source_id"]].id for e in events]
+    assert by_sid["0"].title == "v14"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+from agents.intervals import FirstFit, FreeList
+
+BASE = datetime(2024, 1, 1)
+
+
+def _at(minutes: int) -> datetime:
+    return BASE + timedelta(minutes=minutes)
+
+
+def _minute(dt: datetime) -> int:
+    return int((dt - BASE).total_seconds()) // 60
+
+
+def test_windows_are_merged_and_sorted():
+    free = FreeList([(_at(60), _at(90)), (_at(0), _at(30)), (_at(20), _at(40)), (_at(40), _at(50)), (_at(5), _at(5))])
+    assert free.intervals() == [(_at(0), _at(50)), (_at(60), _at(90))]
+    assert free.first() == (_at(0), _at(50))
+    assert FreeList().first() is None
+
+
+def test_subtract_splits_and_trims():
+    free = FreeList([(_at(0), _at(100)), (_at(200), _at(300))])
+    free.subtract(_at(10), _at(20))
+    free.subtract(_at(90), _at(210))
+    free.subtract(_at(250), _at(250))
+    free.subtract(_at(400), _at(500))
+    assert free.intervals() == [(_at(0), _at(10)), (_at(20), _at(90)), (_at(210), _at(300))]
+
+
+def test_matches_minute_by_minute_model():
+    rng = random.Random(3)
+    windows = [(_at(s), _at(s + rng.randint(0, 120))) for s in (rng.randrange(2000) for _ in range(40))]
+    free = FreeList(windows)
+    minutes = {m for s, e in windows for m in range(_minute(s), _minute(e))}
+    for _ in range(200):
+        start = rng.randrange(2100)
+        end = start + rng.randint(1, 90)
+        free.subtract(_at(start), _at(end))
+        minutes -= set(range(start, end))
+    got = {m for s, e in free for m in range(_minute(s), _minute(e))}
+    assert got == minutes
+    ends = [e for _, e in free]
+    starts = [s for s, _ in free]
+    assert all(a < b for a, b in zip(ends, starts[1:]))
+
+
+def test_first_fit_takes_the_earliest_gap_with_room():
+    slots = FirstFit([(_at(0), _at(30)), (_at(60), _at(120)), (_at(200), _at(300))])
+    assert slots.allocate(timedelta(minutes=45)) == (_at(60), _at(105))
+    assert slots.allocate(timedelta(minutes=20)) == (_at(0), _at(20))
+    assert slots.allocate(timedelta(minutes=15)) == (_at(105), _at(120))
+    assert slots.allocate(timedelta(minutes=101)) is None
+    assert slots.allocate(timedelta(minutes=100)) == (_at(200), _at(300))
+    assert FirstFit([]).allocate(timedelta(minutes=1)) is None
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime, time
 
-from sqlalchemy import text
+import pytest
+from sqlalchemy import event, text
 
 from project.db import get_engine, ensure_db
 from project.prefs import UserPrefs
@@ -10,6 +11,14 @@ from project import metrics
 from agents import planner_engine
 
 
+@pytest.fixture(autouse=True)
+def fresh_metrics_engine():
+    # each test points load_settings at its own database
+    metrics.reset_engine()
+    yield
+    metrics.reset_engine()
+
+
 def _init_db(tmp_path):
     db_path = tmp_path / "test.db"
     engine = get_engine(str(db_path))
@@ -85,3 +94,82 @@ def test_flag_off_no_change(tmp_path, monkeypatch):
     sessions = planner_engine.schedule(tasks, [], [], prefs, start=base)
     minutes = int((sessions[0]["end_time"] - sessions[0]["start_time"]).total_seconds() / 60)
     assert minutes == 50
+
+
+def test_planner_reads_the_log_once_per_run(tmp_path, monkeypatch):
+    engine, db_path = _init_db(tmp_path)
+    settings = _settings(db_path, True)
+    monkeypatch.setattr(metrics, "load_settings", lambda: settings)
+    for n, actual in enumerate([30, 40, 35, 60]):
+        metrics.record_session(1, 50, actual, "study", "math", datetime(2024, 1, 1, 8 + n))
+    metrics.record_session(2, 50, 20, "study", None, datetime(2024, 1, 1, 9))
+
+    estimates = metrics.load_estimates(engine)
+    assert estimates.get("study", "math", 50) == metrics.get_estimate("study", "math", 50)
+    assert estimates.get("study", None, 50) == metrics.get_estimate("study", None, 50)
+    assert estimates.get("exam", None, 50) == 50
+
+    reads = []
+    event.listen(engine, "before_cursor_execute", lambda *a: reads.append(a[2]))
+    tasks = [
+        {"id": n, "title": "T", "type": "study", "course_label": "math", "estimated_duration": 240}
+        for n in range(10)
+    ]
+    prefs = UserPrefs(day_start=time(8, 0), day_end=time(20, 0), default_session_minutes=50, max_sessions_per_day=3)
+    sessions = planner_engine.schedule(tasks, [], [], prefs, start=datetime(2024, 1, 1, 8, 0), settings=settings)
+    assert len(sessions) > 10
+    assert not [s for s in reads if "session_log" in s]
+    assert len([s for s in reads if "estimates" in s]) == 1
+
+
+def test_estimates_are_maintained_incrementally(tmp_path, monkeypatch):
+    engine, db_path = _init_db(tmp_path)
+    monkeypatch.setattr(metrics, "load_settings", lambda: _settings(db_path, True))
+    for hour, actual in [(9, 30), (11, 60), (10, 45)]:  # the last one is backdated
+        metrics.record_session(1, 50, actual, "study", "math", datetime(2024, 1, 1, hour))
+    metrics.record_session(2, 50, 20, "study", None, datetime(2024, 1, 1, 9))
+
+    reference = metrics.Estimates()
+    for actual in (30, 45, 60):
+        reference.add("study", "math", actual)
+    assert metrics.get_estimate("study", "math", 50) == reference.get("study", "math", 50)
+    assert metrics.get_estimate("study", None, 50) == 41  # 0.3*20 + 0.7*50
+
+    before = metrics.load_estimates(engine).stats
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE estimates SET weighted = 0"))
+    assert metrics.rebuild_estimates(engine) == 2
+    after = metrics.load_estimates(engine).stats
+    assert after.keys() == before.keys()
+    assert all(abs(after[k][0] - before[k][0]) < 1e-9 and after[k][1] == before[k][1] for k in after)
+
+
+def test_empty_course_label_shares_the_missing_label_estimate(tmp_path, monkeypatch):
+    engine, db_path = _init_db(tmp_path)
+    monkeypatch.setattr(metrics, "load_settings", lambda: _settings(db_path, True))
+    metrics.record_session(1, 50, 20, "study", "", datetime(2024, 1, 1, 9))
+    metrics.record_session(2, 50, 40, "study", None, datetime(2024, 1, 1, 10))
+
+    with engine.connect() as conn:
+        logged = conn.execute(text("SELECT course_label FROM session_log")).scalars().all()
+    assert logged == [None, None]
+    stored = metrics.load_estimates(engine)
+    assert list(stored.stats) == [("study", None)]
+    assert stored.get("study", "", 50) == stored.get("study", None, 50) == metrics.get_estimate("study", "", 50)
+    assert metrics.rebuild_estimates(engine) == 1
+    assert metrics.load_estimates(engine).stats == stored.stats
+
+
+def test_settings_are_read_once(tmp_path, monkeypatch):
+    engine, db_path = _init_db(tmp_path)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return _settings(db_path, True)
+
+    monkeypatch.setattr(metrics, "load_settings", load)
+    for n in range(3):
+        metrics.record_session(1, 50, 40 + n, "study", "math")
+        metrics.get_estimate("study", "math", 50)
+    assert len(calls) == 1
@@ -66,3 +66,28 @@ def test_schedule_tasks_rolls_over_when_end_exceeds_work_end():
     next_day = first['start_time'].date() + timedelta(days=1)
     assert second['start_time'] == datetime.combine(next_day, time(9, 0))
     assert second['end_time'] == second['start_time'] + timedelta(minutes=30)
+
+
+def test_schedule_tasks_uses_later_gaps_across_the_horizon():
+    day = datetime(2024, 1, 1).date()
+    at = lambda d, h, m=0: datetime.combine(day + timedelta(days=d), time(h, m))
+    events = [
+        {'start_time': at(0, 9, 30), 'end_time': at(0, 12)},
+        {'start_time': at(1, 9), 'end_time': at(1, 11)},
+    ]
+    tasks = [
+        {'id': 1, 'title': 'Long', 'estimated_duration': 90, 'due_date': None},
+        {'id': 2, 'title': 'Short', 'estimated_duration': 30, 'due_date': None},
+        {'id': 3, 'title': 'Huge', 'estimated_duration': 240, 'due_date': None},
+    ]
+    kwargs = dict(work_start=time(9, 0), work_end=time(12, 0), start_day=day, horizon_days=3)
+    scheduled = schedule_tasks(tasks, events, **kwargs)
+    placed = {t['id']: (t['start_time'], t['end_time']) for t in scheduled}
+    # Long skips the 30-minute gap on day 0 and the 60-minute one on day 1;
+    # Huge is longer than any work window, so it goes after the horizon
+    assert placed == {
+        1: (at(2, 9), at(2, 10, 30)),
+        3: (at(3, 9), at(3, 13)),
+        2: (at(0, 9), at(0, 9, 30)),
+    }
+    assert schedule_tasks(tasks, events, **kwargs) == scheduled
@@ -1,15 +1,25 @@
 from __future__ import annotations
 from datetime import datetime, time, timedelta
+import random
+
+import pytest
 
 from agents.planner_engine import schedule
 from project.prefs import UserPrefs
 
 
+@pytest.fixture(params=["intervals", "grid"])
+def backend(request):
+    if request.param == "grid":
+        pytest.importorskip("numpy")
+    return request.param
+
+
 def _prefs():
     return UserPrefs(day_start=time(8, 0), day_end=time(12, 0), default_session_minutes=60, max_sessions_per_day=2)
 
 
-def test_respects_events_and_blocks():
+def test_respects_events_and_blocks(backend):
     base = datetime(2024, 1, 1, 8, 0)
     tasks = [
         {"id": 1, "title": "Task", "estimated_duration": 60, "due_date": base + timedelta(days=1), "priority": 1, "state": "pending"}
@@ -22,27 +32,27 @@ def test_respects_events_and_blocks():
         {"kind": "busy", "start_time": base.replace(hour=10), "end_time": base.replace(hour=11)},
         {"kind": "study_window", "start_time": base.replace(hour=8), "end_time": base.replace(hour=12)},
     ]
-    sessions = schedule(tasks, events, blocks, _prefs(), start=base)
+    sessions = schedule(tasks, events, blocks, _prefs(), start=base, backend=backend)
     assert sessions[0]["start_time"] == base.replace(hour=11)
     assert sessions[0]["end_time"] == base.replace(hour=12)
 
 
-def test_deadline_before_window_pushes_up_priority():
+def test_deadline_before_window_pushes_up_priority(backend):
     base = datetime(2024, 1, 1, 8, 0)
     tasks = [
         {"id": 1, "title": "Later", "estimated_duration": 60, "due_date": base + timedelta(days=3), "priority": 1, "state": "pending"},
         {"id": 2, "title": "Soon", "estimated_duration": 60, "due_date": base + timedelta(days=1), "priority": 5, "state": "pending"},
     ]
-    sessions = schedule(tasks, [], [], _prefs(), start=base)
+    sessions = schedule(tasks, [], [], _prefs(), start=base, backend=backend)
     assert sessions[0]["task_id"] == 2
 
 
-def test_splits_into_sessions_and_limits_per_day():
+def test_splits_into_sessions_and_limits_per_day(backend):
     base = datetime(2024, 1, 1, 8, 0)
     tasks = [
         {"id": 1, "title": "Big", "estimated_duration": 180, "due_date": base + timedelta(days=3), "priority": 1, "state": "pending"}
     ]
-    sessions = schedule(tasks, [], [], _prefs(), start=base)
+    sessions = schedule(tasks, [], [], _prefs(), start=base, backend=backend)
     assert len(sessions) == 3
     assert sessions[0]["start_time"] == base.replace(hour=8)
     assert sessions[1]["start_time"] == base.replace(hour=9)
@@ -50,11 +60,49 @@ def test_splits_into_sessions_and_limits_per_day():
     assert sessions[2]["start_time"] == base.replace(day=2, hour=8)
 
 
-def test_does_not_schedule_past_due():
+def test_does_not_schedule_past_due(backend):
     base = datetime(2024, 1, 1, 8, 0)
     tasks = [
         {"id": 1, "title": "DueEarly", "estimated_duration": 150, "due_date": base.replace(hour=9, minute=30), "priority": 1, "state": "pending"}
     ]
-    sessions = schedule(tasks, [], [], _prefs(), start=base)
+    sessions = schedule(tasks, [], [], _prefs(), start=base, backend=backend)
     # Total scheduled time should end exactly at due date
     assert sessions[-1]["end_time"] <= base.replace(hour=9, minute=30)
+
+
+def test_time_after_an_early_deadline_stays_free(backend):
+    base = datetime(2024, 1, 1, 8, 0)
+    tasks = [
+        {"id": 1, "title": "DueEarly", "estimated_duration": 60, "due_date": base.replace(hour=8, minute=30), "priority": 1, "state": "pending"},
+        {"id": 2, "title": "Later", "estimated_duration": 60, "due_date": base + timedelta(days=3), "priority": 1, "state": "pending"},
+    ]
+    sessions = schedule(tasks, [], [], _prefs(), start=base, backend=backend)
+    assert [(s["task_id"], s["start_time"]) for s in sessions] == [
+        (1, base),
+        (2, base.replace(minute=30)),
+    ]
+
+
+def test_grid_backend_matches_intervals_on_aligned_input():
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    base = datetime(2024, 1, 1, 8, 0)
+    at = lambda day, slot: base + timedelta(days=day, minutes=15 * slot)
+    events = []
+    for _ in range(300):
+        day, slot = rng.randrange(30), rng.randrange(-8, 56)
+        events.append({"start_time": at(day, slot), "end_time": at(day, slot + rng.randint(1, 8))})
+    blocks = [
+        {"kind": "study_window", "start_time": at(d, 4), "end_time": at(d, 40)} for d in range(0, 30, 3)
+    ]
+    tasks = [
+        {"id": i, "title": f"T{i}", "estimated_duration": 15 * rng.randint(1, 12),
+         "due_date": at(rng.randrange(1, 30), rng.randrange(56)), "priority": rng.randint(1, 3),
+         "state": "pending"}
+        for i in range(150)
+    ]
+    prefs = UserPrefs(day_start=time(8, 0), day_end=time(22, 0), default_session_minutes=45, max_sessions_per_day=4)
+    kwargs = dict(start=base, horizon_days=30)
+    grid = schedule(tasks, events, blocks, prefs, backend="grid", **kwargs)
+    assert grid == schedule(tasks, events, blocks, prefs, **kwargs)
+    assert len(grid) > 50
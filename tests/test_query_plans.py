@@ -0,0 +1,92 @@
+"""EXPLAIN QUERY PLAN regression tests for the hot read paths.
+
+Every query must be driven by an index: a bare table ``SCAN`` or a
+``USE TEMP B-TREE`` sort step means an index went missing or a query was
+reshaped so SQLite can no longer use it.
+"""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import PENDING_TASKS_SQL, LocalCacheRepo
+from project.repo.query_builders import build_tasks_query
+from ui.calendar.calendar_model import COUNT_BY_DAY_SQL, EVENTS_RANGE_SQL, TASKS_RANGE_SQL
+from ui.pages import planner
+
+MODES = ["Today", "Upcoming", "By Course", "By Priority", "All"]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = get_engine(str(tmp_path / "plans.db"))
+    ensure_db(engine)
+    LocalCacheRepo(engine).upsert_tasks(
+        [
+            Task(
+                id=None,
+                owner_user_id=None,
+                source="app",
+                source_id=f"t{i}",
+                title=f"Task {i}",
+                type="study",
+                estimated_duration=30,
+                due_date="2024-02-01" if i % 2 else None,
+            )
+            for i in range(5)
+        ]
+    )
+    return engine
+
+
+def _plan(engine, sql, params=None):
+    with engine.connect() as conn:
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params or {}).fetchall()
+    return [row[3] for row in rows]
+
+
+def assert_indexed(plan):
+    for step in plan:
+        assert "TEMP B-TREE" not in step, plan
+        if step.startswith("SCAN "):
+            assert "USING" in step and "INDEX" in step, plan
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_task_filters_use_ordering_index(engine, mode):
+    assert_indexed(_plan(engine, *build_tasks_query(mode, "")))
+    assert_indexed(_plan(engine, *build_tasks_query(mode, "task", page_size=50)))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_task_pages_seek_ordering_index(engine, mode):
+    cursor = LocalCacheRepo(engine).list_tasks_page(mode, "", None, 2).cursor
+    assert cursor is not None
+    plan = _plan(engine, *build_tasks_query(mode, "", cursor=cursor, page_size=2))
+    assert_indexed(plan)
+    assert all(step.startswith("SEARCH ") for step in plan), plan
+
+
+@pytest.mark.parametrize("sql", [TASKS_RANGE_SQL, EVENTS_RANGE_SQL])
+def test_calendar_range_uses_covering_index(engine, sql):
+    plan = _plan(engine, sql, {"start": 1704067200, "end": 1704672000})
+    assert_indexed(plan)
+    assert all("COVERING INDEX" in step for step in plan), plan
+
+
+def test_month_counts_read_only_covering_indexes(engine):
+    plan = _plan(engine, COUNT_BY_DAY_SQL, {"start": 1704067200, "end": 1706745600, "offset": 0})
+    # The GROUP BY runs over the (small) per-item day list; only the table
+    # accesses must be index-only range seeks.
+    tables = [step for step in plan if step.startswith(("SEARCH", "SCAN")) and "subquery" not in step]
+    assert len(tables) == 2, plan
+    assert all(step.startswith("SEARCH ") and "COVERING INDEX" in step for step in tables), plan
+
+
+@pytest.mark.parametrize("sql", [planner.PENDING_TASKS_SQL, PENDING_TASKS_SQL])
+def test_pending_tasks_use_state_index(engine, sql):
+    plan = _plan(engine, sql)
+    assert_indexed(plan)
+    assert any("tasks_state_start_idx" in step for step in plan), plan
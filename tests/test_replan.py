@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+
+from agents.planner_engine import replan, schedule
+from project.db import get_engine, ensure_db
+from project.plan import load_plan, plan_version, save_plan, save_task_times
+from project.prefs import UserPrefs
+from sqlalchemy import text
+
+BASE = datetime(2024, 1, 1, 8, 0)
+
+
+def _prefs():
+    return UserPrefs(day_start=time(8, 0), day_end=time(12, 0), default_session_minutes=60, max_sessions_per_day=3)
+
+
+def _task(task_id, minutes, days=3):
+    return {"id": task_id, "title": f"T{task_id}", "estimated_duration": minutes,
+            "due_date": BASE + timedelta(days=days), "priority": task_id, "state": "pending"}
+
+
+def _slots(sessions):
+    return [(s["task_id"], s["start_time"].strftime("%d %H:%M")) for s in sessions]
+
+
+def test_replan_keeps_valid_sessions_and_moves_displaced_work():
+    tasks = [_task(1, 120), _task(2, 60)]
+    first = replan([], tasks, [], [], _prefs(), start=BASE)
+    assert _slots(first) == [(1, "01 08:00"), (1, "01 09:00"), (2, "01 10:00")]
+
+    # an event lands on task 1's second session; task 3 is added
+    events = [{"start_time": BASE.replace(hour=9), "end_time": BASE.replace(hour=10)}]
+    tasks.append(_task(3, 60, days=1))
+    second = replan(first, tasks, events, [], _prefs(), start=BASE)
+    assert _slots(second) == [(1, "01 08:00"), (2, "01 10:00"), (3, "01 11:00"), (1, "02 08:00")]
+
+    # completing task 2 frees its slot without moving anything else
+    tasks[1]["state"] = "done"
+    third = replan(second, tasks, events, [], _prefs(), start=BASE)
+    assert _slots(third) == [(1, "01 08:00"), (3, "01 11:00"), (1, "02 08:00")]
+
+    # with nothing displaced, replanning from scratch may differ but replan is stable
+    assert replan(third, tasks, events, [], _prefs(), start=BASE) == third
+    assert _slots(schedule(tasks, events, [], _prefs(), start=BASE))[0] == (3, "01 08:00")
+
+
+def test_plan_is_persisted_as_a_diff(tmp_path):
+    engine = get_engine(str(tmp_path / "db.sqlite"))
+    ensure_db(engine)
+    tasks = [_task(1, 120), _task(2, 60)]
+    sessions = replan([], tasks, [], [], _prefs(), start=BASE)
+    assert save_plan(engine, sessions, BASE) == (3, 0)
+
+    loaded = load_plan(engine, BASE)
+    assert _slots(loaded) == _slots(sessions)
+    events = [{"start_time": BASE.replace(hour=10), "end_time": BASE.replace(hour=11)}]
+    moved = replan(loaded, tasks, events, [], _prefs(), start=BASE)
+    assert save_plan(engine, moved, BASE) == (1, 1)
+    assert _slots(load_plan(engine, BASE)) == _slots(moved)
+    assert plan_version(engine) == 2
+    assert save_plan(engine, moved, BASE) == (0, 0)
+    assert plan_version(engine) == 2
+    assert {s["plan_version"] for s in load_plan(engine, BASE)} == {1, 2}
+    assert len(load_plan(engine, BASE, BASE.replace(hour=10))) == 2
+
+
+def test_task_times_are_written_back_in_one_batch(tmp_path):
+    engine = get_engine(str(tmp_path / "db.sqlite"))
+    ensure_db(engine)
+    with engine.begin() as conn:
+        for task_id in (1, 2):
+            conn.execute(
+                text("INSERT INTO tasks (id, title, type, state) VALUES (:id, :title, 'assignment', 'pending')"),
+                {"id": task_id, "title": f"T{task_id}"},
+            )
+    sessions = replan([], [_task(1, 120), _task(2, 60)], [], [], _prefs(), start=BASE)
+    assert save_task_times(engine, sessions) == 2
+    assert save_task_times(engine, sessions) == 0
+    with engine.connect() as conn:
+        start = conn.execute(text("SELECT start_time FROM tasks WHERE id = 1")).scalar()
+    assert start == BASE.isoformat()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, text
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.cache import CachedRepo, LRUCache
+from project.repo.local_sqlite import LocalCacheRepo
+from project.repo.syncing import SyncingRepo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    engine = get_engine(str(tmp_path / "db.sqlite"))
+    ensure_db(engine)
+    repo = CachedRepo(SyncingRepo(LocalCacheRepo(engine)), max_tasks=8)
+    repo.upsert_tasks([
+        Task(id=None, owner_user_id=None, source="app", source_id=f"t{n}",
+             title=f"Task {n}", type="study", estimated_duration=30)
+        for n in range(3)
+    ])
+    return repo
+
+
+@pytest.fixture
+def statements(repo):
+    seen = []
+
+    def record(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "INSERT", "DELETE")):
+            seen.append(statement)
+
+    event.listen(repo.local.engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(repo.local.engine, "before_cursor_execute", record)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 1, 2)
+
+
+def test_repeated_reads_stay_off_the_database(repo, statements):
+    task_id = repo.list_tasks()[0].id
+    statements.clear()
+    for _ in range(50):
+        assert repo.get_task(task_id).title == "Task 0"
+        repo.list_tasks_page("All", "")
+        repo.list_pending_tasks()
+    assert len(statements) == 2  # first page and pending list; the row came with the listing
+    assert repo.stats()["tasks"].hits == 50
+
+
+def test_writes_invalidate_precisely(repo, statements):
+    tasks = repo.list_tasks()
+    first, second = tasks[0], tasks[1]
+    repo.get_task(second.id)
+
+    first.title = "Renamed"
+    repo.upsert_task(first)
+    assert [t.title for t in repo.list_tasks()][:2] == ["Renamed", "Task 1"]
+    statements.clear()
+    assert repo.get_task(first.id).title == "Renamed"  # write-through
+    assert repo.get_task(second.id).title == "Task 1"  # untouched row still cached
+    assert not statements
+
+    # writes made outside the repository (calendar drag, planner) arrive on the change bus
+    with repo.local.engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET title='Moved' WHERE id=:id"), {"id": second.id})
+    assert repo.get_task(second.id).title == "Moved"
+    assert "Moved" in [t.title for t in repo.list_tasks()]
+
+    repo.delete_task(first.id)
+    statements.clear()
+    repo.get_task(first.id)
+    assert len(statements) == 1
+
+
+def test_mark_clean_refreshes_cached_rows(repo):
+    listed = repo.list_tasks()
+    assert all(t.dirty == 1 for t in listed)
+    repo.mark_clean(listed[0].id)
+    assert repo.list_tasks()[0].dirty == 0
+    assert repo.get_task(listed[0].id).dirty == 0
+
+
+def test_fill_racing_a_commit_is_not_cached(repo, monkeypatch):
+    task_id = repo.list_tasks()[0].id
+    repo.invalidate_all()
+    read = repo.inner.get_task
+
+    def read_then_commit(tid):
+        row = read(tid)  # the stale row
+        with repo.local.engine.begin() as conn:  # e.g. the sync thread
+            conn.execute(text("UPDATE tasks SET title='Synced' WHERE id=:id"), {"id": tid})
+        return row
+
+    monkeypatch.setattr(repo.inner, "get_task", read_then_commit)
+    assert repo.get_task(task_id).title == "Task 0"
+    monkeypatch.setattr(repo.inner, "get_task", read)
+    assert repo.get_task(task_id).title == "Synced"
+
+
+def test_cached_tasks_are_copies(repo):
+    task = repo.list_tasks()[0]
+    task.title = "Scribbled"
+    assert repo.list_tasks()[0].title == "Task 0"
+    fetched = repo.get_task(task.id)
+    fetched.title = "Scribbled"
+    assert repo.get_task(task.id).title == "Task 0"
+
+    task.title = "Saved"
+    repo.upsert_task(task)
+    task.title = "Scribbled after save"
+    assert repo.get_task(task.id).title == "Saved"
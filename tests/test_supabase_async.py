@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from integrations.supabase_async import SYNC_TABLES, AsyncSupabaseClient
+from integrations.supabase_client import SupabaseClient
+
+DELAY = 0.2
+
+
+class StubPostgrest(BaseHTTPRequestHandler):
+    """Minimal PostgREST stand-in: every GET sleeps ``DELAY`` then echoes."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):  # keep pytest output quiet
+        pass
+
+    def _reply(self, status: int, body) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        table = url.path.rsplit("/", 1)[-1]
+        with server.lock:
+            server.requests.append(("GET", table, parse_qs(url.query), self.headers.get("apikey")))
+            server.ports.add(self.client_address[1])
+            fail = server.failures.get(table, 0)
+            if fail:
+                server.failures[table] = fail - 1
+        if fail:
+            self._reply(503, {"message": "busy"})
+            return
+        time.sleep(DELAY)
+        self._reply(200, [{"table": table}])
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(("POST", self.path, body, self.headers.get("Prefer")))
+        self._reply(201, body)
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPostgrest)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.ports = set()
+    server.failures = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    host, port = stub.server_address
+    client = SupabaseClient(f"http://{host}:{port}", "anon", backoff=0.01)
+    yield client
+    client.close()
+
+
+def test_tables_are_fetched_concurrently(stub, client):
+    started = time.monotonic()
+    result = client.select_tables(SYNC_TABLES, owner_user_id="u1")
+    elapsed = time.monotonic() - started
+    assert result == {t: [{"table": t}] for t in SYNC_TABLES}
+    assert elapsed < DELAY * len(SYNC_TABLES) * 0.75
+    assert all(req[2]["owner_user_id"] == ["eq.u1"] and req[3] == "anon" for req in stub.requests)
+
+
+def test_connections_are_reused(stub, client):
+    for _ in range(5):
+        client.select("tasks", "*")
+    assert len(stub.ports) == 1
+
+
+def test_retries_with_backoff_then_succeeds(stub, client):
+    stub.failures["events"] = 2
+    assert client.select("events", "*") == [{"table": "events"}]
+    assert [r[1] for r in stub.requests] == ["events"] * 3
+
+
+def test_retries_must_allow_one_attempt():
+    with pytest.raises(ValueError):
+        AsyncSupabaseClient("http://127.0.0.1:1", "anon", retries=0)
+
+
+def test_select_changed_and_bulk_upsert_params(stub, client):
+    client.select_changed("tasks", "2024-01-01T00:00:00", 50)
+    _, _, params, _ = stub.requests[-1]
+    assert params["updated_at"] == ["gt.2024-01-01T00:00:00"]
+    assert params["order"] == ["updated_at.asc,id.asc"]
+    assert params["limit"] == ["50"]
+
+    rows = [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    assert client.upsert_many("tasks", rows) == rows
+    method, path, body, prefer = stub.requests[-1]
+    assert (method, path, body) == ("POST", "/rest/v1/tasks", rows)
+    assert "resolution=merge-duplicates" in prefer
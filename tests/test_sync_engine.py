@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import LocalCacheRepo
+from project.repo.remote_supabase import RemoteSupabaseRepo
+from project.repo.syncing import SyncingRepo
+from project.sync.engine import SyncEngine, backoff_delay
+
+
+class CountingRemote(RemoteSupabaseRepo):
+    def __init__(self, fail: bool = False):
+        self.pushed = []
+        self.requests = 0
+        self.fail = fail
+
+    def upsert_tasks(self, tasks):  # type: ignore[override]
+        self.requests += 1
+        if self.fail:
+            raise RuntimeError("offline")
+        self.pushed.extend(tasks)
+        return list(tasks)
+
+    def fetch_task_changes(self, since, limit, owner_user_id=None):  # type: ignore[override]
+        return []
+
+
+def _repo(tmp_path, remote):
+    engine = get_engine(str(tmp_path / "db.sqlite"))
+    ensure_db(engine)
+    return SyncingRepo(LocalCacheRepo(engine), remote=remote)
+
+
+def _queue_edit(repo: SyncingRepo, n: int) -> None:
+    task = Task(
+        id=None,
+        owner_user_id="user1",
+        source="app",
+        source_id=f"t{n}",
+        title=f"Task {n}",
+        type="study",
+        estimated_duration=30,
+    )
+    repo.local.upsert_task(task, dirty=True)
+    repo.local.queue_pending("tasks", "upsert", task.id, task.__dict__)
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _wait_for(predicate, timeout: float = 3.0) -> bool:
+    # Signals from the sync thread are queued to the main thread's event loop.
+    app = QCoreApplication.instance()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_backoff_doubles_with_jitter_and_cap():
+    rng = random.Random(7)
+    assert backoff_delay(0, 5.0, 300.0, rng) == 0.0
+    for failures, full in ((1, 5.0), (2, 10.0), (3, 20.0), (10, 300.0)):
+        delay = backoff_delay(failures, 5.0, 300.0, rng)
+        assert full / 2 <= delay <= full
+
+
+def test_idle_until_write_then_pushes_debounced_batch(tmp_path, app):
+    remote = CountingRemote()
+    repo = _repo(tmp_path, remote)
+    engine = SyncEngine(repo, interval=60.0, debounce=0.1)
+    depths = []
+    engine.queue_depth_changed.connect(depths.append)
+    engine.start()
+    try:
+        assert _wait_for(lambda: engine.last_success is not None)
+        assert remote.requests == 0  # empty queue, nothing pushed
+        for n in range(5):
+            _queue_edit(repo, n)
+        assert _wait_for(lambda: repo.local.pending_count() == 0)
+        assert remote.requests == 1
+        assert len(remote.pushed) == 5
+        assert 5 in depths
+    finally:
+        engine.stop()
+
+
+def test_failures_back_off_instead_of_retrying_on_every_write(tmp_path, app):
+    remote = CountingRemote(fail=True)
+    repo = _repo(tmp_path, remote)
+    engine = SyncEngine(repo, interval=60.0, debounce=0.1, backoff_base=30.0)
+    errors = []
+    engine.sync_error.connect(errors.append)
+    engine.start()
+    try:
+        for n in range(3):
+            _queue_edit(repo, n)
+        assert _wait_for(lambda: errors)
+        requests = remote.requests
+        for n in range(3, 6):
+            _queue_edit(repo, n)
+        _wait_for(lambda: False, timeout=0.3)
+        assert remote.requests == requests
+        assert engine.next_deadline(repo.local.pending_count()) - time.monotonic() >= 14.0
+    finally:
+        engine.stop()
+    assert errors == ["offline"]
+    assert repo.local.pending_count() == 6
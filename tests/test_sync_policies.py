@@ -7,7 +7,7 @@ from alembic.config import Config
 from sqlalchemy import text
 
 from project.db import get_engine
-from project.db_merge import merge_event
+from project.db_merge import merge_event, merge_events
 from integrations.google_calendar import GoogleCalendarClient
 
 
@@ -99,3 +99,48 @@ def test_conflict_policy_creates_copy(tmp_path, caplog):
     with engine.begin() as conn:
         count = conn.execute(text("SELECT COUNT(*) FROM events")).scalar_one()
     assert count == 2
+
+
+def test_merge_events_reports_outcomes(tmp_path):
+    engine = setup_engine(tmp_path)
+    client = GoogleCalendarClient(engine)
+    now = datetime.utcnow()
+
+    def ev(sid, title, updated):
+        return {
+            "source": "google",
+            "source_id": sid,
+            "title": title,
+            "start_time": "2024-01-01T09:00:00",
+            "end_time": "2024-01-01T10:00:00",
+            "type": "meeting",
+            "description": "",
+            "updated_at": updated.isoformat(),
+        }
+
+    old = now - timedelta(days=2)
+    with engine.begin() as conn:
+        first = merge_events(conn, [ev(str(i), f"E{i}", old) for i in range(4)])
+    assert (first.inserted, first.updated, first.conflicts) == (4, 0, 0)
+
+    # local edits on 1 and 2 after the sync
+    client.upsert_event(first.ids[1], {"title": "Local 1", "updated_at": (now + timedelta(hours=1)).isoformat()})
+    client.upsert_event(first.ids[2], {"title": "Local 2", "updated_at": (now + timedelta(hours=1)).isoformat()})
+    with engine.begin() as conn:
+        second = merge_events(
+            conn,
+            [
+                ev("0", "Remote 0", now),  # untouched locally: remote wins
+                ev("1", "Remote 1", now + timedelta(days=1)),  # both changed, remote newer
+                ev("2", "Remote 2", now + timedelta(minutes=30)),  # both changed, local newer
+                ev("9", "New", now),
+            ],
+        )
+        titles = dict(conn.execute(text("SELECT source_id, title FROM events")).fetchall())
+    assert second.ids[:3] == first.ids[:3]
+    assert (second.inserted, second.updated, second.kept_local, second.conflicts) == (1, 2, 1, 2)
+    assert titles["0"] == "Remote 0"
+    assert titles["1"] == "Remote 1"
+    assert titles["2"] == "Local 2"
+    assert titles[f"conflict-{first.ids[1]}"] == "Local 1 (conflict)"
+    assert titles[f"conflict-{first.ids[2]}"] == "Local 2 (conflict)"
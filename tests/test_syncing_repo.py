@@ -1,24 +1,47 @@
 from __future__ import annotations
 
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
 from project.db import get_engine, ensure_db
 from project.repo.local_sqlite import LocalCacheRepo
 from project.repo.remote_supabase import RemoteSupabaseRepo
-from project.repo.syncing import SyncingRepo
+from project.repo.syncing import MAX_PUSH_ATTEMPTS, SyncingRepo
 from project.repo.base import Task
 
 
 class DummyRemote(RemoteSupabaseRepo):
-    def __init__(self):
+    def __init__(self, fail: bool = False, poison=()):
         self.upserts = []
+        self.deletes = []
+        self.requests = 0
+        self.fail = fail
+        self.poison = set(poison)
 
     def upsert_task(self, task: Task) -> Task:  # type: ignore[override]
         self.upserts.append(task)
         task.dirty = 0
         return task
 
+    def upsert_tasks(self, tasks):  # type: ignore[override]
+        self.requests += 1
+        if self.fail:
+            raise RuntimeError("offline")
+        if any(t.source_id in self.poison for t in tasks):
+            raise ValueError("rejected")
+        for task in tasks:
+            self.upsert_task(task)
+        return list(tasks)
+
     def delete_task(self, local_id: int) -> None:  # pragma: no cover - not used
         pass
 
+    def delete_tasks(self, local_ids) -> None:  # type: ignore[override]
+        self.requests += 1
+        self.deletes.extend(local_ids)
+
 
 def test_offline_queue_and_push(tmp_path):
     engine = get_engine(str(tmp_path / "db.sqlite"))
@@ -47,3 +70,216 @@ def test_offline_queue_and_push(tmp_path):
     assert not local.get_pending_ops()
     tasks = local.list_tasks()
     assert tasks[0].dirty == 0
+
+
+def _offline_repo(tmp_path):
+    engine = get_engine(str(tmp_path / "db.sqlite"))
+    ensure_db(engine)
+    local = LocalCacheRepo(engine)
+    return local, SyncingRepo(local, remote=None)
+
+
+def _task(n: int) -> Task:
+    return Task(
+        id=None,
+        owner_user_id="user1",
+        source="app",
+        source_id=f"t{n}",
+        title=f"Task {n}",
+        type="study",
+        estimated_duration=30,
+    )
+
+
+def test_push_compacts_edit_storm(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    tasks = [repo.upsert_task(_task(n)) for n in range(5)]
+    for rev in range(20):
+        for task in tasks:
+            task.title = f"{task.source_id} rev {rev}"
+            repo.upsert_task(task)
+    repo.delete_task(tasks[0].id)
+    assert len(local.get_pending_ops()) == 5 * 21 + 1
+
+    remote = DummyRemote()
+    repo.remote = remote
+    repo.push_pending(batch_size=3)
+
+    assert remote.deletes == [tasks[0].id]
+    assert sorted(t.title for t in remote.upserts) == [f"t{n} rev 19" for n in range(1, 5)]
+    # four upserts in batches of three, then one delete
+    assert remote.requests == 3
+    assert not local.get_pending_ops()
+    assert all(t.dirty == 0 for t in local.list_tasks())
+
+
+def test_poisoned_op_backs_off_without_blocking_queue(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    for n in range(6):
+        repo.upsert_task(_task(n))
+    remote = DummyRemote(poison={"t1"})
+    repo.remote = remote
+
+    repo.push_pending(batch_size=3)
+    assert sorted(t.source_id for t in remote.upserts) == ["t0", "t2", "t3", "t4", "t5"]
+    (stuck,) = local.get_pending_ops()
+    assert stuck["attempts"] == 1 and stuck["last_error"] == "rejected"
+    assert stuck["next_attempt_at"] > datetime.utcnow().isoformat()
+
+    # backing off: not retried until its slot comes up
+    requests = remote.requests
+    repo.push_pending()
+    assert remote.requests == requests
+
+
+def test_dead_letter_after_max_attempts_and_replay(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    task = repo.upsert_task(_task(0))
+    repo.remote = DummyRemote(poison={"t0"})
+    for _ in range(MAX_PUSH_ATTEMPTS):
+        with local.engine.begin() as conn:
+            conn.execute(text("UPDATE pending_ops SET next_attempt_at=NULL"))
+        repo.push_pending()
+
+    assert not local.get_pending_ops()
+    (letter,) = repo.list_dead_letters()
+    assert letter["attempts"] == MAX_PUSH_ATTEMPTS and letter["row_local_id"] == str(task.id)
+
+    repo.remote.poison.clear()
+    assert repo.replay_dead_letters() == 1
+    assert not repo.list_dead_letters()
+    repo.push_pending()
+    assert not local.get_pending_ops()
+    assert [t.source_id for t in repo.remote.upserts] == ["t0"]
+
+
+def test_failed_push_keeps_queue_in_place(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    for n in range(3):
+        repo.upsert_task(_task(n))
+    before = local.get_pending_ops()
+
+    repo.remote = DummyRemote(fail=True)
+    with pytest.raises(RuntimeError):
+        repo.push_pending()
+
+    after = local.get_pending_ops()
+    assert [op["id"] for op in after] == [op["id"] for op in before]
+    assert all(op["attempts"] == 0 and op["last_error"] == "offline" for op in after)
+    assert all(t.dirty == 1 for t in local.list_tasks())
+
+
+def test_long_outage_dead_letters_nothing(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    for n in range(3):
+        repo.upsert_task(_task(n))
+    repo.remote = DummyRemote(fail=True)
+    for _ in range(MAX_PUSH_ATTEMPTS * 2):
+        with pytest.raises(RuntimeError):
+            repo.push_pending()
+    assert not repo.list_dead_letters()
+    assert len(local.get_pending_ops()) == 3
+
+    # a lone op failing on a transport error is not counted either
+    (tmp_path / "single").mkdir()
+    local2, repo2 = _offline_repo(tmp_path / "single")
+    repo2.upsert_task(_task(0))
+    repo2.remote = DummyRemote()
+    repo2.remote.upsert_tasks = lambda tasks: (_ for _ in ()).throw(ConnectionError("down"))
+    for _ in range(MAX_PUSH_ATTEMPTS * 2):
+        repo2.push_pending()
+    (op,) = local2.get_pending_ops()
+    assert op["attempts"] == 0 and op["last_error"] == "down"
+
+    repo.remote.fail = False
+    repo.push_pending()
+    assert not local.get_pending_ops()
+
+
+class FakeTasksClient:
+    """In-memory stand-in for the ``tasks`` table behind SupabaseClient."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.since_calls = []
+
+    def select_changed(self, table, since, limit, **filters):
+        self.since_calls.append(since)
+        rows = sorted(
+            (r for r in self.rows if since is None or r["updated_at"] > since),
+            key=lambda r: (r["updated_at"], r["id"]),
+        )
+        return [dict(r) for r in rows[:limit]]
+
+    def select(self, table, query, **filters):
+        return [dict(r) for r in self.rows if all(r[k] == v for k, v in filters.items())]
+
+
+def _remote_row(n: int, updated_at: str, **extra) -> dict:
+    row = {
+        "id": n,
+        "owner_user_id": "user1",
+        "source": "app",
+        "source_id": f"t{n}",
+        "title": f"Remote {n}",
+        "type": "study",
+        "estimated_duration": 30,
+        "updated_at": updated_at,
+        "version": "v1",
+        "deleted_at": None,
+    }
+    row.update(extra)
+    return row
+
+
+def _titles(local):
+    return {t.id: t.title for t in local.list_tasks()}
+
+
+def test_pull_pages_by_cursor_and_applies_tombstones(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    client = FakeTasksClient([
+        _remote_row(1, "2024-01-01T00:00:01"),
+        _remote_row(2, "2024-01-01T00:00:02"),
+        _remote_row(3, "2024-01-01T00:00:02"),
+        _remote_row(4, "2024-01-01T00:00:03"),
+        _remote_row(5, "2024-01-01T00:00:04"),
+    ])
+    repo.remote = RemoteSupabaseRepo(client)
+
+    assert repo.pull_changes(page_size=2) == 5
+    assert sorted(_titles(local)) == [1, 2, 3, 4, 5]
+    # the tie on :02 is fetched with the first page, so paging resumes after it
+    assert client.since_calls == [None, "2024-01-01T00:00:02", "2024-01-01T00:00:04"]
+    cursor, last_full = local.get_sync_state(None, "supabase:tasks")
+    assert cursor == "2024-01-01T00:00:04" and last_full is not None
+
+    # a local edit that has not been pushed yet must survive the pull
+    with local.engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET title='Local 3', dirty=1 WHERE id=3"))
+    client.rows[0].update(title="Renamed 1", updated_at="2024-01-02T00:00:00")
+    client.rows[1].update(deleted_at="2024-01-02", updated_at="2024-01-02T00:00:01")
+    client.rows[2].update(title="Remote edit 3", updated_at="2024-01-02T00:00:02")
+    client.since_calls.clear()
+
+    assert repo.pull_changes(page_size=10) == 3
+    assert client.since_calls == ["2024-01-01T00:00:04"]
+    assert _titles(local) == {1: "Renamed 1", 3: "Local 3", 4: "Remote 4", 5: "Remote 5"}
+    assert local.get_sync_state(None, "supabase:tasks")[0] == "2024-01-02T00:00:02"
+
+
+def test_full_reconcile_drops_rows_missing_remotely(tmp_path):
+    local, repo = _offline_repo(tmp_path)
+    client = FakeTasksClient([_remote_row(n, f"2024-01-01T00:00:0{n}") for n in range(1, 4)])
+    repo.remote = RemoteSupabaseRepo(client)
+    repo.pull_changes()
+    with local.engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET dirty=1 WHERE id=2"))
+
+    # hard-deleted remotely, no tombstone left behind
+    client.rows = [r for r in client.rows if r["id"] not in (2, 3)]
+    repo.pull_changes()
+    assert sorted(_titles(local)) == [1, 2, 3]
+
+    repo.pull_changes(full=True)
+    assert sorted(_titles(local)) == [1, 2]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, QModelIndex, Qt
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import LocalCacheRepo
+from project.repo.syncing import SyncingRepo
+from ui.pages.tasks import TaskListModel
+
+
+def _repo(tmp_path) -> LocalCacheRepo:
+    engine = get_engine(str(tmp_path / "pages.db"))
+    ensure_db(engine)
+    repo = LocalCacheRepo(engine)
+    repo.upsert_tasks(
+        [
+            Task(
+                id=None,
+                owner_user_id=None,
+                source="app",
+                source_id=f"t{i}",
+                title=f"Task {i}",
+                type="study",
+                estimated_duration=30,
+                due_date=f"2024-02-{1 + i % 5:02d}" if i % 3 else None,
+                course_label=["BIO", "MATH", None][i % 3],
+                priority=i % 4,
+            )
+            for i in range(23)
+        ]
+    )
+    return repo
+
+
+@pytest.mark.parametrize("mode", ["Today", "Upcoming", "By Course", "By Priority", "All"])
+def test_pages_concatenate_to_full_listing(tmp_path, mode):
+    repo = _repo(tmp_path)
+    expected = [t.id for t in repo.list_tasks(mode)]
+    seen = []
+    cursor = None
+    while True:
+        page = repo.list_tasks_page(mode, "", cursor, page_size=5)
+        seen.extend(t.id for t in page.tasks)
+        if page.cursor is None:
+            break
+        cursor = page.cursor
+    assert seen == expected
+
+
+def test_pagination_with_search(tmp_path):
+    repo = _repo(tmp_path)
+    expected = [t.id for t in repo.list_tasks("All", "task")]
+    first = repo.list_tasks("All", "task", page_size=10)
+    page = repo.list_tasks_page("All", "task", None, 10)
+    rest = repo.list_tasks("All", "task", cursor=page.cursor, page_size=100)
+    assert [t.id for t in first] + [t.id for t in rest] == expected
+
+
+def test_list_model_fetches_lazily(tmp_path):
+    QCoreApplication.instance() or QCoreApplication([])
+    model = TaskListModel(SyncingRepo(_repo(tmp_path)), page_size=10)
+    model.set_query("All", "")
+    assert model.rowCount() == 10
+    assert model.canFetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 23
+    assert not model.canFetchMore(QModelIndex())
+    text = model.data(model.index(0), Qt.ItemDataRole.DisplayRole)
+    assert text.startswith(f"#{model.task_at(0).id} [pending] Task 0")
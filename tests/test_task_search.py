@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from project.db import get_engine, ensure_db
+from project.repo.base import Task
+from project.repo.local_sqlite import LocalCacheRepo
+from project.repo.query_builders import build_fts_match
+from integrations.google_calendar import GoogleCalendarClient
+
+
+def _repo(tmp_path) -> LocalCacheRepo:
+    engine = get_engine(str(tmp_path / "fts.db"))
+    ensure_db(engine)
+    return LocalCacheRepo(engine)
+
+
+def _task(sid: str, title: str, ttype: str = "study", course: str | None = None) -> Task:
+    return Task(
+        id=None,
+        owner_user_id=None,
+        source="app",
+        source_id=sid,
+        title=title,
+        type=ttype,
+        estimated_duration=30,
+        course_label=course,
+    )
+
+
+def test_build_fts_match_quotes_prefix_terms():
+    assert build_fts_match('Read "ch 3"') == '"read"* "ch"* "3"*'
+    assert build_fts_match("  --  ") is None
+
+
+def test_fts_search_prefix_and_fields(tmp_path):
+    repo = _repo(tmp_path)
+    repo.upsert_tasks(
+        [
+            _task("a", "Read Book", course="ENG"),
+            _task("b", "Essay draft", ttype="homework", course="MATH"),
+            _task("c", "Reading notes", course="BIO"),
+        ]
+    )
+    assert {t.title for t in repo.list_tasks("All", "rea")} == {"Read Book", "Reading notes"}
+    assert [t.title for t in repo.list_tasks("All", "homew")] == ["Essay draft"]
+    assert [t.title for t in repo.list_tasks("All", "eng")] == ["Read Book"]
+    assert [t.title for t in repo.list_tasks("All", "read book")] == ["Read Book"]
+
+
+def test_fts_index_follows_updates_and_deletes(tmp_path):
+    repo = _repo(tmp_path)
+    (task,) = repo.upsert_tasks([_task("a", "Lab report")])
+    task.title = "Problem set"
+    repo.upsert_task(task)
+    assert repo.list_tasks("All", "lab") == []
+    assert [t.id for t in repo.list_tasks("All", "problem")] == [task.id]
+    with repo.engine.begin() as conn:
+        conn.execute(text("DELETE FROM tasks WHERE id=:id"), {"id": task.id})
+    assert repo.list_tasks("All", "problem") == []
+
+
+def test_ensure_db_indexes_existing_rows(tmp_path):
+    engine = get_engine(str(tmp_path / "fts.db"))
+    ensure_db(engine)
+    with engine.begin() as conn:
+        # simulate a database created before the search index existed
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(text(f"DROP TRIGGER tasks_fts_{suffix}"))
+        conn.execute(text("DROP TABLE tasks_fts"))
+        conn.execute(
+            text("INSERT INTO tasks (title, type, estimated_duration) VALUES ('Quiz prep', 'test', 30)")
+        )
+    ensure_db(engine)
+    assert [t.title for t in LocalCacheRepo(engine).list_tasks("All", "quiz")] == ["Quiz prep"]
+
+
+def test_search_events_matches_description(tmp_path):
+    engine = get_engine(str(tmp_path / "fts.db"))
+    ensure_db(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO events (source, source_id, title, start_time, end_time, type, description) "
+                "VALUES ('google', 'e1', 'Lecture', '2024-01-01T09:00:00', '2024-01-01T10:00:00', 'class', 'Organic chemistry')"
+            )
+        )
+    client = GoogleCalendarClient(engine)
+    assert [e["title"] for e in client.search_events("organ")] == ["Lecture"]
+    assert client.search_events("physics") == []
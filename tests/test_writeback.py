@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.pool import StaticPool
 
 from integrations.google_calendar import GoogleCalendarClient
@@ -85,3 +85,62 @@ def test_upsert_app_event_local_sample_mode_idempotent():
     assert row["title"] == "Session 2"
     assert row["start_time"] == new_start.isoformat()
     assert row["end_time"] == new_end.isoformat()
+
+
+def test_sync_app_events_only_rewrites_changed_sessions():
+    engine = setup_engine()
+    client = GoogleCalendarClient(engine)
+    start = datetime(2024, 1, 1, 9, 0)
+    sessions = [
+        {"source_id": f"task:{i}:0", "title": f"T{i}",
+         "start_time": start + timedelta(hours=i), "end_time": start + timedelta(hours=i, minutes=45)}
+        for i in range(3)
+    ]
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO events (source, source_id, title, start_time, end_time, type) "
+            "VALUES ('google', 'g1', 'Lecture', '2024-01-01T08:00:00', '2024-01-01T09:00:00', 'class')"
+        ))
+    assert client.sync_app_events(sessions) == (3, 0, 0)
+    assert client.sync_app_events(sessions) == (0, 0, 0)
+
+    sessions[1] = dict(sessions[1], start_time=start + timedelta(hours=5), end_time=start + timedelta(hours=6))
+    assert client.sync_app_events(sessions[:2], prune_prefix="task:") == (0, 1, 1)
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text("SELECT source_id, start_time, app_owned FROM events ORDER BY source_id")
+        ).fetchall()
+    assert [tuple(r) for r in rows] == [
+        ("g1", "2024-01-01T08:00:00", 0),
+        ("task:0:0", start.isoformat(), 1),
+        ("task:1:0", (start + timedelta(hours=5)).isoformat(), 1),
+    ]
+
+
+def test_upsert_events_introspects_schema_once():
+    engine = setup_engine()
+    client = GoogleCalendarClient(engine)
+    pragmas = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_pragmas(_conn, _cursor, statement, *_args):
+        if statement.startswith("PRAGMA table_info"):
+            pragmas.append(statement)
+
+    start = datetime(2024, 1, 1, 9, 0)
+    items = [
+        (None, {"source": "app", "source_id": f"s{i}", "title": f"S{i}", "type": "study_session",
+                "start_time": start + timedelta(hours=i), "end_time": start + timedelta(hours=i, minutes=30)})
+        for i in range(20)
+    ]
+    ids = client.upsert_events(items)
+    assert len(set(ids)) == 20
+    moved = [(eid, {"title": "Moved", "start_time": start, "end_time": start + timedelta(hours=1)}) for eid in ids[:5]]
+    assert client.upsert_events(moved) == ids[:5]
+    for eid in ids[5:10]:
+        client.upsert_event(eid, {"title": "Renamed"})
+    assert len(pragmas) <= 1
+
+    with engine.begin() as conn:
+        titles = [r[0] for r in conn.execute(text("SELECT title FROM events ORDER BY id"))]
+    assert titles == ["Moved"] * 5 + ["Renamed"] * 5 + [f"S{i}" for i in range(10, 20)]
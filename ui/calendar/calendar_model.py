@@ -1,10 +1,58 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+# Range reads over the integer epoch columns, served by the covering
+# tasks_range_ts_idx / events_range_ts_idx.
+TASKS_RANGE_SQL = """
+    SELECT id, title, start_ts, end_ts, type
+    FROM tasks
+    WHERE start_ts IS NOT NULL AND end_ts IS NOT NULL
+      AND start_ts < :end AND end_ts >= :start
+"""
+
+EVENTS_RANGE_SQL = """
+    SELECT id, source, source_id, title, start_ts, end_ts, type
+    FROM events
+    WHERE start_ts < :end AND end_ts >= :start
+"""
+
+TASK_ITEM_SQL = """
+    SELECT id, title, start_ts, end_ts, type
+    FROM tasks
+    WHERE id = :id AND start_ts IS NOT NULL AND end_ts IS NOT NULL
+"""
+
+EVENT_ITEM_SQL = """
+    SELECT id, source, source_id, title, start_ts, end_ts, type
+    FROM events
+    WHERE id = :id
+"""
+
+# Per-day item counts for both tables in one pass over the same indexes.
+# 'localtime' applies the offset in force at each instant, so days split
+# like fetch_range across daylight saving changes.
+COUNT_BY_DAY_SQL = """
+    SELECT date(start_ts, 'unixepoch', 'localtime') AS day, COUNT(*) AS n
+    FROM (
+        SELECT start_ts FROM tasks
+        WHERE start_ts IS NOT NULL AND end_ts IS NOT NULL
+          AND start_ts < :end AND end_ts >= :start
+        UNION ALL
+        SELECT start_ts FROM events
+        WHERE start_ts < :end AND end_ts >= :start
+    )
+    GROUP BY day
+"""
+
+
+def _local(ts: int) -> datetime:
+    """Return ``ts`` as aware local time, with the offset in force at that instant."""
+    return datetime.fromtimestamp(ts).astimezone()
+
 
 @dataclass(frozen=True)
 class CalendarItem:
@@ -23,78 +71,104 @@ class CalendarModel:
 
     def __init__(self, engine: Engine):
         self.engine = engine
-        self.tz = datetime.now().astimezone().tzinfo
+        self._month_counts: Dict[Tuple[int, int], Dict[date, int]] = {}
 
-    def _normalize(self, dt_str: str) -> datetime:
-        """Convert an ISO string to local timezone."""
-        if not dt_str:
-            raise ValueError("datetime string required")
-        dt = datetime.fromisoformat(dt_str)
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=self.tz)
-        return dt.astimezone(self.tz)
+    def _bounds(self, start: date, end: date) -> Dict[str, int]:
+        start_dt = datetime.combine(start, datetime.min.time())
+        end_dt = datetime.combine(end + timedelta(days=1), datetime.min.time())
+        return {"start": int(start_dt.timestamp()), "end": int(end_dt.timestamp())}
 
     def fetch_range(self, start: date, end: date) -> Dict[date, List[CalendarItem]]:
         """Return calendar items grouped by day between start and end (inclusive)."""
-        # compute range boundaries
-        start_dt = datetime.combine(start, datetime.min.time()).astimezone(self.tz)
-        end_dt = datetime.combine(end + timedelta(days=1), datetime.min.time()).astimezone(self.tz)
+        bounds = self._bounds(start, end)
         items: Dict[date, List[CalendarItem]] = {}
         with self.engine.begin() as conn:
-            # tasks
-            task_rows = conn.execute(
-                text(
-                    """
-                    SELECT id, title, start_time, end_time, type
-                    FROM tasks
-                    WHERE start_time IS NOT NULL AND end_time IS NOT NULL
-                      AND start_time < :end AND end_time >= :start
-                    """
-                ),
-                {"start": start_dt.isoformat(), "end": end_dt.isoformat()},
-            )
-            for row in task_rows:
-                start_local = self._normalize(row.start_time)
-                end_local = self._normalize(row.end_time)
-                day = start_local.date()
-                item = CalendarItem(
-                    id=row.id,
-                    title=row.title,
-                    start=start_local,
-                    end=end_local,
-                    type=row.type,
-                    source="task",
-                    table="tasks",
-                )
-                items.setdefault(day, []).append(item)
-
-            # events
-            event_rows = conn.execute(
-                text(
-                    """
-                    SELECT id, source, source_id, title, start_time, end_time, type
-                    FROM events
-                    WHERE start_time < :end AND end_time >= :start
-                    """
-                ),
-                {"start": start_dt.isoformat(), "end": end_dt.isoformat()},
-            )
-            for row in event_rows:
-                start_local = self._normalize(row.start_time)
-                end_local = self._normalize(row.end_time)
-                day = start_local.date()
-                item = CalendarItem(
-                    id=row.id,
-                    title=row.title,
-                    start=start_local,
-                    end=end_local,
-                    type=row.type,
-                    source=row.source,
-                    table="events",
-                )
-                items.setdefault(day, []).append(item)
+            for row in conn.execute(text(TASKS_RANGE_SQL), bounds):
+                item = self._task_item(row)
+                items.setdefault(item.start.date(), []).append(item)
+            for row in conn.execute(text(EVENTS_RANGE_SQL), bounds):
+                item = self._event_item(row)
+                items.setdefault(item.start.date(), []).append(item)
         return items
 
+    def fetch_item(self, table: str, item_id: int) -> Optional[CalendarItem]:
+        """Return one item by table and id, or ``None`` if it is not on the calendar."""
+        if table == "tasks":
+            sql, build = TASK_ITEM_SQL, self._task_item
+        elif table == "events":
+            sql, build = EVENT_ITEM_SQL, self._event_item
+        else:
+            return None
+        with self.engine.connect() as conn:
+            row = conn.execute(text(sql), {"id": item_id}).first()
+        return build(row) if row is not None else None
+
+    def _task_item(self, row) -> CalendarItem:
+        return CalendarItem(
+            id=row.id,
+            title=row.title,
+            start=_local(row.start_ts),
+            end=_local(row.end_ts),
+            type=row.type,
+            source="task",
+            table="tasks",
+        )
+
+    def _event_item(self, row) -> CalendarItem:
+        return CalendarItem(
+            id=row.id,
+            title=row.title,
+            start=_local(row.start_ts),
+            end=_local(row.end_ts),
+            type=row.type,
+            source=row.source,
+            table="events",
+        )
+
+    def count_by_day(self, start: date, end: date) -> Dict[date, int]:
+        """Return the number of items per day, grouped as in :meth:`fetch_range`."""
+        params = self._bounds(start, end)
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(COUNT_BY_DAY_SQL), params).fetchall()
+        return {date.fromisoformat(row.day): row.n for row in rows}
+
+    # month badge cache
+    def month_counts(self, year: int, month: int) -> Dict[date, int]:
+        """Return per-day counts for a month, cached until invalidated.
+
+        The model's own writes keep the cache current; callers that write to
+        tasks/events directly must call :meth:`note_added` or
+        :meth:`invalidate_counts`.
+        """
+        key = (year, month)
+        counts = self._month_counts.get(key)
+        if counts is None:
+            first = date(year, month, 1)
+            last = (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+            counts = self._month_counts[key] = self.count_by_day(first, last)
+        return dict(counts)
+
+    def invalidate_counts(self, day: Optional[date] = None) -> None:
+        """Drop the cached counts for ``day``'s month, or for every month."""
+        if day is None:
+            self._month_counts.clear()
+        else:
+            self._month_counts.pop((day.year, day.month), None)
+
+    def note_added(self, day: date) -> None:
+        """Record an item inserted on ``day`` in the cached counts."""
+        self._bump_count(day, 1)
+
+    def _bump_count(self, day: date, delta: int) -> None:
+        counts = self._month_counts.get((day.year, day.month))
+        if counts is None:
+            return
+        n = counts.get(day, 0) + delta
+        if n > 0:
+            counts[day] = n
+        else:
+            counts.pop(day, None)
+
     # helper methods for UI actions
     def delete_item(self, item: CalendarItem) -> None:
         """Remove an item from the underlying table."""
@@ -103,20 +177,21 @@ class CalendarModel:
             conn.execute(
                 text(f"DELETE FROM {table} WHERE id = :id"), {"id": item.id}
             )
+        self._bump_count(item.start.astimezone().date(), -1)
 
     def update_item_time(
         self, item: CalendarItem, new_start: datetime, new_end: datetime
-    ) -> None:
+    ) -> bool:
         """Persist a time change for a calendar item.
 
         Only application-owned events and tasks can be updated. External
         calendar events are ignored to avoid mutating data the app does not
-        control.
+        control. Returns True if the change was written.
         """
 
         # guard against modifying third-party events
         if item.table == "events" and item.source != "app":
-            return
+            return False
 
         with self.engine.begin() as conn:
             conn.execute(
@@ -128,8 +203,14 @@ class CalendarModel:
                     """
                 ),
                 {
-                    "start": new_start.astimezone(self.tz).isoformat(),
-                    "end": new_end.astimezone(self.tz).isoformat(),
+                    "start": new_start.astimezone().isoformat(),
+                    "end": new_end.astimezone().isoformat(),
                     "id": item.id,
                 },
             )
+        old_day = item.start.astimezone().date()
+        new_day = new_start.astimezone().date()
+        if new_day != old_day:
+            self._bump_count(old_day, -1)
+            self._bump_count(new_day, 1)
+        return True
@@ -1,7 +1,12 @@
 from __future__ import annotations
+from bisect import bisect_left, insort
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable, List, Tuple
+from datetime import datetime, timedelta
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, Generic, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
 
 
 @dataclass(frozen=True)
@@ -23,11 +28,123 @@ def find_conflicts(ranges: Iterable[TimeRange]) -> List[Tuple[int, int]]:
 
     The returned list is sorted in the order the conflicts are discovered.
     Each pair represents the indexes of two ranges that overlap.
+
+    Uses a sweep over the ranges ordered by start: only ranges still open at
+    a start point are compared, so a day costs O(n log n + k) for k conflicts
+    instead of comparing every pair.
     """
     items = list(ranges)
+    order = sorted(range(len(items)), key=lambda i: (items[i].start, i))
+    open_ends: List[Tuple[datetime, int]] = []
+    active: Set[int] = set()
     conflicts: List[Tuple[int, int]] = []
-    for i, a in enumerate(items):
-        for j in range(i + 1, len(items)):
-            if a.overlaps(items[j]):
-                conflicts.append((i, j))
+    for j in order:
+        rng = items[j]
+        while open_ends and open_ends[0][0] <= rng.start:
+            active.discard(heappop(open_ends)[1])
+        for i in active:
+            if rng.overlaps(items[i]):
+                conflicts.append((i, j) if i < j else (j, i))
+        active.add(j)
+        heappush(open_ends, (rng.end, j))
+    conflicts.sort()
     return conflicts
+
+
+class ConflictIndex(Generic[K]):
+    """Incrementally maintained conflict set for the items of one day.
+
+    Items are keyed by any hashable key (e.g. ``(table, id)``). Adding, moving
+    or removing an item only compares it against items whose start lies in
+    ``[start - longest duration, end)``, found by bisecting a sorted start
+    list, instead of recomputing every pair.
+    """
+
+    def __init__(self, items: Iterable[Tuple[K, TimeRange]] = ()) -> None:
+        self._ranges: Dict[K, TimeRange] = {}
+        self._starts: List[Tuple[datetime, int]] = []
+        self._seq: Dict[K, int] = {}
+        self._keys: Dict[int, K] = {}
+        self._counter = count()
+        # Never shrinks on removal; a stale bound only widens the search window.
+        self._max_len = timedelta(0)
+        self._overlaps: Dict[K, Set[K]] = {}
+
+        pairs = list(items)
+        for key, rng in pairs:
+            self._insert(key, rng)
+            self._overlaps[key] = set()
+        for i, j in find_conflicts(rng for _, rng in pairs):
+            a, b = pairs[i][0], pairs[j][0]
+            self._overlaps[a].add(b)
+            self._overlaps[b].add(a)
+
+    # ----- queries -----
+    def __contains__(self, key: object) -> bool:
+        return key in self._ranges
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def conflicts_with(self, key: K) -> Set[K]:
+        """Return the keys of the items overlapping ``key``."""
+        return set(self._overlaps.get(key, ()))
+
+    def conflicted_keys(self) -> Set[K]:
+        """Return every key that overlaps at least one other item."""
+        return {key for key, others in self._overlaps.items() if others}
+
+    def pairs(self) -> Set[frozenset]:
+        """Return all conflicting pairs as two-element frozensets."""
+        return {frozenset((a, b)) for a, others in self._overlaps.items() for b in others}
+
+    # ----- updates -----
+    def add(self, key: K, rng: TimeRange) -> Set[K]:
+        """Insert an item and return the keys it conflicts with."""
+        if key in self._ranges:
+            self.remove(key)
+        hits = self._overlapping(rng)
+        self._insert(key, rng)
+        self._overlaps[key] = hits
+        for other in hits:
+            self._overlaps[other].add(key)
+        return set(hits)
+
+    def remove(self, key: K) -> Set[K]:
+        """Delete an item and return the keys that no longer conflict with it."""
+        rng = self._ranges.pop(key)
+        seq = self._seq.pop(key)
+        del self._keys[seq]
+        pos = bisect_left(self._starts, (rng.start, seq))
+        del self._starts[pos]
+        hits = self._overlaps.pop(key)
+        for other in hits:
+            self._overlaps[other].discard(key)
+        return hits
+
+    def move(self, key: K, rng: TimeRange) -> Tuple[Set[K], Set[K]]:
+        """Change an item's range; return ``(lost, gained)`` conflict keys."""
+        before = self.remove(key) if key in self._ranges else set()
+        after = self.add(key, rng)
+        return before - after, after - before
+
+    # ----- internals -----
+    def _insert(self, key: K, rng: TimeRange) -> None:
+        seq = next(self._counter)
+        self._ranges[key] = rng
+        self._seq[key] = seq
+        self._keys[seq] = key
+        insort(self._starts, (rng.start, seq))
+        if rng.end - rng.start > self._max_len:
+            self._max_len = rng.end - rng.start
+
+    def _overlapping(self, rng: TimeRange) -> Set[K]:
+        lo = bisect_left(self._starts, (rng.start - self._max_len, -1))
+        hits: Set[K] = set()
+        for start, seq in self._starts[lo:]:
+            if start >= rng.end:
+                break
+            key = self._keys[seq]
+            if rng.overlaps(self._ranges[key]):
+                hits.add(key)
+        return hits
@@ -3,18 +3,21 @@ from __future__ import annotations
 from datetime import datetime
 from PyQt6.QtWidgets import QFrame, QLabel, QVBoxLayout
 from PyQt6.QtCore import Qt, QPoint
-from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from project.repo.local_sqlite import LocalCacheRepo
+
 from .calendar_model import CalendarItem
 
 
 class HoverCard(QFrame):
     """Small floating card shown when hovering over a calendar item."""
 
-    def __init__(self, engine: Engine, parent=None):
+    def __init__(self, engine: Engine, parent=None, repo=None):
         super().__init__(parent, Qt.WindowType.ToolTip)
         self.engine = engine
+        # A CachedRepo keeps hovering off the database; task details rarely change.
+        self.repo = repo or LocalCacheRepo(engine)
         self.setWindowFlags(Qt.WindowType.ToolTip)
         layout = QVBoxLayout(self)
         self.label = QLabel("", self)
@@ -26,14 +29,10 @@ class HoverCard(QFrame):
         course = None
         due = None
         if item.table == "tasks":
-            with self.engine.begin() as conn:
-                row = conn.execute(
-                    text("SELECT course_label, due_date FROM tasks WHERE id=:id"),
-                    {"id": item.id},
-                ).first()
-            if row:
-                course = row.course_label
-                due = row.due_date
+            task = self.repo.get_task(item.id)
+            if task:
+                course = task.course_label
+                due = task.due_date
         line2 = item.type
         if course:
             line2 += f" / {course}"
@@ -130,7 +130,7 @@ class BaseQLineEdit(QLineEdit):
 class QuickAddInline(BaseQLineEdit):
     """Inline quick-add entry displayed over the calendar grid."""
 
-    saved = pyqtSignal()
+    saved = pyqtSignal(object)  # start datetime of the inserted item
 
     def __init__(self, engine: Engine, parent=None) -> None:
         super().__init__(parent)
@@ -193,4 +193,4 @@ class QuickAddInline(BaseQLineEdit):
                 )
 
         self.hide()
-        self.saved.emit()
+        self.saved.emit(data["start"])
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timedelta, time, date
-from typing import Dict, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set
 
 from PyQt6.QtCore import Qt, QDate, QTime, QEvent
 from PyQt6.QtGui import QColor
@@ -9,20 +10,30 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem
 
 from sqlalchemy.engine import Engine
 
+from project.changes import ChangeEvent
+from ui.change_relay import ChangeRelay
+
 from .calendar_model import CalendarModel, CalendarItem
 from .month_view import MonthView
 from .quick_add_dialog import QuickAddDialog
 from .quick_add_inline import QuickAddInline
 from .hover_card import HoverCard
-from .conflicts import TimeRange, find_conflicts
+from .conflicts import ConflictIndex, TimeRange
+
+ItemKey = Tuple[str, int]  # (table, id): ids are only unique per table
+
+
+def _key(item: CalendarItem) -> ItemKey:
+    return (item.table, item.id)
 
 
 class WeekView(QWidget):
     """Minimal 7‑day calendar with inline quick‑add, hover cards, and drag/resize."""
 
-    def __init__(self, engine: Engine, parent: Optional[QWidget] = None) -> None:
+    def __init__(self, engine: Engine, parent: Optional[QWidget] = None, repo=None) -> None:
         super().__init__(parent)
         self.engine = engine
+        self.repo = repo  # optional CachedRepo used by the hover card
         self.model = CalendarModel(engine)
 
         self.current_day: date = datetime.now().date()
@@ -31,7 +42,10 @@ class WeekView(QWidget):
         self._drag_item: Optional[CalendarItem] = None
         self._drag_start: Optional[Tuple[int, int]] = None
         self._resize_edge: Optional[str] = None  # "start" | "end" | None
-        self._conflict_ids: Set[int] = set()
+        self._items_by_day: Dict[date, List[CalendarItem]] = {}
+        self._loaded: Dict[ItemKey, CalendarItem] = {}
+        self._day_conflicts: Dict[date, ConflictIndex[ItemKey]] = {}
+        self._conflict_keys: Set[ItemKey] = set()
 
         layout = QVBoxLayout(self)
 
@@ -65,9 +79,12 @@ class WeekView(QWidget):
 
         # Overlays
         self.quick_inline = QuickAddInline(engine, self._viewport)
-        self.quick_inline.saved.connect(self.refresh)
 
-        self.hover_card = HoverCard(engine, self._viewport)
+        self.hover_card = HoverCard(engine, self._viewport, repo=repo)
+
+        # Every committed write, ours or not, is patched in via apply_change
+        self.changes = ChangeRelay(engine, self)
+        self.changes.changed.connect(self.apply_change)
 
         # Optional: load QSS next to this file
         self._load_styles()
@@ -95,11 +112,25 @@ class WeekView(QWidget):
         start = self.week_start()
         end = start + timedelta(days=6)
 
-        items_by_day = self.model.fetch_range(start, end)
+        self._items_by_day = self.model.fetch_range(start, end)
+        self._loaded = {_key(i): i for items in self._items_by_day.values() for i in items}
+        self._day_conflicts = {
+            d: ConflictIndex((_key(i), TimeRange(i.start, i.end)) for i in items)
+            for d, items in self._items_by_day.items()
+        }
+        self._render_week()
+        self._refresh_month_badges()
+
+    def reload(self) -> None:
+        """Refresh after writes made outside this view (drops cached counts)."""
+        self.model.invalidate_counts()
+        self.refresh()
 
+    def _render_week(self) -> None:
+        start = self.week_start()
         self.table.clearContents()
         self._cell_items.clear()
-        self._conflict_ids.clear()
+        self._conflict_keys.clear()
 
         # Header dates
         for col in range(7):
@@ -107,13 +138,12 @@ class WeekView(QWidget):
             self.table.setHorizontalHeaderItem(col, QTableWidgetItem(label))
 
         # Fill cells and mark conflicts
-        for d, items in items_by_day.items():
+        for d, items in self._items_by_day.items():
             col = (d - start).days
-            ranges = [TimeRange(i.start, i.end) for i in items]
-            conflicts = find_conflicts(ranges)  # list[tuple[int, int]]
-            conflicted = {idx for a, b in conflicts for idx in (a, b)}
+            index = self._day_conflicts.get(d)
+            conflicted = index.conflicted_keys() if index is not None else set()
 
-            for idx, item in enumerate(items):
+            for item in items:
                 row = item.start.hour
                 cell = self.table.item(row, col)
                 text = item.title
@@ -122,25 +152,95 @@ class WeekView(QWidget):
                 else:
                     cell = QTableWidgetItem(text)
 
-                if idx in conflicted:
+                if _key(item) in conflicted:
                     cell.setBackground(QColor("red"))
                     cell.setToolTip("Overlaps with another item")
-                    self._conflict_ids.add(item.id)
+                    self._conflict_keys.add(_key(item))
 
                 self.table.setItem(row, col, cell)
                 self._cell_items[(row, col)] = item
 
-        # Month badges (counts per day)
-        month_start = date(self.current_day.year, self.current_day.month, 1)
-        next_month = month_start.replace(day=28) + timedelta(days=4)  # always flips to next month
-        month_end = next_month - timedelta(days=next_month.day)
-        counts: Dict[date, int] = {}
-        monthly = self.model.fetch_range(month_start, month_end)
-        for d, items in monthly.items():
-            counts[d] = len(items)
+    def _refresh_month_badges(self) -> None:
+        # Month badges (counts per day), served from the model's month cache
+        counts = self.model.month_counts(self.current_day.year, self.current_day.month)
         self.month.set_badges(counts)
         self.month.setSelectedDate(self.current_day)
 
+    # ----- incremental updates -----
+    def _remove_item(self, item: CalendarItem) -> None:
+        """Drop an item from the loaded week and its day's conflict index."""
+        day = item.start.date()
+        key = _key(item)
+        self._loaded.pop(key, None)
+        items = self._items_by_day.get(day)
+        if items is not None:
+            self._items_by_day[day] = [i for i in items if _key(i) != key]
+        index = self._day_conflicts.get(day)
+        if index is not None and key in index:
+            index.remove(key)
+
+    def _add_item(self, item: CalendarItem) -> None:
+        day = item.start.date()
+        week_start = self.week_start()
+        if not week_start <= day <= week_start + timedelta(days=6):
+            return
+        self._items_by_day.setdefault(day, []).append(item)
+        self._loaded[_key(item)] = item
+        index = self._day_conflicts.setdefault(day, ConflictIndex())
+        index.add(_key(item), TimeRange(item.start, item.end))
+
+    def _move_item(self, item: CalendarItem, new_start: datetime, new_end: datetime) -> None:
+        """Apply a drag/resize to the loaded week without refetching it."""
+        moved = replace(item, start=new_start, end=new_end)
+        day = item.start.date()
+        if moved.start.date() == day and day in self._day_conflicts:
+            items = self._items_by_day[day]
+            self._items_by_day[day] = [moved if _key(i) == _key(item) else i for i in items]
+            self._loaded[_key(item)] = moved
+            self._day_conflicts[day].move(_key(item), TimeRange(new_start, new_end))
+        else:
+            self._remove_item(item)
+            self._add_item(moved)
+        self._render_week()
+        if moved.start.date() != day:
+            self._refresh_month_badges()
+
+    def apply_change(self, ev: ChangeEvent) -> None:
+        """Patch the loaded week for one committed row change.
+
+        Only the changed row is refetched. Changes this view already applied
+        itself (drag, delete) find the loaded item up to date and do nothing.
+        """
+        if ev.table not in ("tasks", "events"):
+            return
+        if ev.id is None:
+            self.reload()
+            return
+        old = self._loaded.get((ev.table, ev.id))
+        new = None if ev.op == "delete" else self.model.fetch_item(ev.table, ev.id)
+        if old == new:
+            if old is None and ev.op == "delete":
+                # not loaded, so its day is unknown: recount lazily
+                self.model.invalidate_counts()
+                self._refresh_month_badges()
+            return
+        if old is not None:
+            self._remove_item(old)
+        if new is not None:
+            self._add_item(new)
+        if ev.op == "insert":
+            if new is not None:
+                self.model.note_added(new.start.date())
+        elif old is None or new is None:
+            self.model.invalidate_counts()
+        elif old.start.date() != new.start.date():
+            self.model.invalidate_counts(old.start.date())
+            self.model.invalidate_counts(new.start.date())
+        if self.selected_item is not None and _key(self.selected_item) == (ev.table, ev.id):
+            self.selected_item = new
+        self._render_week()
+        self._refresh_month_badges()
+
     # ----- selection & dialogs -----
     def on_cell_clicked(self, row: int, col: int) -> None:
         self.selected_item = self._cell_items.get((row, col))
@@ -148,8 +248,7 @@ class WeekView(QWidget):
     def open_quick_add(self) -> None:
         from .quick_add_dialog import QuickAddDialog  # local import to keep init light
         dlg = QuickAddDialog(self.engine, self)
-        if dlg.exec() == dlg.DialogCode.Accepted:
-            self.refresh()
+        dlg.exec()  # the insert arrives through apply_change
 
     def edit_selected(self) -> None:
         if not self.selected_item:
@@ -169,7 +268,10 @@ class WeekView(QWidget):
         if dlg.exec() == dlg.DialogCode.Accepted:
             # simple approach: delete old and rely on dialog insert
             self.model.delete_item(self.selected_item)
-            self.refresh()
+            self._remove_item(self.selected_item)
+            self.selected_item = None
+            self._render_week()
+            self._refresh_month_badges()
 
     # ----- keyboard -----
     def keyPressEvent(self, event) -> None:  # type: ignore[override]
@@ -182,7 +284,10 @@ class WeekView(QWidget):
         if key == Qt.Key.Key_Delete and self.selected_item:
             if self.selected_item.table == "events" and self.selected_item.source == "app":
                 self.model.delete_item(self.selected_item)
-                self.refresh()
+                self._remove_item(self.selected_item)
+                self.selected_item = None
+                self._render_week()
+                self._refresh_month_badges()
             return
         if key == Qt.Key.Key_E and self.selected_item:
             self.edit_selected()
@@ -208,7 +313,7 @@ class WeekView(QWidget):
                     if model is not None:
                         rect = self.table.visualRect(model.index(row, col))
                         global_pos = self._viewport.mapToGlobal(rect.topRight())
-                        self.hover_card.show_item(item, conflict=item.id in self._conflict_ids, pos=global_pos)
+                        self.hover_card.show_item(item, conflict=_key(item) in self._conflict_keys, pos=global_pos)
                     else:
                         self.hover_card.hide_card()
                 else:
@@ -285,10 +390,10 @@ class WeekView(QWidget):
                     new_start = start + timedelta(days=d_col, hours=d_row)
                     new_end = end + timedelta(days=d_col, hours=d_row)
 
-                self.model.update_item_time(self._drag_item, new_start, new_end)
+                if self.model.update_item_time(self._drag_item, new_start, new_end):
+                    self._move_item(self._drag_item, new_start, new_end)
                 self._drag_item = None
                 self._resize_edge = None
-                self.refresh()
                 return True
 
         return super().eventFilter(source, event)
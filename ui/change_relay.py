@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from sqlalchemy.engine import Engine
+
+from project.changes import ChangeEvent, change_bus
+
+
+class ChangeRelay(QObject):
+    """Re-emit committed row changes as a Qt signal.
+
+    Writes may commit on any thread; ``changed`` is delivered to receivers on
+    their own (GUI) thread through Qt's queued connections.
+    """
+
+    changed = pyqtSignal(object)  # ChangeEvent
+
+    def __init__(self, engine: Engine, parent=None):
+        super().__init__(parent)
+        self._bus = change_bus(engine)
+        self._bus.subscribe(self._forward)
+
+    def _forward(self, ev: ChangeEvent) -> None:
+        try:
+            self.changed.emit(ev)
+        except RuntimeError:  # the Qt side was deleted with its parent
+            self.close()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self._forward)
@@ -10,6 +10,7 @@ from PyQt6.QtWidgets import (
 
 from project.settings import Settings, load_settings
 from project.db import get_engine, ensure_db
+from project.repo.cache import CachedRepo
 from project.repo.local_sqlite import LocalCacheRepo
 from project.repo.syncing import SyncingRepo
 from integrations.auth_supabase import SupabaseAuth
@@ -40,9 +41,13 @@ class MainWindow(QMainWindow):
         self.resize(1100, 740)
 
         # Database engine and repositories
-        self.engine = engine or get_engine(self.settings.sqlite_path)
+        self.engine = engine or get_engine(
+            self.settings.sqlite_path,
+            pool_size=self.settings.sqlite_pool_size,
+            max_overflow=self.settings.sqlite_max_overflow,
+        )
         ensure_db(self.engine)
-        self.repo = repo or SyncingRepo(LocalCacheRepo(self.engine))
+        self.repo = CachedRepo(repo or SyncingRepo(LocalCacheRepo(self.engine)))
 
         # Supabase auth (stubbed in sample mode)
         self.auth = SupabaseAuth(
@@ -68,11 +73,11 @@ class MainWindow(QMainWindow):
         # Instantiate pages with dependencies
         self.pages = {
             "home": HomePage(self),
-            "calendar": WeekView(self.engine, self),
+            "calendar": WeekView(self.engine, self, repo=self.repo),
             "tasks": TasksPage(self.repo, self),
-            "planner": PlannerPage(self.engine, self),
+            "planner": PlannerPage(self.engine, self, settings=self.settings),
             "settings": SettingsPage(self.settings, self.auth, self),
-            "adhd": ADHDModePage(self.engine, self),
+            "adhd": ADHDModePage(self.engine, self, repo=self.repo),
         }
         for key in ("home", "calendar", "tasks", "planner", "settings", "adhd"):
             self.stack.addWidget(self.pages[key])
@@ -2,17 +2,20 @@ from __future__ import annotations
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem
 from PyQt6.QtCore import QTimer, Qt
 from datetime import datetime
-from sqlalchemy import text
 from project.db import get_engine
+from project.changes import ChangeEvent
+from project.repo.local_sqlite import LocalCacheRepo
+from ui.change_relay import ChangeRelay
 
 
 class ADHDModePage(QWidget):
     """
     Focus mode with Pomodoro timers and simplified task list.
     """
-    def __init__(self, engine, parent=None):
+    def __init__(self, engine, parent=None, repo=None):
         super().__init__(parent)
         self.engine = engine
+        self.repo = repo or LocalCacheRepo(engine)
         layout = QVBoxLayout(self)
         self.setWindowTitle("Focus Mode")
 
@@ -45,21 +48,48 @@ class ADHDModePage(QWidget):
         self.current_phase = "idle"
         self.remaining_seconds = 0
 
+        self.changes = ChangeRelay(engine, self)
+        self.changes.changed.connect(self.apply_change)
+
     def refresh_tasks(self):
         self.list_widget.clear()
-        with self.engine.begin() as conn:
-            rows = conn.execute(
-                text(
-                    "SELECT id, title, type, start_time, end_time FROM tasks WHERE state = 'pending' ORDER BY start_time"
-                )
-            ).fetchall()
-            for row in rows:
-                id_, title, ttype, start, end = row
-                time_str = ""
-                if start and end:
-                    time_str = f" | {start} → {end}"
-                item_text = f"{title} ({ttype}){time_str}"
-                self.list_widget.addItem(QListWidgetItem(item_text))
+        for task in self.repo.list_pending_tasks():
+            item = QListWidgetItem(self._item_text(task))
+            item.setData(Qt.ItemDataRole.UserRole, task.id)
+            item.setData(Qt.ItemDataRole.UserRole + 1, task.start_time)
+            self.list_widget.addItem(item)
+
+    @staticmethod
+    def _item_text(task) -> str:
+        time_str = ""
+        if task.start_time and task.end_time:
+            time_str = f" | {task.start_time} → {task.end_time}"
+        return f"{task.title} ({task.type}){time_str}"
+
+    def _find_item(self, task_id: int):
+        for row in range(self.list_widget.count()):
+            item = self.list_widget.item(row)
+            if item is not None and item.data(Qt.ItemDataRole.UserRole) == task_id:
+                return row, item
+        return -1, None
+
+    def apply_change(self, ev: ChangeEvent):
+        """Patch the list for one committed task change."""
+        if ev.table != "tasks":
+            return
+        if ev.id is None:
+            self.refresh_tasks()
+            return
+        row, item = self._find_item(ev.id)
+        task = None if ev.op == "delete" else self.repo.get_task(ev.id)
+        if task is None or task.state != "pending":
+            if item is not None:
+                self.list_widget.takeItem(row)
+        elif item is None or task.start_time != item.data(Qt.ItemDataRole.UserRole + 1):
+            # new to the list or moved in the ordering
+            self.refresh_tasks()
+        else:
+            item.setText(self._item_text(task))
 
     def start_timer(self):
         if self.current_phase == "work":
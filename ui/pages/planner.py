@@ -1,20 +1,47 @@
 from __future__ import annotations
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from datetime import datetime, timedelta
-from agents.planner_engine import schedule
+from agents.planner_engine import replan
+from project import metrics
+from project.changes import ChangeEvent
+from project.plan import load_plan, save_plan, save_task_times
 from project.prefs import load_prefs
+from project.settings import load_settings
 from integrations.google_calendar import GoogleCalendarClient
 from sqlalchemy import text
+from ui.change_relay import ChangeRelay
+
+PENDING_TASKS_SQL = (
+    "SELECT id, title, type, estimated_duration, due_ts, start_ts, end_ts "
+    "FROM tasks WHERE state = 'pending'"
+)
+
+BLOCKS_IN_RANGE_SQL = (
+    "SELECT kind, start_ts, end_ts, source, description FROM blocks "
+    "WHERE start_ts < :end AND end_ts > :start"
+)
+
+HORIZON_DAYS = 7
+
+# source_id prefix of the app-owned events mirroring the plan
+APP_EVENT_PREFIX = "task:"
 
 
 class PlannerPage(QWidget):
     """
     Page for generating and displaying a plan of tasks (today-focused for now).
+
+    Each run starts from the stored plan and only re-places sessions that
+    were displaced. With ``enable_live_reschedule`` the plan is refreshed
+    shortly after any committed change to tasks, events or blocks, except
+    the page's own write-back and the app events mirroring the plan.
     """
-    def __init__(self, engine, parent=None):
+    def __init__(self, engine, parent=None, settings=None):
         super().__init__(parent)
         self.engine = engine
+        self.settings = settings or load_settings()
+        self._saving = False
 
         layout = QVBoxLayout(self)
 
@@ -31,82 +58,126 @@ class PlannerPage(QWidget):
 
         layout.addStretch(1)
 
+        # Debounced live rescheduling: a burst of edits replans once
+        self.replan_timer = QTimer(self)
+        self.replan_timer.setInterval(500)
+        self.replan_timer.setSingleShot(True)
+        self.replan_timer.timeout.connect(self.on_generate)
+        self.changes = ChangeRelay(engine, self)
+        self.changes.changed.connect(self.on_change)
+
+    def on_change(self, ev: ChangeEvent):
+        if self._saving or not getattr(self.settings, "enable_live_reschedule", False):
+            return
+        if ev.table == "events" and ev.op != "delete" and self._is_plan_event(ev.id):
+            return
+        self.replan_timer.start()
+
+    def _is_plan_event(self, event_id) -> bool:
+        if event_id is None:
+            return False
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT source, source_id FROM events WHERE id = :id"), {"id": event_id}
+            ).first()
+        return row is not None and row.source == "app" and (row.source_id or "").startswith(APP_EVENT_PREFIX)
+
     def on_generate(self):
         """
-        Fetch pending tasks + today's events, compute a schedule, persist, and render.
+        Load pending tasks, events and blocks for the horizon, update the
+        stored plan, persist it, and render.
         """
         tasks = []
         events = []
         blocks = []
+        today_start = datetime.combine(datetime.now().date(), datetime.min.time())
+        horizon_end = today_start + timedelta(days=HORIZON_DAYS)
 
         # 1) Load pending tasks
         with self.engine.begin() as conn:
-            task_rows = conn.execute(
-                text(
-                    "SELECT id, title, type, estimated_duration, due_date, start_time, end_time "
-                    "FROM tasks WHERE state = 'pending'"
-                )
-            ).fetchall()
+            task_rows = conn.execute(text(PENDING_TASKS_SQL)).fetchall()
 
             for row in task_rows:
-                task_id, title, ttype, duration, due_iso, start_iso, end_iso = row
+                task_id, title, ttype, duration, due_ts, start_ts, end_ts = row
                 task = {
                     "id": task_id,
                     "title": title,
                     "type": ttype,
                     "estimated_duration": duration,
-                    "due_date": datetime.fromisoformat(due_iso) if due_iso else None,
+                    "due_date": datetime.fromtimestamp(due_ts) if due_ts is not None else None,
                 }
-                if start_iso and end_iso:
-                    task["start_time"] = datetime.fromisoformat(start_iso)
-                    task["end_time"] = datetime.fromisoformat(end_iso)
+                if start_ts is not None and end_ts is not None:
+                    task["start_time"] = datetime.fromtimestamp(start_ts)
+                    task["end_time"] = datetime.fromtimestamp(end_ts)
                 tasks.append(task)
 
-        # 2) Load today's events from local DB (client stub wraps DB reads)
+        # 2) Load the horizon's events from local DB (client stub wraps DB reads)
         events_client = GoogleCalendarClient(self.engine)
-        today_start = datetime.combine(datetime.now().date(), datetime.min.time())
-        tomorrow = today_start + timedelta(days=1)
-        events = events_client.list_events(today_start, tomorrow)
+        # our own mirrored sessions are the plan, not busy time
+        events = [
+            e for e in events_client.list_events(today_start, horizon_end)
+            if not (e["source"] == "app" and (e["source_id"] or "").startswith(APP_EVENT_PREFIX))
+        ]
 
-        # 3) Load user blocks
+        # 3) Load user blocks overlapping the horizon
         with self.engine.begin() as conn:
             block_rows = conn.execute(
-                text("SELECT kind, start_time, end_time, source, description FROM blocks")
+                text(BLOCKS_IN_RANGE_SQL),
+                {"start": int(today_start.timestamp()), "end": int(horizon_end.timestamp())},
             ).fetchall()
             for row in block_rows:
-                kind, start_iso, end_iso, source, desc = row
+                kind, start_ts, end_ts, source, desc = row
                 blocks.append({
                     "kind": kind,
-                    "start_time": datetime.fromisoformat(start_iso),
-                    "end_time": datetime.fromisoformat(end_iso),
+                    "start_time": datetime.fromtimestamp(start_ts),
+                    "end_time": datetime.fromtimestamp(end_ts),
                     "source": source,
                     "description": desc,
                 })
 
         prefs = load_prefs()
-
-        # 4) Schedule tasks around events and blocks
-        sessions = schedule(tasks, events, blocks, prefs)
-
-        # 5) Persist the first session of each task back to DB
-        first_sessions: dict[int, dict] = {}
-        for s in sessions:
-            if s["task_id"] not in first_sessions:
-                first_sessions[s["task_id"]] = s
-        with self.engine.begin() as conn:
-            for task_id, s in first_sessions.items():
-                conn.execute(
-                    text("UPDATE tasks SET start_time = :start, end_time = :end WHERE id = :id"),
-                    {
-                        "start": s["start_time"].isoformat(),
-                        "end": s["end_time"].isoformat(),
-                        "id": task_id,
-                    },
-                )
+        settings = self.settings
+        use_learning = getattr(settings, "enable_learning_loop", False)
+        estimates = metrics.load_estimates(self.engine) if use_learning else None
+
+        # 4) Update the stored plan around events and blocks
+        previous = load_plan(self.engine, today_start)
+        sessions = replan(
+            previous, tasks, events, blocks, prefs,
+            horizon_days=HORIZON_DAYS, settings=settings, estimates=estimates,
+        )
+        # 5) Write each task's first session back in one batch (changed ones
+        #    only); the change relay delivers our own commits synchronously,
+        #    so they are ignored while saving
+        self._saving = True
+        try:
+            save_plan(self.engine, sessions, today_start)
+            save_task_times(self.engine, sessions)
+            if getattr(settings, "enable_live_reschedule", False):
+                self.sync_calendar(sessions, today_start)
+        finally:
+            self._saving = False
 
         # 6) Show the plan
         self.render_schedule(sessions)
 
+    def sync_calendar(self, sessions: list[dict], since: datetime):
+        """Mirror the plan into app-owned events, rewriting only what moved."""
+        index: dict[int, int] = {}
+        app_events = []
+        for s in sorted(sessions, key=lambda s: s["start_time"]):
+            idx = index.get(s["task_id"], 0)
+            index[s["task_id"]] = idx + 1
+            app_events.append({
+                "source_id": f"{APP_EVENT_PREFIX}{s['task_id']}:{idx}",
+                "title": s["title"],
+                "start_time": s["start_time"],
+                "end_time": s["end_time"],
+            })
+        GoogleCalendarClient(self.engine).sync_app_events(
+            app_events, prune_prefix=APP_EVENT_PREFIX, since=since
+        )
+
     def render_schedule(self, tasks: list[dict]):
         self.list_widget.clear()
         tasks_sorted = sorted(tasks, key=lambda t: t["start_time"])
@@ -4,22 +4,27 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QLabel,
     QPushButton,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QComboBox,
     QLineEdit,
 )
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from bisect import bisect_left
 from datetime import datetime
+from typing import Any, List, Optional, Tuple
 import uuid
 
+from project.changes import ChangeEvent
 from project.repo.base import Task
 from project.repo.syncing import SyncingRepo
 from project.repo.query_builders import build_tasks_query  # re-export for tests
+from ui.change_relay import ChangeRelay
 
 __all__ = [
     "build_tasks_query",
     "TasksPage",
+    "TaskListModel",
+    "format_task",
     "as_str",
     "as_optional_str",
     "as_int",
@@ -48,6 +53,165 @@ def as_int(value: object, default: int = 0) -> int:
         return default
 
 
+def format_task(t: Task) -> str:
+    """Return the single-line list representation of a task."""
+    parts = [f"#{t.id} [{t.state}] {t.title} ({t.type}, {t.estimated_duration}m)"]
+    if t.course_label:
+        parts.append(f"• {t.course_label}")
+    if t.priority is not None:
+        parts.append(f"• p{t.priority}")
+    if t.due_date:
+        try:
+            due_disp = datetime.fromisoformat(t.due_date).date().isoformat()
+        except Exception:
+            due_disp = t.due_date
+        parts.append(f"– due {due_disp}")
+    if t.start_time and t.end_time:
+        try:
+            start_t = datetime.fromisoformat(t.start_time).strftime("%H:%M")
+            end_t = datetime.fromisoformat(t.end_time).strftime("%H:%M")
+            parts.append(f"| {start_t}→{end_t}")
+        except Exception:
+            pass
+    return " ".join(parts)
+
+
+class TaskListModel(QAbstractListModel):
+    """Lazily loaded task list backed by keyset-paginated repository reads.
+
+    Only the first page is loaded when the query changes; the view pulls
+    further pages through ``canFetchMore``/``fetchMore`` as the user scrolls.
+    Display strings are built on demand for visible rows only. Committed
+    changes are applied row by row by :meth:`apply_change`, keeping the
+    loaded pages and the scroll position.
+    """
+
+    def __init__(self, repo: SyncingRepo, page_size: int = 100, parent=None):
+        super().__init__(parent)
+        self.repo = repo
+        self.page_size = page_size
+        self.filter_mode = "All"
+        self.search = ""
+        self._tasks: List[Task] = []
+        self._keys: List[Tuple[Any, ...]] = []  # sort key of each loaded row
+        self._cursor: Optional[Tuple[Any, ...]] = None
+        self._exhausted = True
+
+    def set_query(self, filter_mode: str, search: str) -> None:
+        self.beginResetModel()
+        self.filter_mode = filter_mode
+        self.search = search
+        self._tasks = []
+        self._keys = []
+        self._cursor = None
+        self._exhausted = False
+        self._load_page()
+        self.endResetModel()
+
+    def _load_page(self) -> List[Task]:
+        page = self.repo.list_tasks_page(
+            self.filter_mode, self.search, self._cursor, self.page_size
+        )
+        self._cursor = page.cursor
+        self._exhausted = page.cursor is None
+        self._tasks.extend(page.tasks)
+        self._keys.extend(page.keys)
+        return page.tasks
+
+    def task_at(self, row: int) -> Task:
+        return self._tasks[row]
+
+    def _row_of(self, task_id: int) -> int:
+        for row, task in enumerate(self._tasks):
+            if task.id == task_id:
+                return row
+        return -1
+
+    def apply_change(self, ev: ChangeEvent) -> None:
+        """Apply one committed task change to the loaded rows.
+
+        The changed task is looked up in the current query: if it no longer
+        matches it is removed, otherwise it is moved to (or inserted at) its
+        keyset position. A task that now sorts after the last loaded row is
+        left for ``fetchMore``. Resets reload the query.
+        """
+        if ev.table != "tasks":
+            return
+        if ev.id is None:
+            self.set_query(self.filter_mode, self.search)
+            return
+        row = self._row_of(ev.id)
+        found = None
+        if ev.op != "delete":
+            found = self.repo.locate_task(self.filter_mode, self.search, ev.id)
+        target = -1
+        if found is not None:
+            keys = self._keys[:row] + self._keys[row + 1:] if row >= 0 else self._keys
+            target = bisect_left(keys, found[1])
+            if target == len(keys) and not self._exhausted:
+                target = -1  # past the loaded pages
+        if row >= 0 and row == target:
+            self._tasks[row], self._keys[row] = found
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+            return
+        if row >= 0 and target >= 0:
+            # destination is counted in the rows before the move
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target if target < row else target + 1)
+            del self._tasks[row]
+            del self._keys[row]
+            self._tasks.insert(target, found[0])
+            self._keys.insert(target, found[1])
+            self.endMoveRows()
+            index = self.index(target)
+            self.dataChanged.emit(index, index)
+            return
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._tasks[row]
+            del self._keys[row]
+            self.endRemoveRows()
+        if target >= 0:
+            self.beginInsertRows(QModelIndex(), target, target)
+            self._tasks.insert(target, found[0])
+            self._keys.insert(target, found[1])
+            self.endInsertRows()
+
+    # ----- QAbstractListModel -----
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        return len(self._tasks)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):  # type: ignore[override]
+        if not index.isValid() or not 0 <= index.row() < len(self._tasks):
+            return None
+        task = self._tasks[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_task(task)
+        if role == Qt.ItemDataRole.UserRole:
+            return task
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:  # type: ignore[override]
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:  # type: ignore[override]
+        if not self.canFetchMore(parent):
+            return
+        page = self.repo.list_tasks_page(
+            self.filter_mode, self.search, self._cursor, self.page_size
+        )
+        if page.tasks:
+            first = len(self._tasks)
+            self.beginInsertRows(QModelIndex(), first, first + len(page.tasks) - 1)
+            self._tasks.extend(page.tasks)
+            self._keys.extend(page.keys)
+            self.endInsertRows()
+        self._cursor = page.cursor
+        self._exhausted = page.cursor is None
+
+
 class TasksPage(QWidget):
     """Page to display and manage user tasks with filters and search."""
 
@@ -76,40 +240,24 @@ class TasksPage(QWidget):
         self.search_timer.timeout.connect(self.refresh_list)
         self.search_edit.textChanged.connect(lambda: self.search_timer.start())
 
-        self.list_widget = QListWidget()
-        layout.addWidget(self.list_widget)
+        self.model = TaskListModel(repo, parent=self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.model)
+        layout.addWidget(self.list_view)
+
+        self.changes = ChangeRelay(repo.local.engine, self)
+        self.changes.changed.connect(self.model.apply_change)
 
         layout.addStretch(1)
         self.refresh_list()
 
     # ------------------------------------------------------------------
     def refresh_list(self):
-        """Load tasks from repo and display them in the list widget."""
-        self.list_widget.clear()
+        """Reload the first page of tasks for the current filter and search."""
         filter_mode = self.filter_combo.currentText() if hasattr(self, "filter_combo") else "All"
         search = self.search_edit.text() if hasattr(self, "search_edit") else ""
-        tasks = self.repo.list_tasks(filter_mode, search)
-        for t in tasks:
-            parts = [f"#{t.id} [{t.state}] {t.title} ({t.type}, {t.estimated_duration}m)"]
-            if t.course_label:
-                parts.append(f"• {t.course_label}")
-            if t.priority is not None:
-                parts.append(f"• p{t.priority}")
-            if t.due_date:
-                try:
-                    due_disp = datetime.fromisoformat(t.due_date).date().isoformat()
-                except Exception:
-                    due_disp = t.due_date
-                parts.append(f"– due {due_disp}")
-            if t.start_time and t.end_time:
-                try:
-                    start_t = datetime.fromisoformat(t.start_time).strftime("%H:%M")
-                    end_t = datetime.fromisoformat(t.end_time).strftime("%H:%M")
-                    parts.append(f"| {start_t}→{end_t}")
-                except Exception:
-                    pass
-            item_text = " ".join(parts)
-            self.list_widget.addItem(QListWidgetItem(item_text))
+        self.model.set_query(filter_mode, search)
 
     # ------------------------------------------------------------------
     def on_add_task(self):
@@ -175,9 +323,8 @@ class TasksPage(QWidget):
                 course_label=as_optional_str(classification.get("course_label")),
                 priority=as_int(classification.get("priority"), 0),
             )
-            self.repo.upsert_task(task)
+            self.repo.upsert_task(task)  # the new row arrives through apply_change
             dialog.accept()
-            self.refresh_list()
 
         buttons.accepted.connect(accept)
         buttons.rejected.connect(dialog.reject)